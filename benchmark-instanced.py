@@ -0,0 +1,124 @@
+"""
+File: benchmark-instanced.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Benchmark the instanced rectangles in the headless mode.
+    Compare the draw_rect() of every rectangle with the draw_rects() of the array,
+    when the array is changed in every frame and when its version is unchanged.
+    The draw is the time of draw_rect() or draw_rects() before the flush(),
+    the frame is the time until glFinish(), it is mostly the rasterization on the software renderer.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import sys
+
+from OpenGL.GL import *
+
+from util.easy_imports import *
+from util.glfw_window import GLFWWindow
+
+# The font of the top bar
+FONT = sys.argv[1] if len(sys.argv) > 1 else 'resource/font/MSYH.TTC'
+
+# How many rectangles in a frame
+INSTANCES = [10000, 100000, 1000000]
+
+# The draw_rect() of every rectangle is too slow for the larger ones
+MAX_PER_RECT = 100000
+
+# How many frames for each test
+REPEATS = 10
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def random_rects(n):
+    '''The dot field of the small rectangles.'''
+    xy = np.random.random((n, 2)) * 2 - 1
+    wh = np.full((n, 2), 0.01)
+    return np.hstack([xy, wh]), np.random.random((n, 4))
+
+
+def per_rect(wnd, xywh, colors):
+    '''Every rectangle is converted and batched by draw_rect().'''
+    for (x, y, w, h), color in zip(xywh.tolist(), colors.tolist()):
+        wnd.draw_rect(x, y, w, h, tuple(color))
+
+
+def changed(wnd, xywh, colors):
+    '''The moving dots, the array is changed in every frame, without the version.'''
+    xywh[:, 0] += 1e-3
+    wnd.draw_rects(xywh, colors)
+
+
+def unchanged(wnd, xywh, colors):
+    '''The static dots, the version is the same, the array is uploaded only in the first frame.'''
+    wnd.draw_rects(xywh, colors, version=len(xywh))
+
+
+def measure(wnd, method, n):
+    '''
+    :return tuple: the median ms of the draw before the flush(), and of the frame until glFinish().
+    '''
+    xywh, colors = random_rects(n)
+    costs = []
+    for _ in range(REPEATS):
+        glClear(GL_COLOR_BUFFER_BIT)
+        glFinish()
+        tic = time.perf_counter()
+        method(wnd, xywh, colors)
+        draw = time.perf_counter() - tic
+        wnd.flush()
+        glFinish()
+        costs.append((draw, time.perf_counter() - tic))
+    return tuple(np.median(costs, axis=0) * 1000)
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    GLFWWindow.headless = True
+    wnd = GLFWWindow()
+    wnd.load_font(FONT)
+    wnd.init_window()
+
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    results = []
+    for n in INSTANCES:
+        res = dict(instances=n)
+        for name, method in [('draw_rect', per_rect), ('changed', changed), ('unchanged', unchanged)]:
+            if method is per_rect and n > MAX_PER_RECT:
+                continue
+            res[f'{name}_draw_ms'], res[f'{name}_frame_ms'] = measure(
+                wnd, method, n)
+        results.append(res)
+        logger.info(res)
+
+    render = wnd.instance_render
+    logger.info(f'Instances: {render.uploads} uploads, {render.skips} skips')
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False, float_format='%.2f'))
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
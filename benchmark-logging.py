@@ -0,0 +1,92 @@
+"""
+File: benchmark-logging.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Benchmark the latency added to the render thread by logging.
+    Compare the synchronous file sink, the enqueued file sink of loguru,
+    the logger deferred to the input worker, and the event log.
+    The time of every call is measured on the calling thread.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import tempfile
+
+from util.easy_imports import *
+from util.event_log import EventLog, measure_latency
+from util.input_queue import InputWorker
+
+# How many calls for each test
+CALLS = 20000
+
+# The message like the job in the design
+MESSAGE = "t=12345, job=(1000, 'focus_color', (0.1, 0.2, 0.3))"
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def bench_logger(folder, enqueue):
+    '''The logger with only the file sink, it rotates at 1 MB like the project log.'''
+    logger.remove()
+    logger.add(Path(folder, f'enqueue-{enqueue}.log'),
+               rotation='1 MB', enqueue=enqueue)
+    res = measure_latency(logger.debug, MESSAGE, n=CALLS)
+    logger.complete()
+    logger.remove()
+    return res
+
+
+def bench_worker(folder):
+    '''The synchronous file sink, the logger is called by the worker thread.'''
+    logger.remove()
+    logger.add(Path(folder, 'worker.log'), rotation='1 MB')
+    worker = InputWorker(max_queue=CALLS)
+    worker.start()
+    res = measure_latency(worker.defer, logger.debug, MESSAGE, n=CALLS)
+    worker.stop()
+    logger.remove()
+    return res
+
+
+def bench_event_log(folder):
+    events = EventLog(Path(folder, 'events'))
+    events.start()
+    res = measure_latency(events.write, 'job', n=CALLS,
+                          t=12345, name='focus_color', value=(0.1, 0.2, 0.3))
+    events.stop()
+    return res
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as folder:
+        results = [
+            dict(sink='logger (sync)', **bench_logger(folder, False)),
+            dict(sink='logger (enqueue)', **bench_logger(folder, True)),
+            dict(sink='logger (input worker)', **bench_worker(folder)),
+            dict(sink='event log', **bench_event_log(folder)),
+        ]
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False, float_format='%.2f'))
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
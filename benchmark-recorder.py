@@ -0,0 +1,112 @@
+"""
+File: benchmark-recorder.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Benchmark the frame recorder.
+    Render the frames in the headless mode at the monitor size,
+    with and without the recorder, and report the throughput.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import sys
+import json
+import subprocess
+
+from util.easy_imports import *
+
+# How many frames for each test
+FRAMES = 300
+
+# The recorder formats, None for no recorder
+FORMATS = [None, 'raw', 'zlib', 'ffmpeg']
+
+# The font of the top bar
+FONT = sys.argv[2] if len(sys.argv) > 2 else 'resource/font/MSYH.TTC'
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def run(format):
+    '''
+    Render the frames with the recorder of the format.
+    It runs in its own process, since the window can be initialized only once.
+    '''
+    from util.glfw_window import GLFWWindow
+
+    GLFWWindow.headless = True
+    GLFWWindow.max_frames = FRAMES
+    GLFWWindow.recorder.enabled = format is not None
+    GLFWWindow.recorder.format = format or 'raw'
+
+    wnd = GLFWWindow()
+    wnd.load_font(FONT)
+    wnd.init_window()
+
+    def main_render():
+        t = time.perf_counter()
+        for i in range(20):
+            x = math.cos(t + i) * 0.8
+            y = math.sin(t * 1.3 + i) * 0.8
+            wnd.draw_rect(x, y, 0.1, 0.1, (i / 20, 0.5, 1 - i / 20, 1))
+
+    tic = time.perf_counter()
+    wnd.render_loop(main_render)
+    elapsed = time.perf_counter() - tic
+
+    record = wnd.profiler.summary()['record']
+    res = dict(
+        format=format,
+        width=wnd.width,
+        height=wnd.height,
+        render_fps=FRAMES / elapsed,
+        record_cpu_mean_ms=record['cpu_mean_ms'],
+        record_cpu_max_ms=record['cpu_max_ms'],
+    )
+    if wnd.recorder.stats is not None:
+        res.update(wnd.recorder.stats)
+    return res
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1].startswith('--run='):
+        format = sys.argv[1].split('=', 1)[1] or None
+        print('result ' + json.dumps(run(format)))
+        sys.exit(0)
+
+    results = []
+    for format in FORMATS:
+        p = subprocess.run(
+            [sys.executable, __file__, f'--run={format or ""}', FONT],
+            capture_output=True, text=True)
+        lines = [e for e in p.stdout.splitlines() if e.startswith('result ')]
+        if not lines:
+            logger.error(f'Failed with {format}: {p.stderr[-2000:]}')
+            continue
+        results.append(json.loads(lines[0][len('result '):]))
+        logger.info(results[-1])
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False, float_format='%.2f'))
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
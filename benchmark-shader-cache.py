@@ -0,0 +1,118 @@
+"""
+File: benchmark-shader-cache.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Benchmark the startup with the program binary cache.
+    Initialize the window and all the variants of the circle shader in the headless mode,
+    with the cache disabled, the empty cache (cold) and the filled cache (warm).
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+from util.easy_imports import *
+
+# The font of the top bar
+FONT = sys.argv[2] if len(sys.argv) > 2 else 'resource/font/MSYH.TTC'
+
+# The variants of the circle shader, like large-circle-under-control.py
+VARIANTS = [dict(BLINK_TOGGLE=b, COMMAND_MODE=c, IDLE_DISPLAY_MODE=i, FRAME_CLOCK=True)
+            for b in (False, True) for c in (False, True) for i in range(3)]
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def run():
+    '''
+    Initialize the window and the variants.
+    It runs in its own process, so nothing is kept in the memory.
+    '''
+    from OpenGL.GL import glGenVertexArrays, glBindVertexArray, glUseProgram, glDrawArrays, glFinish, GL_TRIANGLES
+    from util.glfw_window import GLFWWindow
+    from util.shader_manager import shader_manager
+
+    GLFWWindow.headless = True
+    wnd = GLFWWindow()
+    wnd.load_font(FONT)
+
+    tic = time.perf_counter()
+    wnd.init_window()
+    init_window_ms = (time.perf_counter() - tic) * 1000
+
+    from util.shader_library import shader_library
+    vert = shader_library.source('circle/b.vert')
+    frag = shader_library.source('circle/c.frag')
+    tic = time.perf_counter()
+    programs = shader_manager.preload(vert, frag, VARIANTS)
+    preload_ms = (time.perf_counter() - tic) * 1000
+
+    # The driver may finish the compilation at the first draw
+    vao = glGenVertexArrays(1)
+    glBindVertexArray(vao)
+    tic = time.perf_counter()
+    for program in programs:
+        glUseProgram(program)
+        glDrawArrays(GL_TRIANGLES, 0, 3)
+    glFinish()
+    first_draw_ms = (time.perf_counter() - tic) * 1000
+
+    return dict(init_window_ms=init_window_ms, preload_ms=preload_ms,
+                first_draw_ms=first_draw_ms, **shader_manager.report())
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        print('result ' + json.dumps(run()))
+        sys.exit(0)
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        # Mesa keeps its own shader cache, and its program binaries come from there,
+        # so every test starts with the empty one except the warm test
+        for name, cache_dir, mesa_dir in [('disabled', 'null', 'mesa-disabled'),
+                                          ('cold', 'program', 'mesa'),
+                                          ('warm', 'program', 'mesa')]:
+            env = dict(os.environ,
+                       GLFW_SHADER_CACHE=cache_dir if cache_dir == 'null' else str(
+                           Path(folder, cache_dir)),
+                       MESA_SHADER_CACHE_DIR=str(Path(folder, mesa_dir)))
+            p = subprocess.run(
+                [sys.executable, __file__, '--run', FONT],
+                capture_output=True, text=True, env=env)
+            lines = [e for e in p.stdout.splitlines() if e.startswith('result ')]
+            if not lines:
+                logger.error(f'Failed with {name}: {p.stderr[-2000:]}')
+                continue
+            results.append(
+                dict(cache=name, **json.loads(lines[0][len('result '):])))
+            logger.info(results[-1])
+
+    df = pd.DataFrame(results).drop(columns=['cache_dir'])
+    print(df.to_string(index=False, float_format='%.2f'))
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
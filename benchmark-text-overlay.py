@@ -0,0 +1,94 @@
+"""
+File: benchmark-text-overlay.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Benchmark the frame time of the 15-line options overlay.
+    Compare the text rendering with and without the text layout cache.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import glfw
+
+from OpenGL.GL import *
+
+from util.easy_imports import *
+from util.glfw_window import GLFWWindow, TextAnchor
+
+# The overlay looks like the options in the large-circle-under-control.py
+LINES = [
+    'ratio=1.78', 'tic=1760000000.00', 'wedges=12', 'ring_edges=[0.2, 0.3, 0.5, 0.6, 0.9]',
+    'focus_r1=0.02', 'focus_r2=0.05', 'focus_color=(0.00, 0.00, 1.00)', 'blink_toggle=False',
+    'grids=4', 'selected_patches=[(0, 1, 10), (1, 2, 20)]', 'idle_display_mode=0',
+    'rotation_speed=0', 'command_mode=False', 'command=[]', '窗口获得焦点'
+]
+
+FRAMES = 200
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def overlay(wnd):
+    for i, o in enumerate(LINES):
+        wnd.draw_text(o, -0.9, 0.9-i*0.06, 0.5, TextAnchor.L, color=0.5)
+    wnd.render_top_bar()
+    wnd.flush()
+
+
+def measure(wnd, use_layout_cache):
+    wnd.text_renderer.use_layout_cache = use_layout_cache
+    wnd.text_renderer.layouts.clear()
+
+    costs = []
+    for _ in range(FRAMES):
+        glClear(GL_COLOR_BUFFER_BIT)
+        tic = time.perf_counter()
+        overlay(wnd)
+        glFinish()
+        costs.append(time.perf_counter() - tic)
+        glfw.swap_buffers(wnd.window)
+        glfw.poll_events()
+    return np.median(costs) * 1000, np.percentile(costs, 99) * 1000
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    wnd = GLFWWindow()
+    wnd.load_font('resource/font/MSYH.TTC')
+    wnd.init_window()
+
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    # Warm up the glyph cache
+    measure(wnd, False)
+
+    before = measure(wnd, False)
+    after = measure(wnd, True)
+    logger.info(
+        f'Without layout cache: {before[0]:.3f} ms (p99 {before[1]:.3f} ms)')
+    logger.info(
+        f'With layout cache: {after[0]:.3f} ms (p99 {after[1]:.3f} ms)')
+    logger.info(f'Glyph cache: {wnd.text_renderer.cache_stats()}')
+
+    glfw.terminate()
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
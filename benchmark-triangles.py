@@ -0,0 +1,204 @@
+"""
+File: benchmark-triangles.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Benchmark the triangle rendering.
+    Compare the per-triangle path (one upload and one draw call per triangle)
+    with the batched path (one upload and one draw call per frame).
+    The per-triangle path is the baseline TriangleRender.render_triangle(),
+    it looks up the uColor uniform and draws every triangle at once.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import glfw
+
+from OpenGL.GL import *
+from OpenGL.GL.shaders import compileProgram, compileShader
+
+from util.easy_imports import *
+from util.glfw_window import GLFWWindow
+
+# How many triangles in a frame
+TRIANGLES = [100, 1000, 10000]
+
+# How many frames for each test
+REPEATS = 20
+
+# The baseline shaders, the color is the uColor uniform of every triangle
+BASELINE_VERTEX_SHADER = '''
+#version 330 core
+
+layout(location = 0) in vec2 aPos;
+layout(location = 1) in vec2 nPos;
+out vec2 scaledXY;
+uniform mat4 projection;
+
+void main() {
+    gl_Position = projection * vec4(aPos, 0.0, 1.0);
+    scaledXY = nPos;
+}
+'''
+
+BASELINE_FRAGMENT_SHADER = '''
+#version 330 core
+
+in vec2 scaledXY;
+out vec4 FragColor;
+uniform vec4 uColor;
+
+void main()
+{
+    FragColor = vec4(uColor);
+    FragColor.a = exp(- 1.0 * length(scaledXY-0.5));
+}
+'''
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class BaselineTriangleRender:
+    '''
+    The baseline triangle render, every triangle is uploaded and drawn at once.
+    '''
+
+    def __init__(self, width, height):
+        projection = np.array([
+            [2.0/width, 0.0, 0.0, 0.0],
+            [0.0, 2.0/height, 0.0, 0.0],
+            [0.0, 0.0, 1.0, 0.0],
+            [-1.0, -1.0, 0.0, 1.0]
+        ], dtype=np.float32)
+
+        self.shader_program = compileProgram(
+            compileShader(BASELINE_VERTEX_SHADER, GL_VERTEX_SHADER),
+            compileShader(BASELINE_FRAGMENT_SHADER, GL_FRAGMENT_SHADER))
+
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, 6 * 4 * 100 *
+                     sizeof(GLfloat), None, GL_DYNAMIC_DRAW)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE,
+                              4 * sizeof(GLfloat), ctypes.c_void_p(0))
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE,
+                              4 * sizeof(GLfloat), ctypes.c_void_p(2 * sizeof(GLfloat)))
+        glEnableVertexAttribArray(1)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindVertexArray(0)
+
+        glUseProgram(self.shader_program)
+        glUniformMatrix4fv(glGetUniformLocation(self.shader_program, "projection"),
+                           1, GL_FALSE, projection)
+
+    def render_triangle(self, x1, y1, x2, y2, x3, y3, color=(1.0, 1.0, 1.0, 1.0), nPos=(0, 0, 1, 0, 0, 1)):
+        glUseProgram(self.shader_program)
+        glUniform4f(glGetUniformLocation(self.shader_program,
+                    'uColor'), color[0], color[1], color[2], color[3])
+
+        glActiveTexture(GL_TEXTURE0)
+        glBindVertexArray(self.vao)
+
+        vertices_array = np.array(
+            [x1, y1, nPos[0], nPos[1], x2, y2, nPos[2], nPos[3], x3, y3, nPos[4], nPos[5]], dtype=np.float32)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0,
+                        vertices_array.nbytes, vertices_array)
+
+        glDrawArrays(GL_TRIANGLES, 0, 3)
+
+        glBindVertexArray(0)
+
+    def release(self):
+        glDeleteBuffers(1, [self.vbo])
+        glDeleteVertexArrays(1, [self.vao])
+        glDeleteProgram(self.shader_program)
+
+
+def random_triangles(n):
+    xy = np.random.random((n, 6)) * 2 - 1
+    colors = np.random.random((n, 4))
+    return xy.tolist(), colors.tolist()
+
+
+def per_triangle(wnd, xy, colors, tr):
+    '''
+    The baseline path, every triangle is uploaded and drawn at once.
+
+    :param tr BaselineTriangleRender: the baseline render.
+    '''
+    for (x1, y1, x2, y2, x3, y3), color in zip(xy, colors):
+        tr.render_triangle(
+            int((x1+1) * 0.5 * wnd.width), int((y1+1) * 0.5 * wnd.height),
+            int((x2+1) * 0.5 * wnd.width), int((y2+1) * 0.5 * wnd.height),
+            int((x3+1) * 0.5 * wnd.width), int((y3+1) * 0.5 * wnd.height),
+            color)
+
+
+def batched(wnd, xy, colors):
+    '''The new path, the triangles are drawn by a single flush().'''
+    for (x1, y1, x2, y2, x3, y3), color in zip(xy, colors):
+        wnd.draw_triangle(x1, y1, x2, y2, x3, y3, tuple(color))
+    wnd.flush()
+
+
+def measure(wnd, method, n, *args):
+    '''
+    :param args: the extra arguments of the method, after (wnd, xy, colors).
+    '''
+    xy, colors = random_triangles(n)
+    costs = []
+    for _ in range(REPEATS):
+        glClear(GL_COLOR_BUFFER_BIT)
+        tic = time.perf_counter()
+        method(wnd, xy, colors, *args)
+        glFinish()
+        costs.append(time.perf_counter() - tic)
+        # There is no window to swap in the headless mode, like the render_loop()
+        if wnd.framebuffer is None:
+            glfw.swap_buffers(wnd.window)
+        glfw.poll_events()
+    ms = np.median(costs) * 1000
+    return n / ms
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    wnd = GLFWWindow()
+    wnd.init_window()
+    baseline = BaselineTriangleRender(wnd.width, wnd.height)
+
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    for n in TRIANGLES:
+        before = measure(wnd, per_triangle, n, baseline)
+        after = measure(wnd, batched, n)
+        logger.info(
+            f'{n=}, per-triangle: {before:.2f} triangles/ms, batched: {after:.2f} triangles/ms ({after/before:.1f}x)')
+
+    baseline.release()
+    glfw.terminate()
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
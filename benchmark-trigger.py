@@ -0,0 +1,135 @@
+"""
+File: benchmark-trigger.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Benchmark the trigger latency against the loopback port.
+    Compare the thread-per-pulse path with the dispatcher thread.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import threading
+
+from util.easy_imports import *
+from util.parallel.parallel import Parallel
+from util.parallel.backends import LoopbackPort
+
+# How many triggers for each test
+TRIGGERS = 500
+
+# The interval between the triggers, in seconds, some of them overlap the 1 ms pulse
+INTERVALS = [0.0005, 0.002, 0.005]
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def thread_per_pulse(port, value):
+    '''The old path, a new thread for every pulse.'''
+    def _send():
+        port.setData(value)
+        time.sleep(0.001)
+        port.setData(0)
+    threading.Thread(target=_send, daemon=True).start()
+
+
+def pulses(writes):
+    '''
+    Pair the rising and the falling writes.
+
+    :return list: the (start_ns, end_ns, value) of the pulses.
+    '''
+    res = []
+    start = None
+    for t, value in writes:
+        if value:
+            start = (t, value)
+        elif start is not None:
+            res.append((start[0], t, start[1]))
+            start = None
+    return res
+
+
+def run(method, interval):
+    port = LoopbackPort()
+    if method == 'dispatcher':
+        parallel = Parallel()
+        parallel.reset(port)
+
+    requests = []
+    for i in range(TRIGGERS):
+        value = i % 255 + 1
+        requests.append((time.perf_counter_ns(), value))
+        if method == 'dispatcher':
+            parallel.send(value, verbose=False)
+        else:
+            thread_per_pulse(port, value)
+        time.sleep(interval)
+
+    if method == 'dispatcher':
+        parallel.close(timeout=10)
+    else:
+        time.sleep(0.1)
+
+    # The values are unique in 255 triggers, pair the pulses with the requests in order
+    res = pulses(port.records())
+    latency = []
+    width = []
+    j = 0
+    for request_ns, value in requests:
+        if j < len(res) and res[j][2] == value:
+            start_ns, end_ns, _ = res[j]
+            latency.append((start_ns - request_ns) / 1e6)
+            width.append((end_ns - start_ns) / 1e6)
+            j += 1
+
+    lost = TRIGGERS - len(latency)
+    # The pulses not in the order of the requests
+    disorder = len(res) - len(latency)
+
+    latency = np.array(latency)
+    width = np.array(width)
+    return dict(
+        method=method,
+        interval_ms=interval * 1000,
+        lost=lost,
+        disorder=disorder,
+        latency_p50_ms=np.percentile(latency, 50),
+        latency_p99_ms=np.percentile(latency, 99),
+        latency_max_ms=latency.max(),
+        width_p50_ms=np.percentile(width, 50),
+        width_p99_ms=np.percentile(width, 99),
+        width_max_ms=width.max(),
+    )
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    results = []
+    for interval in INTERVALS:
+        for method in ['thread', 'dispatcher']:
+            results.append(run(method, interval))
+            logger.info(results[-1])
+
+    df = pd.DataFrame(results)
+    print(df.to_string(index=False, float_format='%.3f'))
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
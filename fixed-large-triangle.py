@@ -21,10 +21,10 @@ Functions:
 import glfw
 
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
 
 from util.easy_imports import *
 from util.glfw_window import GLFWWindow
+from util.shader_library import shader_library
 
 # %%
 # Setup triangle points
@@ -35,9 +35,10 @@ vertices = np.array([
     -0.5, -0.5, 0.0, 0.0, 0.0, 1.0, 0.5,  # C
 ], dtype=np.float32)
 
+# The sources in the shader folder, see util/shader_library.py
 shader_script = {
-    'vert': open('./shader/triangle/a.vert').read(),
-    'frag': open('./shader/triangle/a.frag').read()
+    'vert': 'triangle/a.vert',
+    'frag': 'triangle/a.frag'
 }
 
 # %% ---- 2025-10-13 ------------------------
@@ -68,10 +69,7 @@ def compile(vertices=vertices):
     glBindVertexArray(0)
 
     # Compile shader
-    shader = compileProgram(
-        compileShader(shader_script['vert'], GL_VERTEX_SHADER),
-        compileShader(shader_script['frag'], GL_FRAGMENT_SHADER),
-    )
+    shader = shader_library.program(shader_script['vert'], shader_script['frag'])
 
     return shader, vao
 
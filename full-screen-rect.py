@@ -21,10 +21,10 @@ Functions:
 import glfw
 
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
 
 from util.easy_imports import *
 from util.glfw_window import GLFWWindow
+from util.shader_library import shader_library
 
 # Setup triangle points
 # 方形顶点数据：4个顶点，每个包含位置(3) + 颜色(4)
@@ -42,9 +42,10 @@ indices = np.array([
     2, 3, 0,  # 第二个三角形
 ], dtype=np.uint32)
 
+# The sources in the shader folder, see util/shader_library.py
 shader_script = {
-    'vert': open('./shader/triangle/a.vert').read(),
-    'frag': open('./shader/triangle/a.frag').read()
+    'vert': 'triangle/a.vert',
+    'frag': 'triangle/a.frag'
 }
 
 # %% ---- 2026-01-28 ------------------------
@@ -81,10 +82,7 @@ def compile_square():
     glBindVertexArray(0)  # 这会保存EBO绑定
 
     # 编译着色器
-    shader = compileProgram(
-        compileShader(shader_script['vert'], GL_VERTEX_SHADER),
-        compileShader(shader_script['frag'], GL_FRAGMENT_SHADER),
-    )
+    shader = shader_library.program(shader_script['vert'], shader_script['frag'])
 
     return shader, vao, len(indices)  # 返回索引数量
 
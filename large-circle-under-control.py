@@ -22,16 +22,21 @@ Functions:
 import glfw
 
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
 
 from util.easy_imports import *
 from util.glfw_window import GLFWWindow, TextAnchor
+from util.shader_params import ShaderParams
+from util.shader_manager import shader_manager
+from util.shader_library import shader_library
+from util.polar_layout import PolarLayout
+from util.patch_clock import PatchClock
+from util.timeline import Timeline
 from util.parallel.parallel import Parallel
 from parallel_code import Code
 
 
 # %%
-ADDRESS = 'ABCD'
+ADDRESS = CONF.trigger.backend
 DESIGN_CONF = './design.conf'
 
 # %%
@@ -52,18 +57,35 @@ indices = np.array([
     2, 3, 0,  # 第二个三角形
 ], dtype=np.uint32)
 
+# The per-pixel layout is baked into the texture by PolarLayout,
+# set it to False for the original shader which locates the patch of every pixel in every frame.
+BAKED_LAYOUT = True
+# The blinking is computed from the frame index by PatchClock, instead of the float32 uTime,
+# it requires BAKED_LAYOUT.
+FRAME_CLOCK = True
+# The options of the branches are compiled into the variants of c.frag,
+# all of them are preloaded, so switching them is only glUseProgram().
+SHADER_VARIANTS = BAKED_LAYOUT
+
+# The sources in the shader folder, see util/shader_library.py
 shader_script = {
-    'vert': open('./shader/circle/b.vert').read(),
-    'frag': open('./shader/circle/b.frag').read()
+    'vert': 'circle/b.vert',
+    'frag': 'circle/c.frag' if BAKED_LAYOUT else 'circle/b.frag'
 }
 
 # %% ---- 2026-01-28 ------------------------
 # Function and class
 
 
-def log(msg):
+def log(msg, event=None, t_ns=None, **fields):
+    '''
+    The message is formatted and written by the input worker,
+    and the event (if given) is written into the event log with the session time t.
+    '''
     t = int(1000*opt.get_time())
-    logger.debug(f'{t=}, {msg}')
+    wnd.input.defer(logger.debug, f'{t=}, {msg}')
+    if event is not None:
+        wnd.events.write(event, t_ns=t_ns, t=t, **fields)
 
 
 def compile_square():
@@ -95,11 +117,8 @@ def compile_square():
     glBindBuffer(GL_ARRAY_BUFFER, 0)
     glBindVertexArray(0)  # 这会保存EBO绑定
 
-    # 编译着色器
-    shader = compileProgram(
-        compileShader(shader_script['vert'], GL_VERTEX_SHADER),
-        compileShader(shader_script['frag'], GL_FRAGMENT_SHADER),
-    )
+    # 编译着色器, or load it from the program binary cache
+    shader = shader_library.program(shader_script['vert'], shader_script['frag'])
 
     return shader, vao, len(indices)  # 返回索引数量
 
@@ -138,10 +157,12 @@ class KeyboardHandler:
 keyboard = KeyboardHandler()
 
 
-def key_callback(window, key, scancode, action, mods):
+def handle_key(event):
     '''
-    Key press callback.
+    Key press handler, it runs on the render thread after the events are polled.
+    Only the cheap state changes are made here, the slow jobs are deferred to the input worker.
     '''
+    window, key, action, mods = event.window, event.key, event.action, event.mods
 
     # Only be interested in PRESS event.
     if not action == glfw.PRESS:
@@ -149,8 +170,8 @@ def key_callback(window, key, scancode, action, mods):
 
     c = keyboard.process_key(key, mods)
 
-    log(f'Key press: {c=}')
-    parallel.send(Code.key_press)
+    log(f'Key press: {c=}', 'key_press', t_ns=event.t_ns, key=c)
+    send_trigger(Code.key_press, label='key_press')
 
     # print(key, c, scancode, action, mods)
 
@@ -180,7 +201,7 @@ def key_callback(window, key, scancode, action, mods):
             try:
                 key, value = cmd.split(' ', 1)
                 value = value.strip()
-                print(f'{key=}, {value=}')
+                wnd.input.defer(print, f'{key=}, {value=}')
                 eval(f'setattr(opt, "{key}", {value})')
             except:
                 pass
@@ -208,14 +229,10 @@ def key_callback(window, key, scancode, action, mods):
         # ! Session starts or stops
         if not opt.blink_toggle:
             # Load conf in advance in case it is slow.
-            design.load_conf()
-
-            opt.blink_toggle = True
-
-            if opt.blink_toggle:
-                opt.reset_time()
-                log('Session starts')
-                parallel.send(Code.session_starts)
+            # It is parsed by the worker, and the session starts with it when it is parsed.
+            if not design.loading:
+                design.loading = True
+                wnd.input.defer(design.parse_conf, callback=start_session)
         else:
             opt.blink_toggle = False
 
@@ -238,37 +255,82 @@ def key_callback(window, key, scancode, action, mods):
     return
 
 
-def main_render():
-    glUseProgram(shader)
+def shader_variant(blink_toggle, command_mode, idle_display_mode):
+    '''The defines of the variant of c.frag.'''
+    return dict(BLINK_TOGGLE=blink_toggle, COMMAND_MODE=command_mode,
+                IDLE_DISPLAY_MODE=idle_display_mode, FRAME_CLOCK=FRAME_CLOCK)
+
 
-    opt.set(shader)
+def send_trigger(code, scheduled=None, label=None):
+    '''
+    Send the trigger right after the frame being drawn is swapped,
+    and show its code in the marker patch of the frame,
+    so the marker can cross-check the frame with the pulses.
+    '''
+    wnd.scheduler.defer(parallel.send, code, scheduled=scheduled, label=label)
+    wnd.marker.set_code(code)
+
+
+def start_session(timeline):
+    '''
+    Start the session after the design is parsed, it runs on the render thread.
+    The timeline is used after the session clock is reset,
+    so main_render() never checks its events against the old clock.
+    '''
+    design.loading = False
+    opt.blink_toggle = True
+    opt.reset_time()
+    clock.reset()
+    design.use_timeline(timeline)
+    log('Session starts', 'session_starts')
+    send_trigger(Code.session_starts, label='session_starts')
+
+
+def main_render():
+    # Execute the jobs whose time is closest to the flip of this frame,
+    # the trigger is sent right after the frame is swapped.
+    for job in design.timeline.due(wnd.scheduler.horizon_ms()):
+        a, b, c = job
+        setattr(opt, b, c)
+        log(f'{job=}', 'job', scheduled=a, name=b, value=c)
+        if a > 0:
+            code = {'focus_color': Code.focus_change,
+                    'selected_patches': Code.selected_patches_change}.get(b)
+            if code is not None:
+                send_trigger(code, scheduled=a / 1000, label=f'{b}@{a}')
+
+    if BAKED_LAYOUT:
+        # The layout is baked only when it is changed
+        layout.update(opt.ratio, opt.wedges, opt.ring_edges,
+                      opt.grids, opt.selected_patches)
+        layout.bind(unit=0)
+
+    program = shader
+    if SHADER_VARIANTS:
+        program = shader_library.program(shader_script['vert'], shader_script['frag'], shader_variant(
+            opt.blink_toggle, opt.command_mode, opt.idle_display_mode))
+    glUseProgram(program)
+    params = shader_manager.params(program)
+
+    if BAKED_LAYOUT:
+        params.set('uLayout', 0)
+        params.set('uSelection', 1)
+        params.set('uFrameClock', FRAME_CLOCK)
+        if FRAME_CLOCK:
+            # The luminance of the frame being drawn
+            params.set('uLuminance', clock.luminance(opt.selected_patches))
+    opt.set(params)
     # ratio_loc = glGetUniformLocation(shader, 'uRatio')
     # glUniform1f(ratio_loc, opt.ratio)
 
     glBindVertexArray(vao)
     glDrawElements(GL_TRIANGLES, index_count, GL_UNSIGNED_INT, None)
     glBindVertexArray(0)
+    clock.tick()
 
     # Read current time and convert into ms
     t = int(1000*opt.get_time())
 
-    # Execute jobs
-    if len(design.jobs) > 0:
-        while design.jobs[0][0] <= t:
-            # The job should be executed
-            job = design.jobs.pop(0)
-            a, b, c = job
-            eval(f'setattr(opt, "{b}", {c})')
-            log(f'{job=}')
-            if a > 0:
-                if b == 'focus_color':
-                    parallel.send(Code.focus_change)
-                if b == 'selected_patches':
-                    parallel.send(Code.selected_patches_change)
-
-            if len(design.jobs) == 0:
-                break
-
     if True:
         # Display commands
         variable = 'This can not happen'
@@ -349,81 +411,60 @@ class Options:
         self.idle_display_mode += 1
         self.idle_display_mode %= 3
 
-    def set(self, shader):
-        loc = glGetUniformLocation(shader, 'uIdleDisplayMode')
-        glUniform1i(loc, self.idle_display_mode)
-
-        loc = glGetUniformLocation(shader, 'uRatio')
-        glUniform1f(loc, self.ratio)
-
-        loc = glGetUniformLocation(shader, 'uTime')
-        glUniform1f(loc, self.get_time())
-
-        loc = glGetUniformLocation(shader, 'uWedges')
-        glUniform1i(loc, self.wedges)
-
-        loc = glGetUniformLocation(shader, 'uBlinkToggle')
-        glUniform1i(loc, self.blink_toggle)
-
-        loc = glGetUniformLocation(shader, 'uRotationSpeed')
-        glUniform1f(loc, self.rotation_speed)
-
-        loc = glGetUniformLocation(shader, 'uFocusR1')
-        glUniform1f(loc, self.focus_r1)
-
-        loc = glGetUniformLocation(shader, 'uFocusR2')
-        glUniform1f(loc, self.focus_r2)
-
-        loc = glGetUniformLocation(shader, 'uFocusColor')
-        glUniform3f(loc, *self.focus_color)
-
-        loc = glGetUniformLocation(shader, 'uCommandMode')
-        glUniform1i(loc, self.command_mode)
-
-        loc = glGetUniformLocation(shader, 'uGrids')
-        glUniform1i(loc, self.grids)
+    def set(self, params: ShaderParams):
+        params.set('uIdleDisplayMode', self.idle_display_mode)
+        params.set('uRatio', self.ratio)
+        params.set('uTime', self.get_time())
+        params.set('uWedges', self.wedges)
+        params.set('uBlinkToggle', self.blink_toggle)
+        params.set('uRotationSpeed', self.rotation_speed)
+        params.set('uFocusR1', self.focus_r1)
+        params.set('uFocusR2', self.focus_r2)
+        params.set('uFocusColor', self.focus_color)
+        params.set('uCommandMode', self.command_mode)
+        params.set('uGrids', self.grids)
 
         # Selected patches
         n = len(self.selected_patches)
         assert n < 100, f'Too many selected_patches({n=})'
-        loc = glGetUniformLocation(shader, 'uNumSelectedPatches')
-        glUniform1i(loc, n)
-        for i in range(n):
-            loc = glGetUniformLocation(shader, f"uSelectedPatches[{i}]")
-            glUniform3f(loc, *self.selected_patches[i])
+        params.set('uNumSelectedPatches', n)
+        # The optional phase is only used by the PatchClock
+        params.set('uSelectedPatches', [e[:3] for e in self.selected_patches])
 
         # Ring edges
         n = len(self.ring_edges)
         assert n < 100, f'Too many ring_edges({n=})'
-        loc = glGetUniformLocation(shader, 'uNumRings')
-        glUniform1i(loc, n)
-        loc = glGetUniformLocation(shader, 'uMaxR')
-        glUniform1f(loc, self.ring_edges[-1])
-        for i in range(n):
-            loc = glGetUniformLocation(shader, f"uRingEdges[{i}]")
-            glUniform1f(loc, self.ring_edges[i])
+        params.set('uNumRings', n)
+        params.set('uMaxR', self.ring_edges[-1])
+        params.set('uRingEdges', self.ring_edges)
 
 
 class Design:
     fpath: Path
+    loading: bool = False  # the design is being loaded by the input worker
 
     def __init__(self, fpath: Path):
         self.fpath = fpath
 
+    def parse_conf(self):
+        '''
+        Parse the design into the timeline of the typed events.
+        The values are evaluated here, not in the frame loop.
+        It does not touch the current timeline, so it runs on the input worker.
+
+        :return Timeline: the parsed timeline.
+        '''
+        lines = open(self.fpath, encoding='utf-8').readlines()
+        return Timeline.parse(lines, types=Options.__annotations__)
+
+    def use_timeline(self, timeline):
+        '''Replace the timeline, it runs on the render thread.'''
+        self.timeline = timeline
+        self.jobs = timeline.events
+
     def load_conf(self):
-        jobs = open(self.fpath).readlines()
-        jobs = [e.strip() for e in jobs if e.strip()]
-        jobs = [e for e in jobs if not e.startswith('#')]
-
-        def split(line):
-            a, b = line.split(' ', 1)
-            b = b.strip()
-            c, d = b.split(' ', 1)
-            return (int(a), c.strip(), d.strip())
-
-        jobs = [split(e) for e in jobs]
-        jobs = sorted(jobs, key=lambda e: e[0])
-        self.jobs = jobs
+        '''Parse the design and use it at once.'''
+        self.use_timeline(self.parse_conf())
         return self.jobs
 
 
@@ -433,13 +474,19 @@ design.load_conf()
 [print(e) for e in design.jobs]
 
 parallel = Parallel()
-parallel.reset(ADDRESS)
+parallel.reset(ADDRESS, fallback=CONF.trigger.fallback)
 
 # %% ---- 2026-01-28 ------------------------
 # Play ground
 wnd = GLFWWindow()
 # wnd.load_font('resource/font/MTCORSVA.TTF')
 wnd.load_font('resource/font/MSYH.TTC')
+wnd.marker.enabled = CONF.marker.enabled
+wnd.marker.verify = CONF.marker.verify
+wnd.marker.mode = CONF.marker.mode
+wnd.marker.size = CONF.marker.size
+wnd.marker.corner = CONF.marker.corner
+wnd.marker.triggers = parallel
 wnd.init_window()
 
 keyboard = KeyboardHandler()
@@ -447,6 +494,7 @@ keyboard = KeyboardHandler()
 opt = Options()
 opt.ratio = wnd.width / wnd.height
 opt.reset_time()
+wnd.vsync.time_source = opt.get_time
 opt.selected_patches = [
     (0, 1, 10),
     (1, 2, 20),
@@ -454,9 +502,22 @@ opt.selected_patches = [
 
 print(opt)
 
+tic = time.perf_counter()
 shader, vao, index_count = compile_square()
-
-glfw.set_key_callback(wnd.window, key_callback)
+if SHADER_VARIANTS:
+    shader_manager.preload(shader_library.source(shader_script['vert']),
+                           shader_library.source(shader_script['frag']), [
+        shader_variant(b, c, i) for b in (False, True) for c in (False, True) for i in range(3)])
+if BAKED_LAYOUT:
+    layout = PolarLayout()
+    layout.init_gl()
+logger.info(
+    f'Shaders are ready in {(time.perf_counter() - tic) * 1000:.1f} ms: {shader_manager.report()}')
+# The frames are throttled to the target fps in the fixed pacing mode
+clock = PatchClock(wnd.pacer.target_fps if wnd.pacer.mode ==
+                   'fixed' else wnd.refresh_rate)
+
+wnd.input.add_handler(handle_key)
 
 wnd.render_loop(main_render)
 
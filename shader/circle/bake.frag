@@ -0,0 +1,54 @@
+#version 330 core
+
+// Math constants
+#include "common/math.glsl"
+
+// Bake the polar layout of b.frag into the RGBA32F texture, one texel per pixel
+// R: idxRing, -1 outside uMaxR
+// G: the grid index inside the ring, in [0, uGrids)
+// B: the radius inside the ring, in (0, 1]
+// A: the angle in half turns, atan(y, x) / PI, in [-1, 1]
+// The rotation is not baked, it is the offset of the angle in c.frag.
+
+in vec3 pos;
+out vec4 oLayout;
+
+uniform float uRatio;
+uniform float uMaxR;
+uniform int uGrids;
+
+uniform float uRingEdges[100]; // 100 x float
+uniform int uNumRings;
+
+void main() {
+    float y = pos.y;
+    float x = pos.x * uRatio;
+    float r = sqrt(x * x + y * y);
+    float angle = atan(y, x) * INV_PI;
+
+    if(r > uMaxR) {
+        oLayout = vec4(-1.0, 0.0, 0.0, angle);
+        return;
+    }
+
+    // Locate ring
+    float idxRing = 0.0;
+    float lowerR = 0, higherR = uRingEdges[0];
+    for(int i = 0; i < uNumRings; ++i) {
+        if(uRingEdges[i] < r) {
+            idxRing = i + 1;
+            higherR = uRingEdges[i + 1];
+            lowerR = uRingEdges[i];
+        }
+    }
+
+    // Convert r into (0, 1) range
+    r = (r - lowerR) / (higherR - lowerR);
+    float idxGrid = 0.0;
+    for(int i = 0; i < uGrids; ++i) {
+        if(r > (float(i) / float(uGrids)))
+            idxGrid = i;
+    }
+
+    oLayout = vec4(idxRing, idxGrid, r, angle);
+}
@@ -0,0 +1,10 @@
+#version 330 core
+
+// The full screen triangle, it does not need the vertex buffer
+out vec3 pos;
+
+void main() {
+    vec2 p = vec2((gl_VertexID << 1) & 2, gl_VertexID & 2) * 2.0 - 1.0;
+    gl_Position = vec4(p, 0.0, 1.0);
+    pos = vec3(p, 0.0);
+}
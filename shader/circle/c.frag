@@ -0,0 +1,144 @@
+#version 330 core
+
+// Math constants
+#include "common/math.glsl"
+
+// The same stimulus as b.frag, with the baked layout of bake.frag,
+// so the cost of every pixel does not depend on the rings, the grids or the selected patches.
+
+in vec4 color;
+in vec3 pos;
+out vec4 oColor;
+
+uniform float uRatio;
+uniform float uTime;
+uniform int uWedges;
+uniform float uRotationSpeed;
+uniform float uFocusR1;
+uniform float uFocusR2;
+uniform vec3 uFocusColor;
+uniform int uGrids;
+
+// (idxRing, idxGrid, r in the ring, angle in half turns) of the pixel
+uniform sampler2D uLayout;
+// (selected, freq, index in the selected patches) of the patch at (idxWedge, idxRing)
+uniform sampler2D uSelection;
+
+// The luminance of the selected patches computed from the frame index, see util/patch_clock.py
+uniform float uLuminance[100]; // 100 x float
+
+// The specialized variants are compiled with the constants, see util/shader_manager.py,
+// the branches of them are removed by the compiler.
+#ifdef BLINK_TOGGLE
+#define uBlinkToggle bool(BLINK_TOGGLE)
+#else
+uniform bool uBlinkToggle;
+#endif
+
+#ifdef COMMAND_MODE
+#define uCommandMode bool(COMMAND_MODE)
+#else
+uniform bool uCommandMode;
+#endif
+
+#ifdef IDLE_DISPLAY_MODE
+#define uIdleDisplayMode IDLE_DISPLAY_MODE
+#else
+uniform int uIdleDisplayMode;
+#endif
+
+#ifdef FRAME_CLOCK
+#define uFrameClock bool(FRAME_CLOCK)
+#else
+uniform bool uFrameClock;
+#endif
+
+void main() {
+    float y = pos.y;
+    float x = pos.x * uRatio;
+    float r = sqrt(x * x + y * y);
+
+    // Default color
+    oColor = vec4(vec3(0.0), 0.5);
+
+    if(uCommandMode) {
+        oColor = vec4(vec3(0.2), 0.8);
+    }
+
+    vec4 polar = texelFetch(uLayout, ivec2(gl_FragCoord.xy), 0);
+    float idxRing = polar.x;
+
+    // r exceeds the maxR limit, return
+    if(idxRing < 0.0) {
+        return;
+    }
+
+    // Focus point
+    if(r < uFocusR1) {
+        oColor = vec4(uFocusColor, 1.0);
+        return;
+    }
+
+    if(r < uFocusR2 && abs(x) > uFocusR1 && abs(y) > uFocusR1) {
+        oColor = vec4(uFocusColor, 1.0);
+        return;
+    }
+
+    float idxRingGrid = idxRing * uGrids + polar.y;
+    r = polar.z;
+
+    // The rotation is the offset of the angle
+    float w = uWedges * (polar.w + uTime * uRotationSpeed) * 0.5;
+    float wg = uWedges * uGrids * (polar.w + uTime * uRotationSpeed) * 0.5;
+    w = mod(w, uWedges);
+    wg = mod(wg, uWedges * uGrids);
+
+    float idxWedge = w - mod(w, 1);
+    float idxWedgeGrid = wg - mod(wg, 1);
+    float checkboxColor = mod(idxRing + idxWedge, 2.0);
+    float checkboxGridColor = mod(idxRingGrid + idxWedgeGrid, 2.0);
+
+    vec3 selection = texelFetch(uSelection, ivec2(idxWedge, idxRing), 0).xyz;
+
+    if(uBlinkToggle) {
+        oColor = vec4(vec3(checkboxGridColor), 1.0);
+
+        // If the patch is selected, blink it.
+        if(selection.x > 0.5) {
+            if(uFrameClock) {
+                // The neighbouring grids are in the opposite phase, sin(x + k * PI) = (-1)^k * sin(x)
+                float sign = 1.0 - 2.0 * mod(idxRingGrid + idxWedgeGrid, 2.0);
+                oColor = vec4(vec3(sign * uLuminance[int(selection.z)]), 1.0);
+            } else {
+                float freq = selection.y;
+                oColor = vec4(vec3(sin(uTime * freq * TWO_PI + (idxRingGrid + idxWedgeGrid) * PI)), 1.0);
+            }
+        }
+
+        return;
+
+    }
+
+    // Idle display in gradient
+    if(uIdleDisplayMode == 0) {
+        oColor = vec4(vec3(mod(w, 1.0)) * r, 1.0);
+    }
+
+    // Idle display in checkbox
+    if(uIdleDisplayMode == 1) {
+        oColor = vec4(vec3(checkboxColor), 1.0);
+    }
+
+    // Idle display in checkbox grid
+    if(uIdleDisplayMode == 2) {
+        oColor = vec4(vec3(checkboxGridColor), 1.0);
+    }
+
+    // If the patch is selected, highlight it.
+    if(selection.x > 0.5) {
+        oColor = mix(oColor, vec4(1.0, 0.0, 0.0, 1.0), 0.5);
+    }
+
+    return;
+
+}
@@ -0,0 +1,15 @@
+// The math constants, include it by
+// #include "common/math.glsl"
+#ifndef MATH_CONSTANTS_GLSL
+#define MATH_CONSTANTS_GLSL
+
+const float PI = 3.14159265358979323846;
+const float TWO_PI = 6.28318530717958647692;
+const float HALF_PI = 1.57079632679489661923;
+const float INV_PI = 0.31830988618379067154;
+const float INV_TWO_PI = 0.15915494309189533577;
+
+const float E = 2.71828182845904523536;
+const float GOLDEN_RATIO = 1.61803398874989484820;
+
+#endif
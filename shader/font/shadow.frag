@@ -1,27 +1,30 @@
 #version 330 core
 
 in vec2 TexCoord;
+// The (u0, v0, u1, v1) rectangle of the glyph in the atlas
+in vec4 GlyphRect;
+in vec3 TextColor;
 out vec4 FragColor;
 
 uniform sampler2D textTexture;
-uniform vec3 textColor;
 
 void main()
 {
     // 阴影颜色
-    vec3 shadowColor = vec3(1.0) - textColor; //vec3(1.0, 1.0, 1.0);
-    // 阴影偏移量
-    vec2 shadowOffset = vec2(0.05, 0.05);
-    // 获取阴影的alpha值
-    float shadowAlpha = texture(textTexture, TexCoord - shadowOffset).r;
+    vec3 shadowColor = vec3(1.0) - TextColor; //vec3(1.0, 1.0, 1.0);
+    // 阴影偏移量（相对于字符大小）
+    vec2 shadowOffset = vec2(0.05, 0.05) * (GlyphRect.zw - GlyphRect.xy);
+    // 获取阴影的alpha值，不要越过字符的边界
+    vec2 shadowCoord = clamp(TexCoord - shadowOffset, GlyphRect.xy, GlyphRect.zw);
+    float shadowAlpha = texture(textTexture, shadowCoord).r;
     
     // 获取主文本的alpha值
     float alpha = texture(textTexture, TexCoord).r;
     
     // 混合阴影和文本
     vec4 shadow = vec4(shadowColor, shadowAlpha * 1.0); // 阴影透明度
-    vec4 text = vec4(textColor, alpha);
+    vec4 text = vec4(TextColor, alpha);
     
     // 先绘制阴影，再在其上绘制文本
     FragColor = mix(shadow, text, text.a);
-}
\ No newline at end of file
+}
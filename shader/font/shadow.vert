@@ -2,12 +2,18 @@
 
 layout(location = 0) in vec2 aPos;
 layout(location = 1) in vec2 aTexCoord;
+layout(location = 2) in vec4 aGlyphRect;
+layout(location = 3) in vec4 aColor;
 
 out vec2 TexCoord;
+out vec4 GlyphRect;
+out vec3 TextColor;
 
 uniform mat4 projection;
 
 void main() {
     gl_Position = projection * vec4(aPos, 0.0, 1.0);
     TexCoord = aTexCoord;
-}
\ No newline at end of file
+    GlyphRect = aGlyphRect;
+    TextColor = aColor.rgb;
+}
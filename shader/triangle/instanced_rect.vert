@@ -0,0 +1,20 @@
+#version 330 core
+
+// The rectangle of every instance, it is drawn by 6 vertices with glDrawArraysInstanced
+layout(location = 0) in vec4 aRect; // x, y, w, h in pixels
+layout(location = 1) in vec4 aColor;
+out vec2 scaledXY;
+out vec4 vColor;
+uniform mat4 projection;
+
+// The corners of the two triangles, in the order of GLFWWindow.draw_rect()
+const vec2 CORNERS[6] = vec2[6](
+    vec2(0.0, 0.0), vec2(0.0, 1.0), vec2(1.0, 0.0),
+    vec2(1.0, 0.0), vec2(0.0, 1.0), vec2(1.0, 1.0));
+
+void main() {
+    vec2 corner = CORNERS[gl_VertexID];
+    gl_Position = projection * vec4(aRect.xy + corner * aRect.zw, 0.0, 1.0);
+    scaledXY = corner;
+    vColor = aColor;
+}
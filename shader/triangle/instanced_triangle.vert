@@ -0,0 +1,20 @@
+#version 330 core
+
+// The triangle of every instance, it is drawn by 3 vertices with glDrawArraysInstanced
+layout(location = 0) in vec2 aPos1; // in pixels
+layout(location = 1) in vec2 aPos2;
+layout(location = 2) in vec2 aPos3;
+layout(location = 3) in vec4 aColor;
+out vec2 scaledXY;
+out vec4 vColor;
+uniform mat4 projection;
+
+// The normalized position of the vertices, like the default of GLFWWindow.draw_triangle()
+const vec2 N_POS[3] = vec2[3](vec2(0.0, 0.0), vec2(1.0, 0.0), vec2(0.0, 1.0));
+
+void main() {
+    vec2 pos = gl_VertexID == 0 ? aPos1 : (gl_VertexID == 1 ? aPos2 : aPos3);
+    gl_Position = projection * vec4(pos, 0.0, 1.0);
+    scaledXY = N_POS[gl_VertexID];
+    vColor = aColor;
+}
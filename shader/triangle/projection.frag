@@ -1,12 +1,12 @@
 #version 330 core
 
 in vec2 scaledXY;
+in vec4 vColor;
 out vec4 FragColor;
-uniform vec4 uColor;
 
 void main()
 {
-    FragColor = vec4(uColor);
+    FragColor = vec4(vColor);
     // FragColor = vec4(scaledXY, 0.0, 1.0);
     FragColor.a = exp(- 1.0 * length(scaledXY-0.5));
-}
\ No newline at end of file
+}
@@ -2,10 +2,13 @@
 
 layout(location = 0) in vec2 aPos;
 layout(location = 1) in vec2 nPos;
+layout(location = 2) in vec4 aColor;
 out vec2 scaledXY;
+out vec4 vColor;
 uniform mat4 projection;
 
 void main() {
     gl_Position = projection * vec4(aPos, 0.0, 1.0);
     scaledXY = nPos;
-}
\ No newline at end of file
+    vColor = aColor;
+}
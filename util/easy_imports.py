@@ -9,5 +9,7 @@ from omegaconf import OmegaConf
 
 from loguru import logger
 
-CONF = OmegaConf.load('./conf/project.yaml')
-logger.add(f'./log/{CONF.project.name}.log', rotation='1 MB')
+# The package root, the conf and the log folders are there, so they are found from any working directory
+ROOT = Path(__file__).resolve().parent.parent
+CONF = OmegaConf.load(ROOT.joinpath('conf/project.yaml'))
+logger.add(ROOT.joinpath(f'log/{CONF.project.name}.log'), rotation='1 MB')
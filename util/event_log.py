@@ -0,0 +1,162 @@
+"""
+File: event_log.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Structured event log for the timing-critical events.
+    The render thread only appends the event to the queue,
+    the events are written as JSON lines by the background thread.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import json
+import threading
+from collections import deque
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class EventLog:
+    '''
+    The events in the JSON lines file, one event per line::
+
+        {"t_ns": 123456789, "event": "key_press", "key": "b"}
+
+    The t_ns is time.perf_counter_ns() when the event is written, unless it is given.
+    The write() does not format or write anything, it appends the tuple to the deque,
+    the background thread writes the events every flush_interval seconds.
+    The event of the level is also logged by the logger on the background thread,
+    so the file sink of the logger is not written in the frame loop.
+    When the queue is full, the events are dropped and counted.
+
+    Usage::
+
+        events.start()
+        # In the frame loop
+        events.write('key_press', key='b')
+        events.write('frame_missed', level='WARNING', frame=100)
+        # At the end
+        events.stop()
+    '''
+
+    enabled = False
+
+    def __init__(self, path='log/events', flush_interval=0.1, max_queue=65536):
+        '''
+        :param path str: the output path without the suffix, the time is appended, the relative path is in the package root.
+        :param flush_interval float: how often the events are written, in seconds.
+        :param max_queue int: how many events can be waiting for the writer.
+        '''
+        self.path = ROOT.joinpath(path)
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.queue = deque()
+        self.file = None
+        self.thread = None
+        self.written = 0
+        self.dropped = 0
+
+    def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fpath = Path(f'{self.path}-{time.strftime("%Y%m%d-%H%M%S")}.jsonl')
+        self.file = open(self.fpath, 'w', encoding='utf-8')
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        logger.info(f'Event log: {self.fpath}')
+
+    def write(self, event, t_ns=None, level=None, **fields):
+        '''
+        Append the event, it is cheap enough for the frame loop.
+
+        :param event str: the name of the event.
+        :param t_ns int: the time of the event, time.perf_counter_ns() by default.
+        :param level str: the level of the logger, like 'WARNING', None for not logging it.
+        :param fields: the fields of the event, they are converted by str() if they are not JSON types.
+        '''
+        if self.file is None:
+            return
+        if t_ns is None:
+            t_ns = time.perf_counter_ns()
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self.queue.append((t_ns, event, level, fields))
+
+    def _drain(self):
+        lines = []
+        logs = []
+        while self.queue:
+            t_ns, event, level, fields = self.queue.popleft()
+            lines.append(json.dumps(
+                dict(t_ns=t_ns, event=event, **fields), default=str))
+            if level is not None:
+                logs.append((level, event, fields))
+        if lines:
+            self.file.write('\n'.join(lines) + '\n')
+            self.file.flush()
+            self.written += len(lines)
+        for level, event, fields in logs:
+            logger.bind(event=event, **fields).log(level, f'{event}: {fields}')
+
+    def _run(self):
+        while not self.stopping.wait(self.flush_interval):
+            self._drain()
+
+    def stop(self):
+        '''Write the rest of the events and close the file.'''
+        if self.file is None:
+            return
+        self.stopping.set()
+        self.thread.join()
+        self._drain()
+        self.file.close()
+        self.file = None
+        if self.dropped:
+            logger.warning(f'Event log: {self.dropped} events are dropped')
+
+
+def measure_latency(fn, *args, n=10000, **kwargs):
+    '''
+    Measure the time of every call of fn(*args, **kwargs) on the calling thread.
+
+    :return dict: the statistics of the per-call latency in microseconds.
+    '''
+    ts = np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        tic = time.perf_counter_ns()
+        fn(*args, **kwargs)
+        ts[i] = time.perf_counter_ns() - tic
+    ts = ts / 1000
+    return dict(
+        mean_us=ts.mean(),
+        p50_us=np.percentile(ts, 50),
+        p99_us=np.percentile(ts, 99),
+        max_us=ts.max(),
+    )
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,170 @@
+"""
+File: flip_scheduler.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Frame-accurate event scheduling.
+    Predict the flip time of the frame being drawn,
+    and run the deferred actions (like the triggers) right after the frame is swapped.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+from .vsync_monitor import VsyncMonitor
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class FlipScheduler:
+    '''
+    Map the events to the frame whose predicted flip time is the closest.
+
+    The flip time is predicted from the latest swap timestamp and the refresh period,
+    the period is corrected by the measured swap intervals.
+
+    Usage::
+
+        # In the frame
+        flip = scheduler.predict_flip_time()
+        for event in timeline.due(scheduler.horizon_ms()):
+            apply(event)
+            scheduler.defer(send_trigger, code, scheduled=event_time, label='...')
+
+        # Right after the swap, in the render loop
+        scheduler.on_swap()
+    '''
+
+    # The EventLog of the deferred events, they are logged by the logger if it is None
+    events = None
+
+    def __init__(self, vsync: VsyncMonitor):
+        self.vsync = vsync
+        # The actions of the frame being drawn, they run after the swap
+        self.deferred = []
+        self.predicted_ns = None
+
+    def session_time(self):
+        return self.vsync.session_time()
+
+    def period_ns(self):
+        '''
+        The refresh period, corrected by the median of the measured intervals.
+        '''
+        period = self.vsync.period_ns
+        jitter = self.vsync.jitter()
+        if len(jitter) >= 10:
+            corrected = period + float(np.median(jitter[-120:]))
+            # Do not trust the measurement when the frames are missed or unthrottled
+            if 0.9 * period < corrected < 1.1 * period:
+                return corrected
+        return period
+
+    def predict_flip_ns(self, now_ns=None):
+        '''
+        Predict the perf_counter_ns() time when the frame being drawn is shown.
+        '''
+        if now_ns is None:
+            now_ns = time.perf_counter_ns()
+
+        last = self.vsync.last_ns
+        period = self.period_ns()
+        if last is None:
+            return now_ns + period
+
+        # The next vsync after now
+        n = max(1, int((now_ns - last) // period) + 1)
+        return last + n * period
+
+    def predict_flip_time(self):
+        '''
+        Predict the session time (in seconds) when the frame being drawn is shown.
+        '''
+        now_ns = time.perf_counter_ns()
+        self.predicted_ns = self.predict_flip_ns(now_ns)
+        return self.session_time() + (self.predicted_ns - now_ns) / 1e9
+
+    def horizon_ms(self):
+        '''
+        The events before the horizon are closer to the flip of this frame than the next one.
+
+        :return int: the session time in ms.
+        '''
+        flip = self.predict_flip_time()
+        return int(1000 * flip + 500 * self.period_ns() / 1e9)
+
+    def defer(self, fn, *args, scheduled=None, label=None):
+        '''
+        Run fn(*args) right after the frame being drawn is swapped.
+
+        :param scheduled float: the scheduled session time (in seconds) of the event, for logging.
+        :param label str: the label of the event, for logging.
+        '''
+        self.deferred.append((fn, args, scheduled, label))
+
+    def on_swap(self, t_ns=None):
+        '''
+        Run the deferred actions, it is called right after the buffers are swapped.
+
+        The logged swap_return is the time the swap_buffers() returns, it is NOT the measured flip.
+        There is no flip in the headless mode, and with the vsync it depends on the queue depth of the driver.
+        So the swap_error_ms (swap_return - scheduled) is only a proxy of the lateness of the event,
+        it is logged for the reference and not counted in any statistics, see VsyncMonitor for the late frames.
+
+        :param t_ns int: the perf_counter_ns() time when the swap_buffers() returns.
+        '''
+        if not self.deferred:
+            return
+
+        if t_ns is None:
+            t_ns = time.perf_counter_ns()
+
+        swap_return = self.session_time() - (time.perf_counter_ns() - t_ns) / 1e9
+        deferred = self.deferred
+        self.deferred = []
+
+        for fn, args, scheduled, label in deferred:
+            fn(*args)
+
+        predicted = None
+        if self.predicted_ns is not None:
+            predicted = swap_return + (self.predicted_ns - t_ns) / 1e9
+
+        for fn, args, scheduled, label in deferred:
+            fields = dict(
+                event='flip_scheduled',
+                label=label,
+                scheduled=scheduled,
+                predicted_flip=predicted,
+                swap_return=swap_return,
+                swap_error_ms=None if scheduled is None else (
+                    swap_return - scheduled) * 1000,
+            )
+            if self.events is not None and self.events.enabled:
+                self.events.write(**fields)
+            else:
+                logger.bind(**fields).debug(f'Deferred: {fields}')
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
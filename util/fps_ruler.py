@@ -19,27 +19,62 @@ Functions:
 # %% ---- 2025-10-09 ------------------------
 # Requirements and constants
 import time
-from collections import deque
+import numpy as np
 
 # %% ---- 2025-10-09 ------------------------
 # Function and class
 
 
 class FPSRuler:
-    def __init__(self, max_samples=100):
+    def __init__(self, max_samples=100, ewma_alpha=0.1):
         """
         Initialize the frame rate counter.
 
+        The frame times are in the preallocated ring buffer,
+        and their running sum makes the mean frame rate O(1).
+
         Args:
-            max_samples (int): Maximum number of timestamps to store for calculating frame rate.
+            max_samples (int): Maximum number of frame times to store for calculating frame rate.
+            ewma_alpha (float): The weight of the latest frame time in the exponentially weighted frame rate.
         """
-        self.timestamps = deque(maxlen=max_samples)
+        self.max_samples = max_samples
+        self.ewma_alpha = ewma_alpha
+        self.deltas = np.zeros(max_samples, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the recorded frames.
+        """
+        self.last = None
+        self.index = 0
+        self.count = 0
+        self.total = 0
+        self.ewma_delta = 0.0
 
     def update(self):
         """
         Update the frame rate counter with the current timestamp.
         """
-        self.timestamps.append(time.time())
+        t = time.perf_counter_ns()
+        if self.last is not None:
+            delta = t - self.last
+
+            # Replace the oldest frame time in the running sum
+            if self.count == self.max_samples:
+                self.total -= int(self.deltas[self.index])
+            else:
+                self.count += 1
+            self.total += delta
+            self.deltas[self.index] = delta
+            self.index = (self.index + 1) % self.max_samples
+
+            if self.count == 1:
+                self.ewma_delta = float(delta)
+            else:
+                self.ewma_delta += self.ewma_alpha * (delta - self.ewma_delta)
+
+        self.last = t
 
     def get_fps(self):
         """
@@ -48,16 +83,52 @@ class FPSRuler:
         Returns:
             float: The calculated frame rate, or 0.0 if not enough data is available.
         """
-        if len(self.timestamps) < 2:
+        if self.count == 0 or self.total <= 0:
             return 0.0
-        time_deltas = [self.timestamps[i] - self.timestamps[i - 1]
-                       for i in range(1, len(self.timestamps))]
-        avg_delta = sum(time_deltas) / len(time_deltas)
-        rate = 1.0 / avg_delta if avg_delta > 0 else 0.0
-        return rate
+        return 1e9 * self.count / self.total
+
+    def get_ewma_fps(self):
+        """
+        Calculate and return the exponentially weighted frame rate.
+
+        Returns:
+            float: The calculated frame rate, or 0.0 if not enough data is available.
+        """
+        if self.ewma_delta <= 0:
+            return 0.0
+        return 1e9 / self.ewma_delta
+
+    def get_frame_times(self):
+        """
+        The recorded frame times in milliseconds, the order is not kept.
+        """
+        return self.deltas[:self.count] / 1e6
+
+    def get_frame_time_stats(self, percentiles=(50, 95, 99)):
+        """
+        Calculate the frame time statistics, it is O(max_samples) and it is called on demand.
+
+        Returns:
+            dict: The min, max and percentiles of the frame time in milliseconds.
+        """
+        if self.count == 0:
+            return {}
+        frame_times = self.get_frame_times()
+        res = dict(min_ms=float(frame_times.min()),
+                   max_ms=float(frame_times.max()))
+        for p, v in zip(percentiles, np.percentile(frame_times, percentiles)):
+            res[f'p{p}_ms'] = float(v)
+        return res
 
 # %% ---- 2025-10-09 ------------------------
 # Play ground
+if __name__ == '__main__':
+    fps = FPSRuler()
+    for _ in range(200):
+        time.sleep(0.01)
+        fps.update()
+    print(f'FPS: {fps.get_fps():.2f}, EWMA FPS: {fps.get_ewma_fps():.2f}')
+    print(fps.get_frame_time_stats())
 
 
 # %% ---- 2025-10-09 ------------------------
@@ -0,0 +1,156 @@
+"""
+File: frame_pacer.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Render loop pacing.
+    Decide how the frames are throttled, and report the CPU utilization and the frame times.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import glfw
+
+from .fps_ruler import FPSRuler
+from .parallel.parallel import sleep_until
+
+# The pacing modes
+MODES = ['vsync', 'adaptive', 'fixed', 'unthrottled']
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class FramePacer:
+    '''
+    The pacing modes of the render loop.
+
+    - vsync: swap interval 1, the swap waits for the vertical blank, no tearing.
+    - adaptive: swap interval -1, it waits for the vertical blank,
+      but the late frame is swapped at once (with tearing) instead of waiting for the next one.
+      It falls back to vsync if the driver does not support it.
+    - fixed: swap interval 0, the frames are throttled to target_fps by sleeping then spinning.
+    - unthrottled: swap interval 0, as fast as possible, for benchmarking.
+    '''
+
+    def __init__(self, mode='vsync', target_fps=60, spin=0.002, max_samples=1200):
+        '''
+        :param mode str: one of MODES.
+        :param target_fps float: the frame rate of the fixed mode.
+        :param spin float: the last part of the waiting is spin-waited, in seconds.
+        :param max_samples int: how many frame times are kept for the statistics.
+        '''
+        if mode not in MODES:
+            raise ValueError(f'Unknown pacing mode: {mode}, it is one of {MODES}')
+
+        self.mode = mode
+        self.target_fps = target_fps
+        self.spin_ns = int(spin * 1e9)
+        self.frame_times = FPSRuler(max_samples=max_samples)
+        self.deadline_ns = None
+
+    def apply(self, has_swap_control=True):
+        '''
+        Set the swap interval, the GLFW context must be current.
+
+        :param has_swap_control bool: whether the swap interval can be set, False in the headless mode.
+        '''
+        if self.mode == 'adaptive' and has_swap_control:
+            if not (glfw.extension_supported('WGL_EXT_swap_control_tear') or
+                    glfw.extension_supported('GLX_EXT_swap_control_tear')):
+                logger.warning(
+                    'Adaptive vsync is not supported, using vsync instead')
+                self.mode = 'vsync'
+
+        interval = {'vsync': 1, 'adaptive': -1,
+                    'fixed': 0, 'unthrottled': 0}[self.mode]
+        if has_swap_control:
+            glfw.swap_interval(interval)
+        logger.info(f'Pacing: {self.mode} (swap interval {interval})')
+
+        self.reset()
+
+    def reset(self):
+        self.deadline_ns = None
+        self.frame_times.reset()
+        self.tic_wall = time.perf_counter()
+        self.tic_cpu = time.process_time()
+        self.tic_thread = time.thread_time()
+
+    def period_ns(self):
+        return int(1e9 / self.target_fps)
+
+    def wait(self):
+        '''
+        Wait for the time of the frame, it is called right before the swap.
+        Only the fixed mode waits.
+        '''
+        if self.mode != 'fixed':
+            return
+
+        now = time.perf_counter_ns()
+        period = self.period_ns()
+        if self.deadline_ns is None or now - self.deadline_ns > period:
+            # Too late, start again from now instead of rushing the missed frames
+            self.deadline_ns = now + period
+            return
+
+        sleep_until(self.deadline_ns, self.spin_ns)
+        self.deadline_ns += period
+
+    def update(self):
+        '''Update the frame times, it is called once per frame.'''
+        self.frame_times.update()
+
+    def report(self):
+        '''
+        The CPU utilization and the frame time statistics since apply().
+
+        :return dict: the cpu_percent is the CPU time of the process over the wall time,
+                      100 means a full core, the render_thread_percent is the render thread only.
+        '''
+        wall = time.perf_counter() - self.tic_wall
+        res = dict(
+            mode=self.mode,
+            fps=self.frame_times.get_fps(),
+            cpu_percent=100 * (time.process_time() - self.tic_cpu) / wall,
+            render_thread_percent=100 *
+            (time.thread_time() - self.tic_thread) / wall,
+        )
+        if self.mode == 'fixed':
+            res['target_fps'] = self.target_fps
+        res.update({f'frame_{k}': v for k, v in
+                    self.frame_times.get_frame_time_stats().items()})
+        return res
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    # The fixed mode without the window
+    pacer = FramePacer('fixed', target_fps=120)
+    pacer.reset()
+    for _ in range(240):
+        pacer.wait()
+        pacer.update()
+    logger.info(pacer.report())
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
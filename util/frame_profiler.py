@@ -0,0 +1,202 @@
+"""
+File: frame_profiler.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Frame profiler.
+    Record the CPU and GPU time of every stage in the frame.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import ctypes
+from OpenGL.GL import *
+# The wrapped version fails to convert the uint64 output
+from OpenGL.raw.GL.VERSION.GL_3_3 import glGetQueryObjectui64v
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class FrameProfiler:
+    '''
+    Record the per-stage CPU time with perf_counter_ns,
+    and the per-stage GPU time with the GL_TIME_ELAPSED queries.
+
+    The GPU results are read back latency frames later, so the CPU mostly does not wait for the GPU.
+    If the result is still not available when its query is reused,
+    the profiler waits for it and counts the stall, or drops it and counts it with wait=False,
+    see gpu_stalls and gpu_dropped in the summary().
+    The results are in the ring buffer of the latest max_frames frames,
+    the value of -1 means not available.
+
+    Usage::
+
+        profiler.begin_frame()
+        profiler.begin('main_render')
+        main_render()
+        profiler.end('main_render')
+        profiler.end_frame()
+    '''
+
+    def __init__(self, stages, max_frames=600, latency=3, gpu=True, wait=True):
+        '''
+        :param stages list: the stage names.
+        :param max_frames int: the size of the ring buffer, it is larger than the latency.
+        :param latency int: how many frames later the GPU results are read.
+        :param gpu bool: whether to time the GPU.
+        :param wait bool: wait for the GPU result that is not available when its query is reused, or drop it.
+        '''
+        if max_frames <= latency:
+            raise ValueError(
+                f'The max_frames ({max_frames}) must be larger than the latency ({latency})')
+        self.stages = list(stages)
+        self.stage_index = {name: i for i, name in enumerate(self.stages)}
+        self.max_frames = max_frames
+        self.latency = latency
+        self.gpu = gpu
+        self.wait = wait
+
+        n = len(self.stages)
+        self.cpu_ns = np.full((max_frames, n), -1, dtype=np.int64)
+        self.gpu_ns = np.full((max_frames, n), -1, dtype=np.int64)
+        self.frame_ns = np.full(max_frames, -1, dtype=np.int64)
+
+        # The frame being recorded
+        self.frame = -1
+        self.frame_tic = 0
+        self.tic = np.zeros(n, dtype=np.int64)
+
+        # Query objects of the frames in flight, they are created in the GL context
+        self.queries = None
+        self.query_frames = np.full(latency + 1, -1, dtype=np.int64)
+        # Whether the query of the stage is begun in the slot, and its result is not read
+        self.query_pending = np.zeros((latency + 1, n), dtype=bool)
+        self._result = ctypes.c_uint64(0)
+
+        # The GPU results waited for or dropped, for every stage
+        self.gpu_stalls = np.zeros(n, dtype=np.int64)
+        self.gpu_dropped = np.zeros(n, dtype=np.int64)
+
+    def init_gl(self):
+        '''Create the query objects, it requires the OpenGL context.'''
+        if not self.gpu:
+            return
+        n = (self.latency + 1) * len(self.stages)
+        self.queries = np.array(glGenQueries(n), dtype=np.uint32).reshape(
+            self.latency + 1, len(self.stages))
+
+    @property
+    def row(self):
+        return self.frame % self.max_frames
+
+    def begin_frame(self):
+        self.frame += 1
+        self.frame_tic = time.perf_counter_ns()
+        self.cpu_ns[self.row] = -1
+        self.gpu_ns[self.row] = -1
+        self.frame_ns[self.row] = -1
+
+        if self.queries is not None:
+            # The query slot is reused, collect its results first
+            slot = self.frame % (self.latency + 1)
+            self._collect(slot)
+            self.query_frames[slot] = self.frame
+
+    def end_frame(self):
+        self.frame_ns[self.row] = time.perf_counter_ns() - self.frame_tic
+
+    def begin(self, stage):
+        i = self.stage_index[stage]
+        if self.queries is not None:
+            slot = self.frame % (self.latency + 1)
+            glBeginQuery(GL_TIME_ELAPSED, int(self.queries[slot, i]))
+            self.query_pending[slot, i] = True
+        self.tic[i] = time.perf_counter_ns()
+
+    def end(self, stage):
+        i = self.stage_index[stage]
+        self.cpu_ns[self.row, i] = time.perf_counter_ns() - self.tic[i]
+        if self.queries is not None:
+            glEndQuery(GL_TIME_ELAPSED)
+
+    def _collect(self, slot):
+        '''Read the results of the slot, it is called before the slot is reused.'''
+        frame = self.query_frames[slot]
+        if frame < 0:
+            return
+
+        row = frame % self.max_frames
+        for i, query in enumerate(self.queries[slot]):
+            # The stage is not recorded in the frame
+            if not self.query_pending[slot, i]:
+                continue
+            self.query_pending[slot, i] = False
+            if not glGetQueryObjectiv(int(query), GL_QUERY_RESULT_AVAILABLE):
+                if not self.wait:
+                    self.gpu_dropped[i] += 1
+                    continue
+                # The GL_QUERY_RESULT waits for the GPU
+                self.gpu_stalls[i] += 1
+            glGetQueryObjectui64v(int(query), GL_QUERY_RESULT,
+                                  ctypes.byref(self._result))
+            self.gpu_ns[row, i] = self._result.value
+
+    def latest(self, n=None):
+        '''
+        The records of the latest n frames, the oldest first.
+
+        :return cpu_ns, gpu_ns, frame_ns: the (n, stages), (n, stages) and (n,) arrays in nanoseconds.
+        '''
+        count = min(self.frame + 1, self.max_frames)
+        n = count if n is None else min(n, count)
+        rows = np.arange(self.frame - n + 1, self.frame + 1) % self.max_frames
+        return self.cpu_ns[rows], self.gpu_ns[rows], self.frame_ns[rows]
+
+    def summary(self, n=None):
+        '''
+        Summary of the latest n frames.
+
+        :return dict: stage -> {cpu_mean_ms, cpu_max_ms, gpu_mean_ms, gpu_max_ms, gpu_stalls, gpu_dropped},
+                      the gpu_stalls and gpu_dropped are counted since the start.
+        '''
+        cpu_ns, gpu_ns, _ = self.latest(n)
+        res = {}
+        for i, stage in enumerate(self.stages):
+            res[stage] = {}
+            for name, data in [('cpu', cpu_ns[:, i]), ('gpu', gpu_ns[:, i])]:
+                data = data[data >= 0]
+                res[stage][f'{name}_mean_ms'] = float(data.mean()) / 1e6 if len(data) else float('nan')
+                res[stage][f'{name}_max_ms'] = float(data.max()) / 1e6 if len(data) else float('nan')
+            res[stage]['gpu_stalls'] = int(self.gpu_stalls[i])
+            res[stage]['gpu_dropped'] = int(self.gpu_dropped[i])
+        return res
+
+    def release(self):
+        if self.queries is not None:
+            glDeleteQueries(self.queries.size, self.queries.reshape(-1))
+            self.queries = None
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,385 @@
+"""
+File: frame_recorder.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Stimulus-to-video exporter.
+    The frames are read back by the ring of PBOs,
+    and they are written by the background encoder process.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import sys
+import json
+import zlib
+import queue
+import shutil
+import struct
+import threading
+import subprocess
+from multiprocessing import shared_memory, resource_tracker
+
+from .pbo_readback import PBOReadback
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class RawWriter:
+    '''The RGBA frames one after another, the top row first.'''
+    suffix = '.rgba'
+
+    def __init__(self, path, width, height, fps):
+        self.file = open(path + self.suffix, 'wb')
+
+    def write(self, frame):
+        self.file.write(frame)
+        return frame.nbytes
+
+    def close(self):
+        self.file.close()
+
+
+class ZlibWriter(RawWriter):
+    '''Every frame is the uint32 length and the zlib compressed RGBA frame.'''
+    suffix = '.zlib'
+
+    def write(self, frame):
+        data = zlib.compress(frame, 1)
+        self.file.write(struct.pack('<I', len(data)))
+        self.file.write(data)
+        return len(data) + 4
+
+
+class FFmpegWriter:
+    '''The H.264 video encoded by ffmpeg, it requires ffmpeg in the PATH.'''
+    suffix = '.mp4'
+
+    def __init__(self, path, width, height, fps):
+        self.process = subprocess.Popen([
+            shutil.which('ffmpeg'), '-loglevel', 'error', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba',
+            '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+            path + self.suffix], stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self.process.stdin.write(frame)
+        return frame.nbytes
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+WRITERS = {
+    'raw': RawWriter,
+    'zlib': ZlibWriter,
+    'ffmpeg': FFmpegWriter,
+}
+
+
+def encode_frames(shm_name, shape, slots, path, format, fps, jobs=sys.stdin, out=sys.stdout):
+    '''
+    The encoder process, see the Play ground.
+    The frames are in the slots of the shared memory.
+
+    It writes the line of "ready" when it is started,
+    reads the lines of "slot index" from the jobs, and the empty line to stop,
+    the line of "error text" is the error of the recording, it is written into the .json.
+    It writes the line of "free slot" after the frame is written,
+    and the line of "done {json}" at the end.
+    '''
+    shm = shared_memory.SharedMemory(name=shm_name)
+    # The shared memory is owned by the recorder, do not let the tracker of this process unlink it
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    frames = np.ndarray((slots, *shape), dtype=np.uint8, buffer=shm.buf)
+    height, width, _ = shape
+    writer = WRITERS[format](path, width, height, fps)
+    out.write('ready\n')
+    out.flush()
+
+    indexes = []
+    error = None
+    nbytes = 0
+    # The time spent on writing, the rest is waiting for the frames
+    busy = 0
+    for line in jobs:
+        if not line.strip():
+            break
+        if line.startswith('error '):
+            error = line[len('error '):].strip()
+            continue
+
+        tic = time.perf_counter()
+        slot, index = map(int, line.split())
+        # The frame is read bottom row first
+        nbytes += writer.write(np.ascontiguousarray(frames[slot][::-1]))
+        out.write(f'free {slot}\n')
+        out.flush()
+        indexes.append(index)
+        busy += time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    writer.close()
+    busy += time.perf_counter() - tic
+
+    # The frame indexes tell the dropped frames
+    with open(path + '.json', 'w') as f:
+        json.dump(dict(width=width, height=height, fps=fps, format=format,
+                       file=Path(path + writer.suffix).name, frames=indexes, error=error), f)
+
+    out.write('done ' + json.dumps(
+        dict(written=len(indexes), bytes=nbytes, busy=busy)) + '\n')
+    out.flush()
+
+    del frames
+    shm.close()
+
+
+class FrameRecorder:
+    '''
+    Record every frame being displayed.
+
+    The frame is read into the ring of PBOs before the swap,
+    the finished reads are copied into the free slot of the shared memory,
+    and the background process encodes them.
+    The render loop never waits, the frame is dropped when
+    - all the PBOs are in flight, or
+    - no slot is free, the encoder is slower than the frames.
+    If the encoder exits, the recording stops with the error in the stats, the rendering goes on.
+
+    Usage::
+
+        recorder.start(width, height, fps)
+        # Every frame, before the swap
+        recorder.capture()
+        # At the end
+        recorder.stop()
+    '''
+
+    enabled = False
+
+    def __init__(self, path='record/session', format='raw', ring=3, slots=8):
+        '''
+        :param path str: the output path without the suffix, the time is appended, the relative path is in the package root.
+        :param format str: 'raw', 'zlib' or 'ffmpeg'.
+        :param ring int: how many PBO reads can be in flight.
+        :param slots int: how many frames can be waiting for the encoder.
+        '''
+        self.path = ROOT.joinpath(path)
+        self.format = format
+        self.ring = ring
+        self.slots = slots
+        self.process = None
+        self.stats = None
+
+    def start(self, width, height, fps=60):
+        '''Start recording, it requires the OpenGL context.'''
+        if self.format == 'ffmpeg' and shutil.which('ffmpeg') is None:
+            logger.warning('Can not find ffmpeg, the frames are recorded as zlib')
+            self.format = 'zlib'
+
+        self.width = width
+        self.height = height
+        self.shape = (height, width, 4)
+
+        self.readback = PBOReadback(self.ring)
+        self.readback.init_gl()
+
+        nbytes = self.slots * width * height * 4
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.frames = np.ndarray(
+            (self.slots, *self.shape), dtype=np.uint8, buffer=self.shm.buf)
+
+        # The free slots and the result are sent back by the encoder
+        self.free = queue.Queue()
+        self.results = queue.Queue()
+        for slot in range(self.slots):
+            self.free.put(slot)
+        self.slot_of = {}
+        self.ready = threading.Event()
+
+        self.frame = 0
+        self.queued = 0
+        self.dropped = 0
+        self.stopping = False
+        self.stats = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        path = f'{self.path}-{time.strftime("%Y%m%d-%H%M%S")}'
+        # The encoder is started as the module, so the script is not imported again,
+        # and it does not inherit the OpenGL context
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'util.frame_recorder',
+             self.shm.name, str(height), str(width), str(self.slots),
+             path, self.format, str(fps)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=ROOT)
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+        # Wait for the encoder, so the first frames are not dropped
+        tic = time.perf_counter()
+        while not self.ready.wait(timeout=0.1):
+            if self.process.poll() is not None:
+                self._abort(
+                    f'The encoder exits with {self.process.returncode} before it is ready')
+                return
+            if time.perf_counter() - tic > 30:
+                logger.warning('The encoder is not ready in time')
+                break
+
+        self.tic = time.perf_counter()
+        logger.info(
+            f'Recording {width} x {height} ({self.format}) into {path}')
+
+    def _dest(self, index, shape):
+        try:
+            # Only wait for the encoder when the recording stops
+            slot = self.free.get(timeout=10) if self.stopping else self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return None
+        self.slot_of[index] = slot
+        return self.frames[slot]
+
+    def _read(self):
+        for line in self.process.stdout:
+            kind, _, value = line.strip().partition(' ')
+            if kind == 'free':
+                self.free.put(int(value))
+            elif kind == 'ready':
+                self.ready.set()
+            elif kind == 'done':
+                self.results.put(json.loads(value))
+
+    def _collect(self, wait=False):
+        for index, _ in self.readback.collect(wait, dest=self._dest):
+            slot = self.slot_of.pop(index)
+            if self._exited():
+                return
+            try:
+                self.process.stdin.write(f'{slot} {index}\n')
+                self.process.stdin.flush()
+            except OSError as err:
+                self._abort(f'The encoder is gone ({err!r})')
+                return
+            self.queued += 1
+
+    def _exited(self):
+        '''Whether the encoder has exited, the recording is aborted if so.'''
+        if self.process.poll() is None:
+            return False
+        self._abort(f'The encoder exits with {self.process.returncode}')
+        return True
+
+    def _abort(self, reason):
+        '''Stop recording without the encoder, it requires the OpenGL context.'''
+        logger.error(f'Recording stops: {reason}')
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.stats = dict(frames=self.frame, queued=self.queued, error=reason)
+        self._release()
+
+    def _release(self):
+        # The shared memory first, it is left in /dev/shm if the OpenGL fails
+        self.process = None
+        del self.frames
+        self.shm.close()
+        self.shm.unlink()
+        self.readback.release()
+
+    def capture(self):
+        '''
+        Read the frame being drawn, it is called before the swap.
+        '''
+        if self.process is None or self._exited():
+            return
+        self.readback.read(0, 0, self.width, self.height, tag=self.frame)
+        self.frame += 1
+        self._collect()
+
+    def stop(self, timeout=60, error=None):
+        '''
+        Wait for the encoder and stop recording, it requires the OpenGL context.
+
+        :param error str: the error that stops the recording, like the exception of the render loop,
+                          it is in the stats and the .json of the recording.
+        '''
+        if self.process is None or self._exited():
+            return self.stats
+
+        self.stopping = True
+        try:
+            self._collect(wait=True)
+        except Exception as err:
+            self._abort(f'Can not collect the frames ({err!r})')
+            return self.stats
+        if self.process is None:
+            # The encoder has exited while collecting
+            return self.stats
+        elapsed = time.perf_counter() - self.tic
+        try:
+            if error is not None:
+                logger.error(f'Recording stops: {error}')
+                # The error is one line of the jobs
+                self.process.stdin.write(f'error {" ".join(str(error).split())}\n')
+            self.process.stdin.write('\n')
+            self.process.stdin.flush()
+            res = self.results.get(timeout=timeout)
+        except (OSError, queue.Empty) as err:
+            logger.error(f'The encoder does not stop in time ({err!r})')
+            res = dict(written=0, bytes=0, busy=0)
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait(timeout)
+        self._release()
+
+        busy = res['busy'] or float('nan')
+        self.stats = dict(
+            frames=self.frame,
+            written=res['written'],
+            dropped_readback=self.readback.dropped,
+            dropped_queue=self.dropped,
+            # The frames recorded per second
+            fps=res['written'] / elapsed,
+            mb_per_s=res['bytes'] / 1e6 / elapsed,
+            # The frames the encoder can write per second
+            encoder_fps=res['written'] / busy,
+            encoder_mb_per_s=res['bytes'] / 1e6 / busy,
+        )
+        if error is not None:
+            self.stats['error'] = error
+        return self.stats
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    # The encoder process started by FrameRecorder.start()
+    shm_name, height, width, slots, path, format, fps = sys.argv[1:]
+    encode_frames(shm_name, (int(height), int(width), 4), int(slots),
+                  path, format, int(fps))
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
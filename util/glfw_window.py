@@ -19,8 +19,19 @@ Functions:
 # %% ---- 2025-10-09 ------------------------
 # Requirements and constants
 from .fps_ruler import FPSRuler
+from .frame_profiler import FrameProfiler
+from .vsync_monitor import VsyncMonitor
+from .flip_scheduler import FlipScheduler
+from .marker_patch import MarkerPatch
+from .headless import EGLContext, Framebuffer
+from .frame_recorder import FrameRecorder
+from .frame_pacer import FramePacer
+from .input_queue import InputQueue
+from .shader_manager import shader_manager
+from .event_log import EventLog
 from .text_render import TextRenderer
 from .triangle_render import TriangleRender
+from .instance_render import InstanceRender
 from .color_transfer import ColorTransfer
 from .easy_imports import *
 
@@ -80,17 +91,51 @@ class GLFWWindow(CursorPosition):
     # Options
     is_focused = True
     click_through = False
+    show_profiler = False  # draw the frame profiler overlay
+
+    # Headless mode, see conf/project.yaml
+    headless = bool(CONF.headless.enabled)
+    headless_backend = CONF.headless.backend  # 'egl' or 'glfw'
+    headless_size = (CONF.headless.width, CONF.headless.height)
+    headless_samples = CONF.headless.samples
+    headless_refresh_rate = CONF.headless.refresh_rate
+    max_frames = CONF.headless.max_frames  # stop after the frames, 0 for never
+    egl = None
+    framebuffer = None
 
     # Addons
     text_renderer = TextRenderer()
     triangle_render = TriangleRender()
+    instance_render = InstanceRender()
     fps = FPSRuler()
+    profiler = FrameProfiler(
+        ['main_render', 'render_top_bar', 'flush', 'record', 'swap_buffers', 'poll_events'])
+    vsync = VsyncMonitor()
+    scheduler = FlipScheduler(vsync)
+    marker = MarkerPatch()
+    recorder = FrameRecorder(
+        CONF.recorder.path, CONF.recorder.format, CONF.recorder.ring, CONF.recorder.slots)
+    recorder.enabled = bool(CONF.recorder.enabled)
+    pacer = FramePacer(
+        CONF.pacing.mode, CONF.pacing.target_fps, CONF.pacing.spin)
+    input = InputQueue(CONF.input.capacity)
+    events = EventLog(CONF.event_log.path, CONF.event_log.flush_interval)
+    events.enabled = bool(CONF.event_log.enabled)
 
     def __init__(self):
         super().__init__()
         pass
 
     def cleanup(self):
+        logger.info(f'Pacing: {self.pacer.report()}')
+        logger.info(f'Vsync: {self.vsync.report()}')
+        logger.info(f'Glyph cache: {self.text_renderer.cache_stats()}')
+        logger.info(f'Shaders: {shader_manager.report()}')
+        if self.marker.verify:
+            logger.info(f'Marker: {self.marker.report()}')
+        if self.recorder.stats is not None:
+            logger.info(f'Recorder: {self.recorder.stats}')
+        self.text_renderer.save_glyph_cache()
         logger.info('Cleanup')
 
     def load_font(self, font_path: str, font_size: int = 48):
@@ -122,6 +167,9 @@ class GLFWWindow(CursorPosition):
         return
 
     def init_window(self):
+        if self.headless:
+            return self.init_headless()
+
         if not glfw.init():
             raise RuntimeError('Failed initialize GLFW')
 
@@ -166,10 +214,110 @@ class GLFWWindow(CursorPosition):
         glfw.make_context_current(window)
 
         self.window = window
+        self.init_addons()
+
+        return window
+
+    def init_headless(self):
+        '''
+        Render into the framebuffer object without the visible window.
+
+        The backend is
+        - 'egl': the window of the GLFW null platform, with the surfaceless EGL context,
+                 it works without the display server.
+        - 'glfw': the hidden GLFW window with its own context.
+
+        The window is still the GLFW window, so the callbacks work as usual.
+        '''
+        backend = self.headless_backend
+        if backend == 'egl':
+            glfw.init_hint(glfw.PLATFORM, glfw.PLATFORM_NULL)
+
+        if not glfw.init():
+            raise RuntimeError('Failed initialize GLFW')
+
+        width, height = self.headless_size
+        self.width = width
+        self.height = height
+        self.refresh_rate = self.headless_refresh_rate
+        logger.info(
+            f'Using headless ({backend}): {width} x {height} ({self.refresh_rate} Hz)')
+
+        glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+        if backend == 'egl':
+            glfw.window_hint(glfw.CLIENT_API, glfw.NO_API)
+        else:
+            glfw.window_hint(glfw.CONTEXT_VERSION_MAJOR, 3)
+            glfw.window_hint(glfw.CONTEXT_VERSION_MINOR, 3)
+            glfw.window_hint(glfw.OPENGL_PROFILE, glfw.OPENGL_CORE_PROFILE)
+
+        window = glfw.create_window(
+            width, height, 'OpenGL Wnd.', None, None)
+        if not window:
+            glfw.terminate()
+            raise RuntimeError(f'Can not create window: {glfw.get_error()}')
+
+        if backend == 'egl':
+            self.egl = EGLContext()
+            self.egl.make_current()
+        else:
+            glfw.make_context_current(window)
+
+        self.framebuffer = Framebuffer(width, height, self.headless_samples)
+        self.framebuffer.bind()
+
+        self.window = window
+        self.init_addons()
+
+        # There is no display to flip, the frames are only throttled in the fixed mode
+        self.vsync.enabled = self.pacer.mode == 'fixed'
+
+        return window
+
+    def init_addons(self):
+        '''Initialize the addons, it requires the OpenGL context.'''
         self.text_renderer.init_shader(self.width, self.height)
         self.triangle_render.init_shader(self.width, self.height)
+        self.instance_render.init_shader(self.width, self.height)
+        self.profiler.init_gl()
+        self.marker.init_gl(self.width, self.height)
+
+        # The swap interval of the hidden framebuffer does not matter
+        self.pacer.apply(has_swap_control=self.framebuffer is None)
+        if self.pacer.mode == 'fixed':
+            self.vsync.start(self.pacer.target_fps)
+        else:
+            self.vsync.start(self.refresh_rate)
+        # The frames are not expected to land on the vsync
+        self.vsync.enabled = self.pacer.mode != 'unthrottled'
+        if self.recorder.enabled:
+            self.recorder.start(self.width, self.height, self.refresh_rate)
+        if self.events.enabled:
+            self.events.start()
+            # The timing-critical events of the addons go to the event log
+            self.vsync.events = self.events
+            self.scheduler.events = self.events
+            self.marker.events = self.events
+        # The key events are queued and dispatched after the poll
+        self.input.attach(self.window)
+        self.input.worker.start()
+        return
 
-        return window
+    def read_frame(self):
+        '''
+        Read the frame being drawn, it waits for the GPU.
+
+        :return np.array: the (height, width, 4) uint8 RGBA array, the top row first.
+        '''
+        if self.framebuffer is not None:
+            return self.framebuffer.read()
+
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height,
+                            GL_RGBA, GL_UNSIGNED_BYTE)
+        frame = np.frombuffer(data, dtype=np.uint8).reshape(
+            self.height, self.width, 4)
+        return frame[::-1]
 
     def render_top_bar(self):
         scale = 0.5
@@ -185,49 +333,161 @@ class GLFWWindow(CursorPosition):
             '-',
             f'FPS: {self.fps.get_fps():.2f}'
         ])
-        self.draw_text(text, 1.0, 1.0, scale, TextAnchor.TR, color)
+        _, h, _ = self.draw_text(text, 1.0, 1.0, scale, TextAnchor.TR, color)
+
+        if self.show_profiler:
+            self.render_profiler(1.0 - 2.0 * h / self.height, scale)
         return
 
-    def render_loop(self, main_render: callable):
+    def render_profiler(self, y, scale=0.5):
+        '''
+        Draw the frame profiler overlay below the top bar.
+
+        :param y: (-1, 1) position of the first line.
+        '''
+        color = (1.0, 1.0, 0.0, 1.0)
+        for stage, e in self.profiler.summary(60).items():
+            text = ' | '.join([
+                stage,
+                f'CPU: {e["cpu_mean_ms"]:.2f} ({e["cpu_max_ms"]:.2f}) ms',
+                f'GPU: {e["gpu_mean_ms"]:.2f} ({e["gpu_max_ms"]:.2f}) ms',
+            ])
+            _, h, _ = self.draw_text(text, 1.0, y, scale, TextAnchor.TR, color)
+            y -= 2.0 * h / self.height * 1.5
+        return
+
+    def render_loop(self, main_render: callable, on_frame: callable = None):
+        '''
+        :param main_render: draw the frame.
+        :param on_frame: on_frame(frame) is called with the frame array of read_frame() before the swap.
+        '''
         window = self.window
 
         # Bind focus callback
         # glfw.make_context_current(window)
-        glfw.set_window_focus_callback(window, self.on_focus_change)
-        self.update_window_attributes()
+        if not self.headless:
+            glfw.set_window_focus_callback(window, self.on_focus_change)
+            self.update_window_attributes()
 
         # 设置混合模式以实现透明度
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
-        # Main rendering loop
-        while not glfw.window_should_close(window):
-            # 设置透明背景
-            glClearColor(0.0, 0.0, 0.0, 0.0)
-            glClear(GL_COLOR_BUFFER_BIT)
-
-            # Run the main_render() for custom rendering.
-            main_render()
-
-            # Draw the top bar.
-            self.render_top_bar()
+        profiler = self.profiler
 
-            # Just draw the buffer.
-            glfw.swap_buffers(window)
-            try:
+        # Main rendering loop
+        # The threads are stopped and the logs are written in the finally, even if a frame raises
+        error = None
+        try:
+            while not glfw.window_should_close(window):
+                profiler.begin_frame()
+
+                # 设置透明背景
+                glClearColor(0.0, 0.0, 0.0, 0.0)
+                glClear(GL_COLOR_BUFFER_BIT)
+
+                # Run the main_render() for custom rendering.
+                profiler.begin('main_render')
+                main_render()
+                profiler.end('main_render')
+
+                # Draw the top bar.
+                profiler.begin('render_top_bar')
+                self.render_top_bar()
+                profiler.end('render_top_bar')
+
+                # Draw the batched triangles, rectangles and text.
+                # The marker patch is the last, it is on the top.
+                profiler.begin('flush')
+                self.flush()
+                self.marker.render()
+                profiler.end('flush')
+
+                if on_frame is not None:
+                    on_frame(self.read_frame())
+
+                # Record the frame being displayed.
+                profiler.begin('record')
+                if self.recorder.enabled:
+                    if self.framebuffer is not None:
+                        self.framebuffer.bind_read()
+                    self.recorder.capture()
+                    if self.framebuffer is not None:
+                        self.framebuffer.bind()
+                profiler.end('record')
+
+                # Just draw the buffer.
+                profiler.begin('swap_buffers')
+                self.pacer.wait()
+                if self.framebuffer is None:
+                    glfw.swap_buffers(window)
+                t_ns = time.perf_counter_ns()
+                self.vsync.update(t_ns)
+                # Send the triggers of the frame right after it is swapped
+                self.scheduler.on_swap(t_ns)
+                self.marker.on_swap(t_ns)
+                profiler.end('swap_buffers')
+
+                profiler.begin('poll_events')
                 glfw.poll_events()
+                # The handlers of the key events run here, the slow jobs are deferred to the worker
+                self.input.dispatch()
+                profiler.end('poll_events')
                 self.fps.update()
-            except Exception as err:
-                logger.exception(err)
-                raise err
-
-        glfw.terminate()
+                self.pacer.update()
+
+                profiler.end_frame()
+
+                if self.max_frames and profiler.frame + 1 >= self.max_frames:
+                    glfw.set_window_should_close(window, True)
+        except Exception as err:
+            error = err
+            logger.exception(err)
+            raise err
+        finally:
+            # Finish the deferred jobs, e.g. writing the logs
+            self.input.worker.stop()
+            if self.input.overflow or self.input.worker.dropped:
+                logger.warning(
+                    f'Input: {self.input.overflow} events and {self.input.worker.dropped} jobs are dropped')
+            try:
+                # The marker logs the cross-check of the triggers into the events
+                self.marker.release()
+            finally:
+                self.events.stop()
+            profiler.release()
+            # The recording is closed with the error, so its tail is written and the shared memory is released
+            self.recorder.stop(error=None if error is None else repr(error))
+            if self.framebuffer is not None:
+                self.framebuffer.release()
+                self.framebuffer = None
+            if self.egl is not None:
+                self.egl.release()
+                self.egl = None
+            glfw.terminate()
         logger.info('Rendering stops')
         return
 
+    def flush(self):
+        '''
+        Draw the primitives batched in the current frame.
+        It is called at the end of every frame in the render_loop().
+
+        The batches are drawn after the main_render(), in the order of
+        the triangles, the instances and the texts,
+        so they are on top of the OpenGL draw calls made in the main_render().
+        Call it in the main_render() to draw the batches under the draw calls after it.
+        '''
+        self.triangle_render.flush()
+        self.instance_render.flush()
+        self.text_renderer.flush()
+        return
+
     def draw_triangle(self, x1, y1, x2, y2, x3, y3, color=(1, 1, 1, 1), nPos=(0, 0, 1, 0, 0, 1)):
         '''
         Draw a triangle by normalized device coordinates.
+        The triangle is batched and drawn in the flush() at the end of the frame,
+        see flush() for the layering.
 
         :param x1, y1, x2, y2, x3, y3: (-1, 1) position.
         :param color: RGBA color or supports ColorTransfer.
@@ -241,7 +501,7 @@ class GLFWWindow(CursorPosition):
         x3 = int((x3+1) * 0.5 * self.width)
         y3 = int((y3+1) * 0.5 * self.height)
 
-        self.triangle_render.render_triangle(
+        self.triangle_render.append_triangle(
             x1, y1, x2, y2, x3, y3, color, nPos)
 
         return
@@ -259,6 +519,51 @@ class GLFWWindow(CursorPosition):
                            h, color, (1, 0, 0, 1, 1, 1))
         return
 
+    def _one_color(self, colors):
+        '''
+        The one color for all the shapes supports ColorTransfer, the (n, 4) colors are kept.
+        '''
+        if np.ndim(colors) > 1:
+            return colors
+        # ColorTransfer takes the tuple, not the list or the array
+        if isinstance(colors, (list, np.ndarray)):
+            colors = tuple(colors)
+        return ColorTransfer(colors).rgba
+
+    def draw_triangles(self, vertices, colors=(1, 1, 1, 1), version=None):
+        '''
+        Draw the triangles by normalized device coordinates, like draw_triangle().
+        They are drawn by one instanced draw call in the flush() at the end of the frame,
+        and the arrays of the same version as the last frame are not uploaded again.
+
+        The version is the only thing compared, the arrays changed in place with the same version
+        are NOT uploaded, and the old triangles are drawn.
+
+        :param vertices np.ndarray: (n, 6) or (n, 3, 2) array of (x1, y1, x2, y2, x3, y3), (-1, 1) position.
+        :param colors np.ndarray: (n, 4) RGBA colors, or one color for all the triangles, it supports ColorTransfer.
+        :param version: change it when the arrays are changed, None uploads them in every frame.
+        '''
+        self.instance_render.append_triangles(
+            vertices, self._one_color(colors), version)
+        return
+
+    def draw_rects(self, xywh, colors=(1, 1, 1, 1), version=None):
+        '''
+        Draw the rectangles by normalized device coordinates, like draw_rect().
+        They are drawn by one instanced draw call in the flush() at the end of the frame,
+        and the arrays of the same version as the last frame are not uploaded again.
+
+        The version is the only thing compared, the arrays changed in place with the same version
+        are NOT uploaded, and the old rectangles are drawn.
+
+        :param xywh np.ndarray: (n, 4) array of the SW corner and the size (x, y, w, h).
+        :param colors np.ndarray: (n, 4) RGBA colors, or one color for all the rectangles, it supports ColorTransfer.
+        :param version: change it when the arrays are changed, None uploads them in every frame.
+        '''
+        self.instance_render.append_rects(
+            xywh, self._one_color(colors), version)
+        return
+
     def draw_text(self, text, x, y, scale, anchor: TextAnchor = TextAnchor.BL, color=(1.0, 1.0, 1.0, 1.0)):
         '''
         The text is actually drawn by pixel units.
@@ -272,7 +577,8 @@ class GLFWWindow(CursorPosition):
         y = int((y+1) * 0.5 * self.height)
         # x = int(x * self.width)
         # y = int(y * self.height)
-        w, h, h2 = self.text_renderer.bounding_box(text, scale)
+        layout = self.text_renderer.layout(text, scale)
+        w, h, h2 = layout['bbox']
 
         if anchor == TextAnchor.BL:
             pass
@@ -297,7 +603,7 @@ class GLFWWindow(CursorPosition):
             y -= h // 2
             x -= w
 
-        self.text_renderer.render_text(text, x, y, scale, color)
+        self.text_renderer.render_layout(layout, x, y, color)
         return w, h, h2
 
 # %% ---- 2025-10-09 ------------------------
@@ -0,0 +1,280 @@
+"""
+File: glyph_atlas.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Glyph texture atlas.
+    The glyphs are packed into a few large textures with the shelf packer,
+    so the text is drawn with a single texture bind.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+from OpenGL.GL import *
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class ShelfPacker:
+    '''
+    Pack rectangles into shelves.
+
+    The shelf is a horizontal strip, its height is the height of the first rectangle in it.
+    The rectangle goes to the first shelf which fits it,
+    or a new shelf is opened below the last one.
+    The shelf is reused when every rectangle in it is freed.
+    '''
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.reset()
+
+    def reset(self):
+        # Every shelf is [y, height, x_cursor, live_rectangles]
+        self.shelves = []
+        self.bottom = 0
+
+    def pack(self, w, h):
+        '''
+        Find a place for the (w, h) rectangle.
+
+        :return (x, y, shelf_index): the top-left corner and the shelf, or None if it does not fit.
+        '''
+        fallback = None
+        for i, shelf in enumerate(self.shelves):
+            y, height, x, _ = shelf
+            if h > height or x + w > self.width:
+                continue
+            # Do not waste a tall shelf on a short rectangle
+            if h >= height * 0.7:
+                return self._put(i, w)
+            if fallback is None:
+                fallback = i
+
+        if self.bottom + h <= self.height and w <= self.width:
+            self.shelves.append([self.bottom, h, 0, 0])
+            self.bottom += h
+            return self._put(len(self.shelves) - 1, w)
+
+        if fallback is not None:
+            return self._put(fallback, w)
+
+        return None
+
+    def _put(self, shelf_index, w):
+        shelf = self.shelves[shelf_index]
+        y, _, x, _ = shelf
+        shelf[2] += w
+        shelf[3] += 1
+        return x, y, shelf_index
+
+    def free(self, shelf_index):
+        '''
+        Free a rectangle in the shelf.
+        The empty shelf is reused from its beginning, and the empty shelves at the bottom are dropped.
+        '''
+        shelf = self.shelves[shelf_index]
+        shelf[3] -= 1
+        if shelf[3] > 0:
+            return
+
+        shelf[2] = 0
+        while self.shelves and self.shelves[-1][3] == 0:
+            self.bottom -= self.shelves.pop()[1]
+
+
+class AtlasPage:
+    def __init__(self, size, generation):
+        self.size = size
+        self.packer = ShelfPacker(size, size)
+        # When the page is used the latest
+        self.last_used = 0
+        # How many glyphs are in the page
+        self.live = 0
+        # It changes when the page is reset or recreated, so the stale regions are not freed
+        self.generation = generation
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_R8, size, size, 0,
+                     GL_RED, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    @property
+    def nbytes(self):
+        return self.size * self.size
+
+    def reset(self, generation):
+        self.packer.reset()
+        self.live = 0
+        self.generation = generation
+
+    def release(self):
+        glDeleteTextures(1, [self.texture])
+        self.texture = None
+
+
+class GlyphAtlas:
+    '''
+    The atlas of several pages.
+
+    The glyph region is given back by free(), and the empty page is deleted from the GPU.
+    When every page is full, the least recently used page is evicted,
+    the on_evict(page_index) callback is called before the page is reused.
+    '''
+
+    def __init__(self, page_size=1024, max_pages=4, padding=1, on_evict=None):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.padding = padding
+        self.on_evict = on_evict
+        # The released page leaves None in its slot, so the page index is stable
+        self.pages = []
+        self.tick = 0
+        self.generation = 0
+
+    @property
+    def nbytes(self):
+        '''The GPU memory of the pages.'''
+        return sum(page.nbytes for page in self.pages if page is not None)
+
+    def _next_generation(self):
+        self.generation += 1
+        return self.generation
+
+    def touch(self, page_index):
+        '''Mark the page as recently used.'''
+        self.tick += 1
+        self.pages[page_index].last_used = self.tick
+
+    def padded_size(self, w, h):
+        '''The size the (w, h) glyph takes in the atlas.'''
+        return w + 2 * self.padding, h + 2 * self.padding
+
+    def add(self, data, w, h):
+        '''
+        Add the glyph bitmap into the atlas.
+
+        :param data: the (h, w) ubyte bitmap.
+        :param w, h: the size of the bitmap.
+
+        :return page_index int: which page the glyph is in.
+        :return uv tuple: the (u0, v0, u1, v1) rectangle of the glyph.
+        :return region tuple: the handle to free the glyph.
+        '''
+        p = self.padding
+        pw, ph = self.padded_size(w, h)
+
+        if pw > self.page_size or ph > self.page_size:
+            raise ValueError(
+                f'Glyph ({w} x {h}) is larger than the atlas page ({self.page_size})')
+
+        page_index, (x, y, shelf_index) = self._allocate(pw, ph)
+        page = self.pages[page_index]
+        page.live += 1
+
+        # Upload the glyph with zero borders,
+        # so the linear filter never reads the neighbors.
+        block = np.zeros((ph, pw), dtype=np.ubyte)
+        block[p:p+h, p:p+w] = np.asarray(data, dtype=np.ubyte).reshape(h, w)
+
+        glBindTexture(GL_TEXTURE_2D, page.texture)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexSubImage2D(GL_TEXTURE_2D, 0, x, y, pw, ph,
+                        GL_RED, GL_UNSIGNED_BYTE, block)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        self.touch(page_index)
+
+        s = self.page_size
+        x, y = x + p, y + p
+        uv = (x / s, y / s, (x + w) / s, (y + h) / s)
+        region = (page_index, page.generation, shelf_index)
+        return page_index, uv, region
+
+    def free(self, region):
+        '''
+        Free the region of the glyph.
+        The page is deleted from the GPU when it is empty.
+        '''
+        page_index, generation, shelf_index = region
+        page = self.pages[page_index]
+        if page is None or page.generation != generation:
+            return
+
+        page.packer.free(shelf_index)
+        page.live -= 1
+        if page.live == 0:
+            page.release()
+            self.pages[page_index] = None
+
+    def _allocate(self, w, h):
+        for i, page in enumerate(self.pages):
+            if page is None:
+                continue
+            xyi = page.packer.pack(w, h)
+            if xyi is not None:
+                return i, xyi
+
+        # Open a new page
+        if None in self.pages:
+            i = self.pages.index(None)
+            self.pages[i] = AtlasPage(self.page_size, self._next_generation())
+            return i, self.pages[i].packer.pack(w, h)
+
+        if len(self.pages) < self.max_pages:
+            self.pages.append(AtlasPage(
+                self.page_size, self._next_generation()))
+            i = len(self.pages) - 1
+            return i, self.pages[i].packer.pack(w, h)
+
+        # Evict the least recently used page
+        i = min(range(len(self.pages)), key=lambda i: self.pages[i].last_used)
+        logger.debug(f'Evict atlas page: {i}')
+        if self.on_evict is not None:
+            self.on_evict(i)
+        if self.pages[i] is None:
+            # The callback may free every glyph in the page
+            self.pages[i] = AtlasPage(self.page_size, self._next_generation())
+        else:
+            self.pages[i].reset(self._next_generation())
+        return i, self.pages[i].packer.pack(w, h)
+
+    def texture(self, page_index):
+        return self.pages[page_index].texture
+
+    def release(self):
+        for page in self.pages:
+            if page is not None:
+                page.release()
+        self.pages = []
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,238 @@
+"""
+File: glyph_disk_cache.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Persistent on-disk glyph cache.
+    The rasterized glyph bitmaps and metrics are stored in memory-mappable files,
+    so the warm start skips FreeType.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import os
+import json
+import hashlib
+
+# The metrics of every glyph, the bitmap is at [offset, offset + width * rows) in the .bin file
+INDEX_DTYPE = np.dtype([
+    ('codepoint', '<u4'),
+    ('offset', '<u8'),
+    ('width', '<u2'),
+    ('rows', '<u2'),
+    ('left', '<i2'),
+    ('top', '<i2'),
+    ('advance', '<i2'),
+])
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def file_hash(path, chunk_size=1 << 20):
+    '''The sha1 hash of the file.'''
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+class GlyphDiskCache:
+    '''
+    The glyph cache on the disk.
+
+    The cache of the (fonts, size) is in two files:
+    - <key>.idx.npy: the metrics of the glyphs, see INDEX_DTYPE.
+    - <key>.bin: the ubyte bitmaps of the glyphs, one after another.
+
+    The new glyphs are kept in the memory, and they are written by save().
+
+    The key is the sha1 of the font files,
+    it is remembered in fonts.json by the (path, size, mtime) of the files,
+    so the fonts are hashed again only when they are changed.
+    '''
+
+    def __init__(self, cache_dir='cache/glyph'):
+        '''
+        :param cache_dir str: the folder of the cache, the relative path is in the package root.
+        '''
+        self.cache_dir = ROOT.joinpath(cache_dir)
+        self.key = None
+        self.index = np.zeros(0, dtype=INDEX_DTYPE)
+        self.bitmaps = np.zeros(0, dtype=np.ubyte)
+        self.lookup = {}
+        self.new_glyphs = {}
+
+    def open(self, font_paths, size):
+        '''
+        Open and preload the cache of the fonts in the size.
+
+        :param font_paths list: the font files, the fallback fonts are also in the key.
+        :param size int: the font size.
+        '''
+        if self.new_glyphs:
+            self.save()
+
+        hashes = self._font_hashes(font_paths)
+        self.key = hashlib.sha1(
+            '|'.join(hashes).encode()).hexdigest()[:16] + f'-{size}'
+        self._load()
+        logger.info(
+            f'Using glyph disk cache: {self.index_path} ({len(self.index)} glyphs)')
+
+    def _font_hashes(self, font_paths):
+        '''
+        The sha1 hashes of the existing font files.
+        The font is hashed only when its (path, size, mtime) is not in the fonts.json.
+        '''
+        stamps_path = self.cache_dir.joinpath('fonts.json')
+        try:
+            stamps = json.loads(stamps_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            stamps = {}
+
+        hashes = []
+        changed = False
+        for path in font_paths:
+            path = Path(path).resolve()
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            stamp = [stat.st_size, stat.st_mtime_ns]
+            known = stamps.get(str(path))
+            if known is None or known['stamp'] != stamp:
+                known = dict(stamp=stamp, sha1=file_hash(path))
+                stamps[str(path)] = known
+                changed = True
+            hashes.append(known['sha1'])
+
+        if changed:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = stamps_path.with_suffix('.tmp')
+                tmp.write_text(json.dumps(stamps, indent=2), encoding='utf-8')
+                os.replace(tmp, stamps_path)
+            except OSError as err:
+                logger.warning(f'Can not save the font hashes: {err}')
+
+        return hashes
+
+    @property
+    def index_path(self):
+        return self.cache_dir.joinpath(f'{self.key}.idx.npy')
+
+    @property
+    def bitmap_path(self):
+        return self.cache_dir.joinpath(f'{self.key}.bin')
+
+    def _load(self):
+        self.index = np.zeros(0, dtype=INDEX_DTYPE)
+        self.bitmaps = np.zeros(0, dtype=np.ubyte)
+        self.new_glyphs = {}
+
+        try:
+            if self.index_path.is_file():
+                self.index = np.load(self.index_path, mmap_mode='r')
+            if self.bitmap_path.is_file() and self.bitmap_path.stat().st_size > 0:
+                self.bitmaps = np.memmap(
+                    self.bitmap_path, dtype=np.ubyte, mode='r')
+        except Exception as err:
+            logger.warning(f'Can not load glyph disk cache: {err}')
+            self.index = np.zeros(0, dtype=INDEX_DTYPE)
+            self.bitmaps = np.zeros(0, dtype=np.ubyte)
+
+        self.lookup = dict(
+            zip(self.index['codepoint'].tolist(), range(len(self.index))))
+
+    def get(self, char):
+        '''
+        Get the glyph of the char.
+
+        :return tuple: (data, width, rows, left, top, advance), or None if it is not cached.
+        '''
+        codepoint = ord(char)
+
+        if codepoint in self.new_glyphs:
+            return self.new_glyphs[codepoint]
+
+        i = self.lookup.get(codepoint)
+        if i is None:
+            return None
+
+        e = self.index[i]
+        offset = int(e['offset'])
+        width, rows = int(e['width']), int(e['rows'])
+        data = self.bitmaps[offset:offset + width * rows]
+        return data, width, rows, int(e['left']), int(e['top']), int(e['advance'])
+
+    def put(self, char, data, width, rows, left, top, advance):
+        '''Add the glyph, it is written to the disk by save().'''
+        data = np.asarray(data, dtype=np.ubyte).reshape(-1)[:width * rows]
+        self.new_glyphs[ord(char)] = (
+            data.copy(), width, rows, left, top, advance)
+
+    def save(self):
+        '''Write the cache with the new glyphs to the disk.'''
+        if not self.new_glyphs or self.key is None:
+            return
+
+        new = sorted(self.new_glyphs.items())
+        index = np.zeros(len(new), dtype=INDEX_DTYPE)
+        offset = len(self.bitmaps)
+        for i, (codepoint, (data, width, rows, left, top, advance)) in enumerate(new):
+            index[i] = (codepoint, offset, width, rows, left, top, advance)
+            offset += len(data)
+
+        index = np.concatenate([np.asarray(self.index), index])
+        bitmaps = np.concatenate(
+            [np.asarray(self.bitmaps)] + [e[1][0] for e in new])
+
+        # Write into the temporary files and replace, so the broken cache is never left
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index_tmp = self.index_path.with_suffix('.tmp.npy')
+        bitmap_tmp = self.bitmap_path.with_suffix('.tmp')
+        np.save(index_tmp, index)
+        bitmaps.tofile(bitmap_tmp)
+
+        # Release the memory maps before the files are replaced
+        self.index = np.zeros(0, dtype=INDEX_DTYPE)
+        self.bitmaps = np.zeros(0, dtype=np.ubyte)
+        os.replace(bitmap_tmp, self.bitmap_path)
+        os.replace(index_tmp, self.index_path)
+
+        logger.info(
+            f'Saved glyph disk cache: {self.index_path} ({len(new)} new, {len(index)} glyphs)')
+        self._load()
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    # Pre-warm the cache for the chars used by the scripts
+    import string
+    from .text_render import TextRenderer
+
+    tr = TextRenderer()
+    tr.load_font('resource/font/MSYH.TTC')
+    tr.prewarm(string.printable + '窗口获得焦点失去')
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
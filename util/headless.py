@@ -0,0 +1,197 @@
+"""
+File: headless.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Headless rendering.
+    The surfaceless EGL context works without the display server,
+    and the frames are rendered into the framebuffer object.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import ctypes
+import OpenGL.platform
+from OpenGL.GL import *
+
+# EGL constants
+EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+EGL_OPENGL_API = 0x30A2
+EGL_CONTEXT_MAJOR_VERSION = 0x3098
+EGL_CONTEXT_MINOR_VERSION = 0x30FB
+EGL_CONTEXT_OPENGL_PROFILE_MASK = 0x30FD
+EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT = 0x0001
+EGL_NONE = 0x3038
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class EGLContext:
+    '''
+    The surfaceless EGL context of OpenGL 3.3 core profile.
+
+    The libEGL is called by ctypes,
+    since the EGL binding of PyOpenGL only works with PYOPENGL_PLATFORM=egl,
+    which must be set before OpenGL is imported anywhere.
+    The GL calls are dispatched to the current context by libglvnd.
+    '''
+
+    def __init__(self, major=3, minor=3):
+        egl = ctypes.CDLL('libEGL.so.1')
+        egl.eglGetProcAddress.restype = ctypes.c_void_p
+        egl.eglGetProcAddress.argtypes = [ctypes.c_char_p]
+        egl.eglInitialize.argtypes = [ctypes.c_void_p] * 3
+        egl.eglCreateContext.restype = ctypes.c_void_p
+        egl.eglCreateContext.argtypes = [ctypes.c_void_p] * 4
+        egl.eglMakeCurrent.argtypes = [ctypes.c_void_p] * 4
+        egl.eglDestroyContext.argtypes = [ctypes.c_void_p] * 2
+        egl.eglTerminate.argtypes = [ctypes.c_void_p]
+        egl.eglGetCurrentContext.restype = ctypes.c_void_p
+        self.egl = egl
+
+        get_platform_display = ctypes.CFUNCTYPE(
+            ctypes.c_void_p, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p)(
+            egl.eglGetProcAddress(b'eglGetPlatformDisplayEXT'))
+
+        self.display = get_platform_display(
+            EGL_PLATFORM_SURFACELESS_MESA, None, None)
+        if not self.display or not egl.eglInitialize(self.display, None, None):
+            raise RuntimeError(
+                f'Can not initialize the EGL display: {hex(egl.eglGetError())}')
+
+        egl.eglBindAPI(EGL_OPENGL_API)
+        attrs = (ctypes.c_int * 7)(
+            EGL_CONTEXT_MAJOR_VERSION, major,
+            EGL_CONTEXT_MINOR_VERSION, minor,
+            EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            EGL_NONE)
+        # EGL_KHR_no_config_context and EGL_KHR_surfaceless_context
+        self.context = egl.eglCreateContext(self.display, None, None, attrs)
+        if not self.context:
+            raise RuntimeError(
+                f'Can not create the EGL context: {hex(egl.eglGetError())}')
+
+    def make_current(self):
+        if not self.egl.eglMakeCurrent(self.display, None, None, self.context):
+            raise RuntimeError(
+                f'Can not make the EGL context current: {hex(self.egl.eglGetError())}')
+
+        # PyOpenGL keeps the per-context data (like the vertex attrib pointers)
+        # by the current context of its platform, and it checks the extensions only with the valid context,
+        # let it see the EGL context.
+        if OpenGL.platform.GetCurrentContext() != self.context:
+            for name in ['GetCurrentContext', 'CurrentContextIsValid']:
+                setattr(OpenGL.platform.PLATFORM, name,
+                        self.egl.eglGetCurrentContext)
+                setattr(OpenGL.platform, name, self.egl.eglGetCurrentContext)
+
+    def release(self):
+        self.egl.eglMakeCurrent(self.display, None, None, None)
+        self.egl.eglDestroyContext(self.display, self.context)
+        self.egl.eglTerminate(self.display)
+
+
+class Framebuffer:
+    '''
+    The framebuffer object with the RGBA8 color buffer.
+    With samples > 0, it is multisampled and resolved before it is read.
+    '''
+
+    def __init__(self, width, height, samples=0):
+        self.width = width
+        self.height = height
+        self.samples = samples
+
+        self.fbo, self.color = self._create(samples)
+        self.resolve = None
+        if samples > 0:
+            self.resolve = self._create(0)
+
+    def _create(self, samples):
+        fbo = glGenFramebuffers(1)
+        color = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, color)
+        if samples > 0:
+            glRenderbufferStorageMultisample(
+                GL_RENDERBUFFER, samples, GL_RGBA8, self.width, self.height)
+        else:
+            glRenderbufferStorage(
+                GL_RENDERBUFFER, GL_RGBA8, self.width, self.height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        glFramebufferRenderbuffer(
+            GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, color)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f'Framebuffer is not complete: {hex(status)}')
+        return fbo, color
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def bind_read(self):
+        '''
+        Bind the framebuffer to read the pixels, the multisampled one is resolved first.
+        '''
+        if self.resolve is None:
+            glBindFramebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+            return
+
+        fbo, _ = self.resolve
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, fbo)
+        glBlitFramebuffer(0, 0, self.width, self.height,
+                          0, 0, self.width, self.height,
+                          GL_COLOR_BUFFER_BIT, GL_NEAREST)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.fbo)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, fbo)
+
+    def read(self):
+        '''
+        Read the frame, it waits for the GPU.
+
+        :return np.array: the (height, width, 4) uint8 RGBA array, the top row first.
+        '''
+        self.bind_read()
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height,
+                            GL_RGBA, GL_UNSIGNED_BYTE)
+        glBindFramebuffer(GL_READ_FRAMEBUFFER, self.fbo)
+        frame = np.frombuffer(data, dtype=np.uint8).reshape(
+            self.height, self.width, 4)
+        return frame[::-1]
+
+    def release(self):
+        for fbo, color in [(self.fbo, self.color), self.resolve or (None, None)]:
+            if fbo is None:
+                continue
+            glDeleteFramebuffers(1, [fbo])
+            glDeleteRenderbuffers(1, [color])
+        self.resolve = None
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
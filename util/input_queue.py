@@ -0,0 +1,209 @@
+"""
+File: input_queue.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Input subsystem.
+    The key events are timestamped in the callback and queued,
+    the handlers apply the cheap state changes on the render thread,
+    and the slow jobs (file I/O, logging) are deferred to the worker thread.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import glfw
+import queue
+import threading
+
+KEY_EVENT_DTYPE = np.dtype([
+    ('timer', np.uint64),  # glfw.get_timer_value()
+    ('t_ns', np.int64),  # time.perf_counter_ns()
+    ('key', np.int32),
+    ('scancode', np.int32),
+    ('action', np.int32),
+    ('mods', np.int32),
+])
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class KeyEvent:
+    '''The key event, the fields are the same as the GLFW key callback.'''
+    __slots__ = ('window', 'timer', 't_ns', 'key',
+                 'scancode', 'action', 'mods', 'seconds')
+
+    def __init__(self, window, record, frequency):
+        self.window = window
+        self.timer = int(record['timer'])
+        self.t_ns = int(record['t_ns'])
+        self.key = int(record['key'])
+        self.scancode = int(record['scancode'])
+        self.action = int(record['action'])
+        self.mods = int(record['mods'])
+        # The glfw time of the event
+        self.seconds = self.timer / frequency
+
+    def __repr__(self):
+        return f'<KeyEvent key={self.key} action={self.action} mods={self.mods} t={self.seconds:.6f}>'
+
+
+class InputWorker:
+    '''
+    Run the slow jobs on the worker thread.
+    The callback of the job runs on the render thread, see run_callbacks().
+    '''
+
+    def __init__(self, max_queue=1024):
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.done = queue.Queue()
+        self.thread = None
+        self.dropped = 0
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def defer(self, fn, *args, callback=None):
+        '''
+        Run fn(*args) on the worker thread.
+
+        :param callback: callback(result) runs on the render thread after the job is done.
+        '''
+        try:
+            self.jobs.put_nowait((fn, args, callback))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            fn, args, callback = job
+            try:
+                res = fn(*args)
+            except Exception as err:
+                logger.exception(err)
+                continue
+            if callback is not None:
+                self.done.put((callback, res))
+
+    def run_callbacks(self):
+        '''Run the callbacks of the finished jobs, it is called on the render thread.'''
+        while True:
+            try:
+                callback, res = self.done.get_nowait()
+            except queue.Empty:
+                break
+            callback(res)
+
+    def stop(self, timeout=5.0):
+        '''Finish the deferred jobs and stop the worker.'''
+        if self.thread is None:
+            return
+        self.jobs.put(None)
+        self.thread.join(timeout)
+        self.thread = None
+
+
+class InputQueue:
+    '''
+    The key events in the preallocated ring buffer.
+
+    The GLFW callback only records the event with its timestamps,
+    the events are dispatched to the handlers after glfw.poll_events() in the render loop.
+    When the ring buffer is full, the new events are dropped and counted.
+
+    Usage::
+
+        wnd.input.attach(wnd.window)
+        wnd.input.add_handler(handle_key)
+
+        def handle_key(event):
+            # The cheap state changes
+            opt.blink_toggle = True
+            # The slow jobs, the result is used by the callback on the render thread
+            wnd.input.defer(design.parse_conf, callback=start_session)
+    '''
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.events = np.zeros(capacity, dtype=KEY_EVENT_DTYPE)
+        # The events written and read
+        self.head = 0
+        self.tail = 0
+        self.overflow = 0
+
+        self.window = None
+        self.frequency = 1
+        self.handlers = []
+        self.worker = InputWorker()
+
+    def attach(self, window):
+        '''Replace the key callback of the window.'''
+        self.window = window
+        self.frequency = glfw.get_timer_frequency()
+        glfw.set_key_callback(window, self.on_key)
+
+    def add_handler(self, handler):
+        '''
+        :param handler: handler(event) of the KeyEvent, it runs on the render thread.
+        '''
+        self.handlers.append(handler)
+
+    def defer(self, fn, *args, callback=None):
+        '''Run the slow job on the worker, see InputWorker.defer().'''
+        self.worker.defer(fn, *args, callback=callback)
+
+    def on_key(self, window, key, scancode, action, mods):
+        timer = glfw.get_timer_value()
+        t_ns = time.perf_counter_ns()
+        if self.head - self.tail >= self.capacity:
+            self.overflow += 1
+            return
+        self.events[self.head % self.capacity] = (
+            timer, t_ns, key, scancode, action, mods)
+        self.head += 1
+
+    def dispatch(self):
+        '''
+        Dispatch the queued events to the handlers, and run the callbacks of the finished jobs.
+        It is called on the render thread after glfw.poll_events().
+        '''
+        while self.tail < self.head:
+            event = KeyEvent(
+                self.window, self.events[self.tail % self.capacity], self.frequency)
+            self.tail += 1
+            for handler in self.handlers:
+                try:
+                    handler(event)
+                except Exception as err:
+                    logger.exception(err)
+
+        self.worker.run_callbacks()
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,272 @@
+"""
+File: instance_render.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Render the rectangles and the triangles from the NumPy arrays by instancing.
+    Every primitive is an instance of (the position, the color),
+    the instances are uploaded once and drawn by glDrawArraysInstanced.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+from OpenGL.GL import *
+
+from .shader_library import shader_library
+
+# The vertex shaders of the instances, with the fragment shader of the triangle render
+RECT_SHADER = 'triangle/instanced_rect.vert'
+TRIANGLE_SHADER = 'triangle/instanced_triangle.vert'
+FRAGMENT_SHADER = 'triangle/projection.frag'
+
+# The attributes of every rectangle, (x, y, w, h), (r, g, b, a)
+RECT_ATTRIBUTES = [4, 4]
+
+# The attributes of every triangle, (x1, y1), (x2, y2), (x3, y3), (r, g, b, a)
+TRIANGLE_ATTRIBUTES = [2, 2, 2, 4]
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class InstanceBuffer:
+    '''
+    The instance buffer of a draw call.
+
+    The version of the last upload is kept,
+    the instances are converted and uploaded again only when the version is changed.
+    '''
+
+    def __init__(self, sizes, capacity=1024):
+        '''
+        :param sizes list: the floats of the attributes, like [4, 4] for (rect, color).
+        '''
+        self.sizes = sizes
+        self.floats = sum(sizes)
+        self.staging = np.zeros((capacity, self.floats), dtype=np.float32)
+        # The version and the number of the uploaded instances, None for the unknown
+        self.version = None
+        self.n = 0
+        self.gpu_capacity = 0
+
+        self.vao = glGenVertexArrays(1)
+        self.vbo = glGenBuffers(1)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        stride = self.floats * sizeof(GLfloat)
+        offset = 0
+        for location, size in enumerate(sizes):
+            glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE,
+                                  stride, ctypes.c_void_p(offset * sizeof(GLfloat)))
+            glEnableVertexAttribArray(location)
+            # The attribute advances once per instance
+            glVertexAttribDivisor(location, 1)
+            offset += size
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindVertexArray(0)
+
+    def changed(self, n, version):
+        '''
+        Whether the n instances of the version are not uploaded.
+        The instances without the version are always changed.
+        '''
+        return version is None or version != self.version or n != self.n
+
+    def block(self, n):
+        '''The staging block of n instances, it grows the staging array if required.'''
+        capacity = len(self.staging)
+        if n > capacity:
+            while capacity < n:
+                capacity *= 2
+            self.staging = np.zeros((capacity, self.floats), dtype=np.float32)
+        return self.staging[:n]
+
+    def upload(self, n, version=None):
+        '''
+        Upload the n instances in the staging array.
+
+        :param version: the version of the instances, see changed().
+        '''
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        # Grow the GPU buffer if it is not large enough
+        if n > self.gpu_capacity:
+            self.gpu_capacity = len(self.staging)
+            glBufferData(GL_ARRAY_BUFFER, self.staging.nbytes,
+                         None, GL_DYNAMIC_DRAW)
+        glBufferSubData(GL_ARRAY_BUFFER, 0,
+                        self.staging[:n].nbytes, self.staging[:n])
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.version = version
+        self.n = n
+
+    def release(self):
+        glDeleteBuffers(1, [self.vbo])
+        glDeleteVertexArrays(1, [self.vao])
+
+
+class InstanceRender:
+    '''
+    Instanced rectangle and triangle renderer.
+
+    The positions are in the normalized device coordinates,
+    they are converted into pixels and truncated like GLFWWindow.draw_triangle(),
+    so the instances cover the same pixels as the triangles of the triangle render.
+
+    Every append_rects() or append_triangles() in the frame takes the next instance buffer,
+    so the draw calls in the same order of every frame reuse their buffers.
+    The caller may pass the version of the arrays, like the frame they are changed at,
+    the arrays of the same version as the last frame are neither converted nor uploaded again.
+    Without the version, the arrays are uploaded in every frame.
+    They are drawn by one glDrawArraysInstanced for each call in the flush().
+
+    Usage::
+
+        render.init_shader(width, height)
+
+        # Every frame, the version is changed when the arrays are changed
+        render.append_rects(xywh, colors, version)
+        render.flush()
+    '''
+
+    def __init__(self):
+        self.buffers = {'rects': [], 'triangles': []}
+        self.pending = []
+        self.uploads = 0
+        self.skips = 0
+
+    def init_shader(self, width, height):
+        self.width = width
+        self.height = height
+
+        # The same projection as the triangle render, the positions are in pixels
+        self.projection = np.array([
+            [2.0/self.width, 0.0, 0.0, 0.0],
+            [0.0, 2.0/self.height, 0.0, 0.0],
+            [0.0, 0.0, 1.0, 0.0],
+            [-1.0, -1.0, 0.0, 1.0]
+        ], dtype=np.float32)
+
+        # Compile shaders, or load them from the program binary cache
+        self.programs = {
+            'rects': shader_library.program(RECT_SHADER, FRAGMENT_SHADER),
+            'triangles': shader_library.program(TRIANGLE_SHADER, FRAGMENT_SHADER),
+        }
+
+        for program in self.programs.values():
+            glUseProgram(program)
+            glUniformMatrix4fv(glGetUniformLocation(program, "projection"),
+                               1, GL_FALSE, self.projection)
+
+    def _next_buffer(self, kind, sizes):
+        buffers = self.buffers[kind]
+        i = sum(1 for e in self.pending if e[0] == kind)
+        if i == len(buffers):
+            buffers.append(InstanceBuffer(sizes))
+        return buffers[i]
+
+    def _to_pixels(self, xy):
+        '''Convert the (-1, 1) positions of the (n, 2k) array into pixels in place.'''
+        xy += 1
+        xy *= np.tile([0.5 * self.width, 0.5 * self.height], xy.shape[1] // 2)
+        return np.trunc(xy, out=xy)
+
+    def append_rects(self, xywh, colors, version=None):
+        '''
+        Append the rectangles, they are drawn in the flush().
+
+        :param xywh np.ndarray: (n, 4) array of the SW corner and the size (x, y, w, h), like GLFWWindow.draw_rect().
+        :param colors np.ndarray: (n, 4) RGBA colors, or one RGBA color for all the rectangles.
+        :param version: the version of the arrays, they are not uploaded again if it is the same as the last frame.
+        '''
+        xywh = np.asarray(xywh, dtype=np.float64).reshape(-1, 4)
+        n = len(xywh)
+        if n == 0:
+            return
+
+        buffer = self._next_buffer('rects', RECT_ATTRIBUTES)
+        if buffer.changed(n, version):
+            # The SW and the NE corners, then the size in pixels
+            corners = np.empty((n, 4))
+            corners[:, :2] = xywh[:, :2]
+            np.add(xywh[:, :2], xywh[:, 2:], out=corners[:, 2:])
+            self._to_pixels(corners)
+            corners[:, 2:] -= corners[:, :2]
+
+            block = buffer.block(n)
+            block[:, :4] = corners
+            block[:, 4:] = colors
+            buffer.upload(n, version)
+            self.uploads += 1
+        else:
+            self.skips += 1
+        self.pending.append(('rects', buffer, n))
+
+    def append_triangles(self, vertices, colors, version=None):
+        '''
+        Append the triangles, they are drawn in the flush().
+
+        :param vertices np.ndarray: (n, 6) or (n, 3, 2) array of (x1, y1, x2, y2, x3, y3), like GLFWWindow.draw_triangle().
+        :param colors np.ndarray: (n, 4) RGBA colors, or one RGBA color for all the triangles.
+        :param version: the version of the arrays, they are not uploaded again if it is the same as the last frame.
+        '''
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 6)
+        n = len(vertices)
+        if n == 0:
+            return
+
+        buffer = self._next_buffer('triangles', TRIANGLE_ATTRIBUTES)
+        if buffer.changed(n, version):
+            block = buffer.block(n)
+            block[:, :6] = self._to_pixels(vertices.copy())
+            block[:, 6:] = colors
+            buffer.upload(n, version)
+            self.uploads += 1
+        else:
+            self.skips += 1
+        self.pending.append(('triangles', buffer, n))
+
+    def flush(self):
+        '''
+        Draw the appended instances by one draw call for each append.
+        '''
+        if not self.pending:
+            return
+
+        for kind, buffer, n in self.pending:
+            glUseProgram(self.programs[kind])
+            glBindVertexArray(buffer.vao)
+            glDrawArraysInstanced(
+                GL_TRIANGLES, 0, 6 if kind == 'rects' else 3, n)
+
+        glBindVertexArray(0)
+        self.pending = []
+
+    def release(self):
+        for buffers in self.buffers.values():
+            for buffer in buffers:
+                buffer.release()
+        self.buffers = {'rects': [], 'triangles': []}
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,259 @@
+"""
+File: marker_patch.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Software photodiode.
+    Draw the small square in the corner of the screen,
+    its luminance encodes the frame counter or the trigger code of the frame.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+from collections import defaultdict
+
+from OpenGL.GL import *
+
+from .pbo_readback import PBOReadback
+from .parallel.parallel import REQUEST_NS, VALUE
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class MarkerPatch:
+    '''
+    The marker patch in the corner of the screen.
+
+    The luminance of the patch is value / 255, the value is
+    - mode='frame': the frame counter % 256.
+    - mode='trigger': the trigger code of the frame, see set_code(), 0 for the frames without trigger.
+
+    The patch is drawn by the scissored glClear, so it does not touch the shaders and the blending.
+    With verify=True, the patch of every frame is read back by the PBOs and compared with the value a few frames later,
+    the mismatches are logged as the events.
+
+    In the trigger mode with the triggers, the read patches are also cross-checked with the pulses
+    the dispatcher has sent, when the rendering stops. The triggers are expected to be sent right after
+    the swap of their frame, see FlipScheduler.defer(), so the pulse requested between the swaps of
+    the frame and the next one belongs to the frame. They are reported as
+    - missing: the patch shows the code, but it is not sent in the frame.
+    - extra: the code is sent in the frame, but the patch does not show it.
+    - merged: several codes are sent in the frame, the patch shows only the last one.
+    '''
+
+    enabled = False
+    verify = False
+    # The EventLog of the mismatches, they are logged by its writer thread,
+    # or by the logger on the render thread if it is None
+    events = None
+    # The Parallel of the triggers to cross-check with, see Parallel.timestamps()
+    triggers = None
+
+    def __init__(self, size=32, corner='BR', mode='frame', ring=4):
+        '''
+        :param size int: the size of the patch in pixels.
+        :param corner str: one of 'BL', 'BR', 'TL', 'TR'.
+        :param mode str: 'frame' or 'trigger'.
+        :param ring int: how many readbacks can be in flight.
+        '''
+        self.size = size
+        self.corner = corner
+        self.mode = mode
+        self.readback = PBOReadback(ring)
+
+        self.frame = 0
+        # The codes set in the frame being drawn
+        self.codes = []
+        self.checked = 0
+        self.mismatched = 0
+        self.merged = 0
+
+        # The swap time of every frame, and the value read back from the frame
+        self.swap_ns = []
+        self.reads = {}
+        self.cross_checked = None
+
+    def init_gl(self, width, height):
+        '''Place the patch, it requires the OpenGL context.'''
+        s = self.size
+        x = 0 if self.corner in ('BL', 'TL') else width - s
+        y = 0 if self.corner in ('BL', 'BR') else height - s
+        self.rect = (x, y, s, s)
+        if self.verify:
+            self.readback.init_gl()
+
+    def set_code(self, code):
+        '''
+        Show the trigger code in the frame being drawn.
+        The patch shows one code, when several codes are set in the frame,
+        the last one is shown, and the frame is logged as merged.
+        '''
+        self.codes.append(int(code) & 0xFF)
+
+    def value(self):
+        if self.mode == 'trigger':
+            return self.codes[-1] if self.codes else 0
+        return self.frame % 256
+
+    def cross_checking(self):
+        return self.enabled and self.verify and self.mode == 'trigger' and self.triggers is not None
+
+    def render(self):
+        '''
+        Draw the patch at the end of the frame, before the swap.
+        '''
+        codes = self.codes
+        if not self.enabled:
+            self.codes = []
+            return
+
+        value = self.value()
+        x, y, w, h = self.rect
+        if self.mode == 'trigger' and len(codes) > 1:
+            self.merged += 1
+            self._warn(event='marker_merged', frame=self.frame,
+                       codes=codes, shown=value)
+
+        c = value / 255
+        glEnable(GL_SCISSOR_TEST)
+        glScissor(x, y, w, h)
+        glClearColor(c, c, c, 1.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        glDisable(GL_SCISSOR_TEST)
+
+        if self.verify:
+            # The center pixel is enough, and the edges are blurred by the multisampling
+            self.readback.read(x + w // 2, y + h // 2, 1, 1,
+                               tag=(self.frame, value))
+            self.check(self.readback.collect())
+
+        self.frame += 1
+        self.codes = []
+
+    def on_swap(self, t_ns):
+        '''Remember the swap time of the frame, it is called right after the buffers are swapped.'''
+        if self.cross_checking():
+            self.swap_ns.append(t_ns)
+
+    def _warn(self, **fields):
+        if self.events is not None and self.events.enabled:
+            self.events.write(**fields, level='WARNING')
+        else:
+            logger.bind(**fields).warning(f'Marker: {fields}')
+
+    def check(self, reads):
+        for (frame, value), pixels in reads:
+            self.checked += 1
+            got = int(pixels[0, 0, 0])
+            if self.cross_checking():
+                self.reads[frame] = got
+            if got != value:
+                self.mismatched += 1
+                self._warn(event='marker_mismatch',
+                           frame=frame, expected=value, got=got)
+
+    def cross_check(self, records, since_ns=None):
+        '''
+        Cross-check the read patches with the pulses of the triggers.
+        The frames not read back, like the dropped reads, are not checked.
+
+        :param records np.array: the (n, 4) array of the pulses, see Parallel.timestamps().
+        :param since_ns int: only check the frames swapped after it, like the first record when the older ones are overwritten.
+
+        :return dict: the counts of the matched, missing, extra and merged codes.
+        '''
+        res = dict(matched=0, missing=0, extra=0, merged=0)
+        if not self.swap_ns:
+            return res
+
+        # The pulse requested after the swap of the frame belongs to the frame
+        swaps = np.array(self.swap_ns, dtype=np.int64)
+        frames = np.searchsorted(
+            swaps, records[:, REQUEST_NS], side='right') - 1
+        sent = defaultdict(list)
+        for frame, value in zip(frames.tolist(), records[:, VALUE].tolist()):
+            sent[frame].append(value & 0xFF)
+
+        first = -1
+        if since_ns is not None:
+            first = int(np.searchsorted(swaps, since_ns, side='left'))
+        for frame in sorted(set(self.reads) | set(sent)):
+            if frame < first:
+                continue
+            got = self.reads.get(frame)
+            codes = sent.get(frame, [])
+            if got is None and frame >= 0:
+                # The patch is not read back
+                continue
+
+            others = list(codes)
+            if got:
+                if got in others:
+                    others.remove(got)
+                    res['matched'] += 1
+                else:
+                    res['missing'] += 1
+                    self._warn(event='trigger_missing',
+                               frame=frame, shown=got, sent=codes)
+            if not others:
+                continue
+            if got and got in codes:
+                res['merged'] += len(others)
+                self._warn(event='trigger_merged',
+                           frame=frame, shown=got, sent=codes)
+            else:
+                res['extra'] += len(others)
+                self._warn(event='trigger_extra',
+                           frame=frame, shown=got, sent=codes)
+        return res
+
+    def report(self):
+        res = dict(
+            frames=self.frame,
+            checked=self.checked,
+            mismatched=self.mismatched,
+            merged=self.merged,
+            dropped=self.readback.dropped,
+        )
+        if self.cross_checked is not None:
+            res['triggers'] = self.cross_checked
+        return res
+
+    def release(self):
+        if self.verify:
+            self.check(self.readback.collect(wait=True))
+            self.readback.release()
+        if self.cross_checking():
+            if not self.triggers.flush():
+                logger.warning('Marker: the triggers are not all sent')
+            records = self.triggers.timestamps()
+            # The older pulses are overwritten in the records ring
+            since_ns = None
+            if self.triggers.count > self.triggers.max_records:
+                since_ns = int(records[0, REQUEST_NS])
+            self.cross_checked = self.cross_check(records, since_ns)
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
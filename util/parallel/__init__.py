@@ -24,6 +24,7 @@ in this module. That API assumes you only ever want to use a single
 parallel port at once.
 """
 import sys
+import logging
 
 # To make life easier, only try drivers which have a hope in heck of working.
 # Because hasattr() in connection to windll ends up in an OSError trying to
@@ -155,7 +156,7 @@ def setPortAddress(address=0x0378):
     try:
         PORT = ParallelPort(address=address)
     except Exception as exp:
-        # logging.warning('Could not initiate port: %s' % str(exp))
+        logging.warning('Could not initiate port %s: %s' % (address, str(exp)))
         PORT = None
 
 
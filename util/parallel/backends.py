@@ -0,0 +1,269 @@
+"""
+File: backends.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Trigger backends.
+    The backend is anything with setData(value) and close(),
+    the dispatcher of Parallel writes the pulses into it.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+import time
+import socket
+import struct
+
+import numpy as np
+
+from loguru import logger
+from multiprocessing import shared_memory
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class TriggerBackend:
+    '''
+    The interface of the trigger backends.
+    '''
+    name = 'base'
+
+    def setData(self, value):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.name}>'
+
+
+class LoopbackPort(TriggerBackend):
+    '''
+    Record every write as (perf_counter_ns, value) in memory.
+
+    The records are in the ring buffer of max_records,
+    with shared=True the ring buffer is in the shared memory,
+    so another process can read it by LoopbackPort.attach(port.shm.name).
+    '''
+    name = 'loopback'
+
+    def __init__(self, max_records=100000, shared=False):
+        self.max_records = max_records
+        self.shm = None
+        self.owner = shared
+
+        # The first row is the (count, 0) header
+        shape = (max_records + 1, 2)
+        if shared:
+            nbytes = int(np.prod(shape)) * 8
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.buffer = np.ndarray(shape, dtype=np.int64, buffer=self.shm.buf)
+            self.buffer[:] = 0
+        else:
+            self.buffer = np.zeros(shape, dtype=np.int64)
+
+    @classmethod
+    def attach(cls, name):
+        '''Attach to the shared ring buffer of another LoopbackPort.'''
+        port = cls.__new__(cls)
+        port.shm = shared_memory.SharedMemory(name=name)
+        port.owner = False
+        n = port.shm.size // 16
+        port.max_records = n - 1
+        port.buffer = np.ndarray((n, 2), dtype=np.int64, buffer=port.shm.buf)
+        return port
+
+    @property
+    def count(self):
+        return int(self.buffer[0, 0])
+
+    def setData(self, value):
+        count = self.buffer[0, 0]
+        self.buffer[1 + count % self.max_records] = (
+            time.perf_counter_ns(), value)
+        # The count is updated after the record, so the reader never sees a half record
+        self.buffer[0, 0] = count + 1
+
+    def readData(self):
+        count = self.count
+        if count == 0:
+            return 0
+        return int(self.buffer[1 + (count - 1) % self.max_records, 1])
+
+    def records(self):
+        '''
+        The latest records, the oldest first.
+
+        :return np.array: the (n, 2) array of (perf_counter_ns, value).
+        '''
+        count = self.count
+        n = min(count, self.max_records)
+        rows = np.arange(count - n, count) % self.max_records + 1
+        return self.buffer[rows].copy()
+
+    def close(self):
+        if self.shm is not None:
+            # The ndarray must be released before the shared memory is closed
+            self.buffer = self.buffer.copy()
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+            self.shm = None
+
+
+class SerialPort(TriggerBackend):
+    '''
+    The serial or USB TTL trigger device, every value is written as a single byte.
+    It requires pyserial.
+
+    Some devices generate the pulse by themselves,
+    use send_zero=False to skip writing the 0 at the end of the pulse.
+    '''
+
+    def __init__(self, device, baudrate=115200, send_zero=True):
+        import serial
+
+        self.name = f'serial:{device}@{baudrate}'
+        self.send_zero = send_zero
+        self.port = serial.Serial(device, baudrate=baudrate, timeout=0)
+        self.latest = 0
+
+    def setData(self, value):
+        if value == 0 and not self.send_zero:
+            return
+        self.port.write(bytes([value & 0xFF]))
+        self.latest = value
+
+    def readData(self):
+        return self.latest
+
+    def close(self):
+        self.port.close()
+
+
+class UDPPort(TriggerBackend):
+    '''
+    Send every value as a UDP datagram.
+
+    The datagram is the single byte of the value,
+    or the struct '<QB' of (time_ns, value) with timestamp=True.
+    '''
+
+    def __init__(self, host, port, timestamp=False, send_zero=True):
+        self.name = f'udp:{host}:{port}'
+        self.timestamp = timestamp
+        self.send_zero = send_zero
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.connect((host, int(port)))
+        self.latest = 0
+
+    def setData(self, value):
+        if value == 0 and not self.send_zero:
+            return
+        if self.timestamp:
+            self.socket.send(struct.pack('<QB', time.time_ns(), value & 0xFF))
+        else:
+            self.socket.send(bytes([value & 0xFF]))
+        self.latest = value
+
+    def readData(self):
+        return self.latest
+
+    def close(self):
+        self.socket.close()
+
+
+class ParallelPortBackend(TriggerBackend):
+    '''
+    The parallel port with the driver found on the platform.
+    It raises the error if the port can not be opened.
+    '''
+
+    def __init__(self, address=0x0378):
+        from . import ParallelPort
+
+        if ParallelPort is None:
+            raise RuntimeError('No parallel port driver is found')
+
+        # convert u"0x0378" into 0x0378
+        if isinstance(address, str) and not address.startswith('/dev/'):
+            address = int(address, 16)
+
+        self.name = f'parallel:{address}'
+        self.port = ParallelPort(address=address)
+
+    def setData(self, value):
+        self.port.setData(value)
+
+    def readData(self):
+        return self.port.readData()
+
+    def close(self):
+        del self.port
+
+
+def open_backend(spec):
+    '''
+    Open the trigger backend.
+
+    :param spec: the backend object with setData(value), or the str of
+        - loopback
+        - serial:/dev/ttyUSB0 or serial:COM3@115200
+        - udp:127.0.0.1:5005
+        - parallel:0x0378, parallel:/dev/parport0, or the address only, like 0x0378.
+
+    :return TriggerBackend: the backend.
+    '''
+    if hasattr(spec, 'setData'):
+        return spec
+
+    spec = str(spec).strip()
+    kind, _, arg = spec.partition(':')
+
+    if kind == 'loopback':
+        return LoopbackPort()
+
+    if kind == 'serial':
+        device, _, baudrate = arg.partition('@')
+        return SerialPort(device, baudrate=int(baudrate or 115200))
+
+    if kind == 'udp':
+        host, _, port = arg.rpartition(':')
+        return UDPPort(host, int(port))
+
+    if kind == 'parallel':
+        return ParallelPortBackend(arg)
+
+    return ParallelPortBackend(spec)
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    port = LoopbackPort(shared=True)
+    reader = LoopbackPort.attach(port.shm.name)
+    for value in [1, 0, 2, 0]:
+        port.setData(value)
+    logger.info(reader.records())
+    reader.close()
+    port.close()
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
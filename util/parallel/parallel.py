@@ -1,48 +1,208 @@
 # %%
 import time
+import queue
 import threading
 
-from . import setPortAddress, setData
+import numpy as np
+
+from loguru import logger
+
+from .backends import open_backend
 
 # %%
+# Columns of the records
+REQUEST_NS, START_NS, END_NS, VALUE = 0, 1, 2, 3
+
+
+def sleep_until(t_ns, spin_ns=200000):
+    '''
+    Sleep until the perf_counter_ns() time of t_ns.
+    The OS sleep is not precise, so the last spin_ns is spin-waited.
+
+    :param t_ns int: the target time in ns.
+    :param spin_ns int: the spin-wait duration in ns.
+    '''
+    remain = t_ns - time.perf_counter_ns()
+    if remain > spin_ns:
+        time.sleep((remain - spin_ns) / 1e9)
+    while time.perf_counter_ns() < t_ns:
+        pass
 
 # %%
 
 
 class Parallel(object):
-    def __init__(self):
+    '''
+    Send the trigger pulses through a single long-lived dispatcher thread.
+
+    The send() only puts the request into the bounded queue and returns at once,
+    the dispatcher writes the value, holds it for pulse_width, and writes 0.
+    The overlapping pulses are serialized in the order of send(),
+    and there is at least gap seconds of 0 between two pulses,
+    so every pulse has its own rising edge.
+
+    Every pulse is recorded as (request_ns, start_ns, end_ns, value) in perf_counter_ns().
+    The pulse failed by the backend is logged and counted in errors, the dispatcher keeps running.
+    '''
+
+    def __init__(self, pulse_width=0.001, gap=0.001, spin=0.0002, max_queue=256, max_records=10000):
+        '''
+        :param pulse_width float: the pulse width in seconds.
+        :param gap float: the minimal low time between two pulses in seconds.
+        :param spin float: the last part of the waiting is spin-waited, in seconds.
+        :param max_queue int: the size of the queue, the trigger is dropped when it is full.
+        :param max_records int: the size of the records ring buffer.
+        '''
         self.address = None
-        pass
+        # Whether the triggers are sent to the fallback instead of the address
+        self.fallen_back = False
+        self.latest = 0
+        self.pulse_width_ns = int(pulse_width * 1e9)
+        self.gap_ns = int(gap * 1e9)
+        self.spin_ns = int(spin * 1e9)
+
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.errors = 0
+        # The pulses put into the queue, and the ones sent or failed by the dispatcher
+        self.requested = 0
+        self.handled = 0
+        self.thread = None
+        self.backend = None
+        self.write = None
+
+        self.max_records = max_records
+        self.records = np.zeros((max_records, 4), dtype=np.int64)
+        self.count = 0
+
+    def reset(self, address, fallback=None):
+        '''
+        Open the backend and start the dispatcher.
+
+        :param address: the backend spec, like '0x0378', 'loopback' or 'udp:127.0.0.1:5005', see open_backend(),
+                        or the port object with setData(value).
+        :param fallback: the backend spec to use if the backend can not be opened, None to raise the error.
+        '''
+        # The dispatcher may be writing to the old backend
+        self._stop()
+
+        self.fallen_back = False
+        try:
+            self.backend = open_backend(address)
+        except Exception as err:
+            if fallback is None:
+                raise
+            # The triggers never reach the recording device, it must not go unnoticed
+            logger.error(
+                f'Can not open the trigger backend {address!r} ({err!r}), '
+                f'the triggers are sent to {fallback!r} and NOT to the recording device')
+            self.backend = open_backend(fallback)
+            self.fallen_back = True
 
-    def reset(self, address):
         self.address = address
-        address_hex = int(address, 16)
-        setPortAddress(address_hex)
-        setData(0)
+        self.write = self.backend.setData
+        logger.info(f'Trigger backend: {self.backend}')
+
+        self.write(0)
         self.latest = 0
+        self.count = 0
+        self.requested = 0
+        self.handled = 0
+
+        self.thread = threading.Thread(target=self._dispatch, daemon=True)
+        self.thread.start()
 
     def send(self, value, verbose=True):
         if self.address is None:
-            print('Send failed since the Parallel is not set')
+            logger.error('Send failed since the Parallel is not set')
             return
 
-        t = threading.Thread(target=self._send, args=(
-            value, verbose), daemon=True)
-        t.start()
+        try:
+            self.queue.put_nowait((value, verbose, time.perf_counter_ns()))
+            self.requested += 1
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f'Send failed since the queue is full: {value}')
 
         return time.time()
 
-    def _send(self, value, verbose):
-        try:
-            value = int(value)
-        except Exception as err:
-            print('Exception: %s' % err)
-            value = self.latest + 1
+    def flush(self, timeout=1.0):
+        '''
+        Wait until the queued pulses are sent.
+
+        :return bool: whether they are all sent or failed in the timeout.
+        '''
+        deadline = time.perf_counter() + timeout
+        while self.handled < self.requested:
+            if time.perf_counter() > deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout=1.0):
+        '''Send the pending pulses and stop the dispatcher.'''
+        self._stop(timeout)
+
+    def _stop(self, timeout=1.0):
+        '''Send the pending pulses, stop the dispatcher, and then close the backend.'''
+        if self.thread is not None:
+            self.queue.put((None, False, 0))
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                logger.warning(
+                    f'The trigger dispatcher does not stop in {timeout} seconds')
+            self.thread = None
+        if hasattr(self.backend, 'close'):
+            self.backend.close()
+        self.backend = None
+
+    def _dispatch(self):
+        # The earliest time of the next rising edge
+        ready_ns = 0
+        while True:
+            value, verbose, request_ns = self.queue.get()
+            if value is None:
+                break
+
+            try:
+                value = int(value)
+            except Exception as err:
+                logger.warning(f'Invalid trigger value {value!r}: {err!r}')
+                value = self.latest + 1
+
+            sleep_until(ready_ns, self.spin_ns)
+
+            start_ns = time.perf_counter_ns()
+            try:
+                self.write(value)
+                sleep_until(start_ns + self.pulse_width_ns, self.spin_ns)
+                self.write(0)
+            except Exception as err:
+                # The failed pulse is not recorded, the next ones are still sent
+                self.errors += 1
+                logger.error(
+                    f'Can not send the trigger {value} to {self.backend}: {err!r}')
+                self.handled += 1
+                continue
+            end_ns = time.perf_counter_ns()
+            ready_ns = end_ns + self.gap_ns
+
+            self.records[self.count % self.max_records] = (
+                request_ns, start_ns, end_ns, value)
+            self.count += 1
+            self.handled += 1
+            self.latest = value
+
+            if verbose:
+                logger.debug(f'Sent: {value} to {self.backend}')
 
-        setData(value)
-        time.sleep(0.001)
-        setData(0)
+    def timestamps(self):
+        '''
+        The records of the latest pulses, the oldest first.
 
-        self.latest = value
-        if verbose:
-            print('Sent: {} to {}'.format(value, self.address))
+        :return np.array: the (n, 4) array of (request_ns, start_ns, end_ns, value).
+        '''
+        count = self.count
+        n = min(count, self.max_records)
+        rows = np.arange(count - n, count) % self.max_records
+        return self.records[rows]
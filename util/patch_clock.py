@@ -0,0 +1,115 @@
+"""
+File: patch_clock.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    The frame clock of the blinking patches.
+    The luminance of every selected patch is computed once per frame
+    from the integer frame index and the refresh rate, in float64.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class PatchClock:
+    '''
+    The luminance of the patch of freq (Hz) and phase (radians) at the frame n is
+
+        sin(2 * pi * freq * n / refresh_rate + phase)
+
+    The cycles are reduced by the refresh rate before the sin(),
+    so it does not lose the precision in the long session,
+    and the frequency does not depend on the jitter of the wall clock.
+    The missed frame delays the stimulus by one frame, it never skips the phase.
+
+    Usage::
+
+        clock = PatchClock(refresh_rate)
+        # At the session start
+        clock.reset()
+        # Every frame
+        params.set('uLuminance', clock.luminance(selected_patches))
+        clock.tick()
+    '''
+
+    def __init__(self, refresh_rate=60):
+        '''
+        :param refresh_rate float: the frames per second.
+        '''
+        self.refresh_rate = refresh_rate
+        self.frame = 0
+        self.key = None
+
+    def reset(self):
+        self.frame = 0
+
+    def tick(self):
+        '''Count the frame, it is called once per frame.'''
+        self.frame += 1
+
+    def time(self):
+        '''The time of the frame since the reset, in seconds.'''
+        return self.frame / self.refresh_rate
+
+    def _parse(self, selected_patches):
+        key = tuple(map(tuple, selected_patches))
+        if key != self.key:
+            # The patch is (idxRing, idxWedge, freq) or (idxRing, idxWedge, freq, phase)
+            self.freqs = np.array([e[2] for e in key], dtype=np.float64)
+            self.phases = np.array([e[3] if len(e) > 3 else 0 for e in key],
+                                   dtype=np.float64)
+            self.key = key
+
+    def luminance(self, selected_patches, frame=None):
+        '''
+        The luminance of the patches at the frame.
+
+        :param selected_patches list: the (idxRing, idxWedge, freq[, phase]) of the patches.
+        :param frame int: the frame index, the current frame by default.
+
+        :return np.ndarray: the float32 array in [-1, 1] in the order of the patches.
+        '''
+        self._parse(selected_patches)
+        if frame is None:
+            frame = self.frame
+        # The cycles in [0, 1), the integer part does not change the sin()
+        cycles = np.mod(self.freqs * frame, self.refresh_rate) / self.refresh_rate
+        return np.sin(2 * np.pi * cycles + self.phases).astype(np.float32)
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    # The float32 session time loses the precision in the long session
+    clock = PatchClock(refresh_rate=60)
+    patches = [(0, 1, 10), (1, 2, 15), (2, 3, 7.5)]
+    freqs = np.array([e[2] for e in patches], dtype=np.float32)
+    for hours in [0, 1, 10, 100]:
+        frame = hours * 3600 * 60 + 1
+        t = np.float32(frame / 60)
+        naive = np.sin(t * freqs * np.float32(2 * np.pi))
+        logger.info(
+            f'{hours} hours: frame clock {clock.luminance(patches, frame)}, float32 time {naive}')
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,190 @@
+"""
+File: pbo_readback.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Asynchronous pixel readback.
+    The pixels are read into the ring of pixel buffer objects,
+    and they are mapped only after the GPU has finished, so the CPU never waits.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import ctypes
+from OpenGL.GL import *
+# The wrapped version allocates the client array, it does not accept the offset into the PBO
+from OpenGL.raw.GL.VERSION.GL_1_0 import glReadPixels as _glReadPixels
+
+# GL format: channels
+CHANNELS = {
+    GL_RED: 1,
+    GL_RGB: 3,
+    GL_RGBA: 4,
+}
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class PBOReadback:
+    '''
+    Read the pixels of the current framebuffer through the ring of PBOs.
+
+    The read() starts the copy on the GPU and returns at once,
+    the collect() returns the reads the GPU has finished, in the order of the reads.
+    When all the PBOs are in flight, the read is dropped instead of waiting.
+
+    Usage::
+
+        # Before the swap
+        readback.read(x, y, w, h, tag=frame)
+
+        # Some frames later
+        for tag, pixels in readback.collect():
+            check(tag, pixels)
+    '''
+
+    def __init__(self, ring=3):
+        '''
+        :param ring int: how many reads can be in flight.
+        '''
+        self.ring = ring
+        self.pbos = None
+        self.sizes = [0] * ring
+        self.fences = [None] * ring
+        self.tags = [None] * ring
+        self.shapes = [None] * ring
+
+        # The reads started and collected
+        self.index = 0
+        self.collected = 0
+        self.dropped = 0
+
+    def init_gl(self):
+        '''Create the PBOs, it requires the OpenGL context.'''
+        self.pbos = np.array(glGenBuffers(self.ring), dtype=np.uint32).reshape(-1)
+
+    def read(self, x, y, w, h, tag=None, format=GL_RGBA):
+        '''
+        Start reading the pixels of the rectangle in the current read framebuffer.
+
+        :param x, y, w, h int: the rectangle in pixels, (x, y) is the SW corner.
+        :param tag: anything to identify the read, it is returned by collect().
+        :param format: GL_RED, GL_RGB or GL_RGBA, the pixels are GL_UNSIGNED_BYTE.
+
+        :return bool: whether the read is started.
+        '''
+        slot = self.index % self.ring
+        if self.fences[slot] is not None:
+            # The ring is full, do not wait for the GPU
+            self.dropped += 1
+            return False
+
+        channels = CHANNELS[format]
+        nbytes = w * h * channels
+        pbo = int(self.pbos[slot])
+
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        if self.sizes[slot] != nbytes:
+            glBufferData(GL_PIXEL_PACK_BUFFER, nbytes, None, GL_STREAM_READ)
+            self.sizes[slot] = nbytes
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        _glReadPixels(x, y, w, h, format, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+        self.fences[slot] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.tags[slot] = tag
+        self.shapes[slot] = (h, w, channels)
+        self.index += 1
+        return True
+
+    def pending(self):
+        '''How many reads are in flight.'''
+        return self.index - self.collected
+
+    def collect(self, wait=False, dest=None):
+        '''
+        Collect the finished reads.
+
+        :param wait bool: wait for all the reads in flight, it stalls the pipeline.
+        :param dest: dest(tag, shape) returns the contiguous uint8 array to copy the pixels into,
+                     or None to skip the read, the pixels are copied into the new array by default.
+
+        :return list: the (tag, pixels) of the reads,
+                      the pixels is the (h, w, channels) uint8 array, the bottom row first.
+        '''
+        res = []
+        while self.collected < self.index:
+            slot = self.collected % self.ring
+            fence = self.fences[slot]
+
+            if wait:
+                status = glClientWaitSync(
+                    fence, GL_SYNC_FLUSH_COMMANDS_BIT, int(1e9))
+            else:
+                status = glClientWaitSync(fence, 0, 0)
+
+            if status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                break
+
+            glDeleteSync(fence)
+            self.fences[slot] = None
+
+            tag = self.tags[slot]
+            shape = self.shapes[slot]
+            self.tags[slot] = None
+            self.collected += 1
+
+            if dest is None:
+                pixels = np.empty(shape, dtype=np.uint8)
+            else:
+                pixels = dest(tag, shape)
+                if pixels is None:
+                    continue
+
+            nbytes = self.sizes[slot]
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, int(self.pbos[slot]))
+            ptr = glMapBufferRange(GL_PIXEL_PACK_BUFFER, 0,
+                                   nbytes, GL_MAP_READ_BIT)
+            mapped = np.ctypeslib.as_array(
+                (ctypes.c_ubyte * nbytes).from_address(ptr))
+            np.copyto(pixels.reshape(-1), mapped)
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+
+            res.append((tag, pixels))
+
+        return res
+
+    def release(self):
+        for slot, fence in enumerate(self.fences):
+            if fence is not None:
+                glDeleteSync(fence)
+                self.fences[slot] = None
+        if self.pbos is not None:
+            glDeleteBuffers(len(self.pbos), self.pbos)
+            self.pbos = None
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
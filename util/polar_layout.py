@@ -0,0 +1,183 @@
+"""
+File: polar_layout.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    The baked polar layout of the circle stimulus.
+    The ring, the grid, the radius in the ring and the angle of every pixel
+    are rendered into the texture only when the layout changes,
+    and the selected patches are in the small lookup texture.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+from OpenGL.GL import *
+
+from .shader_manager import shader_manager
+from .shader_library import shader_library
+
+BAKE_VERT = 'circle/bake.vert'
+BAKE_FRAG = 'circle/bake.frag'
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def _new_texture():
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    # The texels are fetched by the index, never filtered
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+    return texture
+
+
+class PolarLayout:
+    '''
+    The layout texture for shader/circle/c.frag.
+
+    - uLayout: RGBA32F of the viewport size, (idxRing, idxGrid, r in the ring, angle in half turns),
+      it is baked by shader/circle/bake.frag when the ratio, the wedges, the ring edges or the grids change.
+    - uSelection: RGB32F of wedges x rings, (selected, freq, index in the selected patches) of the patch,
+      it is uploaded when the selected patches change.
+
+    Usage::
+
+        layout.init_gl()
+
+        # In the frame, before drawing with c.frag
+        layout.update(ratio, wedges, ring_edges, grids, selected_patches)
+        layout.bind(unit=0)
+        params.set('uLayout', 0)
+        params.set('uSelection', 1)
+    '''
+
+    def __init__(self):
+        self.layout_key = None
+        self.selection_key = None
+        # How many times the layout is baked
+        self.bakes = 0
+
+    def init_gl(self):
+        '''Create the textures and compile the bake program, it requires the OpenGL context.'''
+        self.program = shader_library.program(BAKE_VERT, BAKE_FRAG)
+        self.params = shader_manager.params(self.program)
+        # The full screen triangle is generated in the vertex shader
+        self.vao = glGenVertexArrays(1)
+
+        _, _, self.width, self.height = glGetIntegerv(GL_VIEWPORT)
+        self.layout = _new_texture()
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA32F, self.width, self.height, 0,
+                     GL_RGBA, GL_FLOAT, None)
+        self.fbo = glGenFramebuffers(1)
+        previous = glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.fbo)
+        glFramebufferTexture2D(GL_DRAW_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
+                               GL_TEXTURE_2D, self.layout, 0)
+        status = glCheckFramebufferStatus(GL_DRAW_FRAMEBUFFER)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, previous)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f'Incomplete layout framebuffer: {status}')
+
+        self.selection = _new_texture()
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def update(self, ratio, wedges, ring_edges, grids, selected_patches):
+        '''
+        Bake the layout and upload the selection if they are changed.
+
+        :param selected_patches list: the (idxRing, idxWedge, freq[, phase]) of the patches.
+
+        :return bool: whether the layout is baked.
+        '''
+        baked = False
+        key = (ratio, grids, tuple(ring_edges))
+        if key != self.layout_key:
+            self.bake(ratio, ring_edges, grids)
+            self.layout_key = key
+            baked = True
+
+        key = (wedges, len(ring_edges), tuple(map(tuple, selected_patches)))
+        if key != self.selection_key:
+            self.upload_selection(wedges, len(ring_edges), selected_patches)
+            self.selection_key = key
+
+        return baked
+
+    def bake(self, ratio, ring_edges, grids):
+        n = len(ring_edges)
+        assert n < 100, f'Too many ring_edges({n=})'
+
+        previous = glGetIntegerv(GL_DRAW_FRAMEBUFFER_BINDING)
+        blend = glIsEnabled(GL_BLEND)
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, self.fbo)
+        # The texels are the values, not the colors
+        glDisable(GL_BLEND)
+
+        glUseProgram(self.program)
+        self.params.set('uRatio', ratio)
+        self.params.set('uMaxR', ring_edges[-1])
+        self.params.set('uGrids', grids)
+        self.params.set('uNumRings', n)
+        self.params.set('uRingEdges', ring_edges)
+        glBindVertexArray(self.vao)
+        glDrawArrays(GL_TRIANGLES, 0, 3)
+        glBindVertexArray(0)
+
+        glBindFramebuffer(GL_DRAW_FRAMEBUFFER, previous)
+        if blend:
+            glEnable(GL_BLEND)
+
+        self.bakes += 1
+        logger.debug(
+            f'Baked polar layout {self.width} x {self.height}: {ratio=:.4f}, {grids=}, {ring_edges=}')
+
+    def upload_selection(self, wedges, rings, selected_patches):
+        table = np.zeros((rings, wedges, 3), dtype=np.float32)
+        for i, (ring, wedge, freq, *_) in enumerate(selected_patches):
+            if 0 <= ring < rings and 0 <= wedge < wedges:
+                table[int(ring), int(wedge)] = (1, freq, i)
+
+        glBindTexture(GL_TEXTURE_2D, self.selection)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, wedges, rings, 0,
+                     GL_RGB, GL_FLOAT, table)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def bind(self, unit=0):
+        '''Bind the layout to the texture unit, and the selection to the next one.'''
+        glActiveTexture(GL_TEXTURE0 + unit)
+        glBindTexture(GL_TEXTURE_2D, self.layout)
+        glActiveTexture(GL_TEXTURE0 + unit + 1)
+        glBindTexture(GL_TEXTURE_2D, self.selection)
+        glActiveTexture(GL_TEXTURE0)
+
+    def release(self):
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteTextures(2, [self.layout, self.selection])
+        glDeleteVertexArrays(1, [self.vao])
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,165 @@
+"""
+File: shader_library.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    The GLSL sources of the shader folder.
+    The paths are resolved relative to the package instead of the working directory,
+    the #include lines are preprocessed,
+    and the sources are read only when the program is first requested.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import re
+
+from .shader_manager import shader_manager
+
+# The shader folder in the package root
+SHADER_ROOT = ROOT.joinpath('shader')
+
+# #include "common/math.glsl"
+INCLUDE_PATTERN = re.compile(r'^\s*#\s*include\s+[<"]([^>"]+)[>"]\s*$')
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class ShaderLibrary:
+    '''
+    Load the GLSL sources by their names in the shader folder.
+
+    The line of #include "name" is replaced by the source of the name,
+    it is searched in the folder of the including file first, and then in the shader folder.
+    Every file is included once in a source, like #pragma once,
+    and the #line lines keep the line numbers of the compile errors.
+    The preprocessed sources are memoized, call clear() to read the files again.
+
+    Usage::
+
+        vert = shader_library.source('circle/b.vert')
+
+        # Or get the program from the shader manager
+        program = shader_library.program('circle/b.vert', 'circle/c.frag', dict(BLINK_TOGGLE=True))
+    '''
+
+    def __init__(self, root=SHADER_ROOT):
+        '''
+        :param root str: the shader folder.
+        '''
+        self.root = Path(root)
+        self.sources = {}
+        self.reads = 0
+
+    def resolve(self, name, folder=None):
+        '''
+        The path of the name.
+
+        :param name str: the path relative to the folder or the shader folder.
+        :param folder Path: the folder of the including file.
+
+        :return Path: the resolved path.
+        '''
+        for base in ([folder] if folder else []) + [self.root]:
+            path = Path(base, name).resolve()
+            if path.is_file():
+                return path
+        raise FileNotFoundError(f'Shader not found: {name} (in {self.root})')
+
+    def source(self, name):
+        '''
+        The preprocessed source of the name, it is read once.
+
+        :param name str: the path relative to the shader folder, like 'circle/b.vert'.
+
+        :return str: the source with the #include lines replaced.
+        '''
+        source = self.sources.get(name)
+        if source is None:
+            path = self.resolve(name)
+            files = [path]
+            source = self._preprocess(path, files, [path])
+            self.sources[name] = source
+            logger.debug(
+                f'Loaded shader {name} with {len(files)} files: {[e.name for e in files]}')
+        return source
+
+    def program(self, vertex_name, fragment_name, defines=None):
+        '''
+        The program of the shader_manager, it requires the OpenGL context.
+
+        :param defines dict: name: value of the #define lines.
+
+        :return int: the linked program.
+        '''
+        return shader_manager.program(self.source(vertex_name), self.source(fragment_name), defines)
+
+    def clear(self):
+        '''Forget the sources, they are read again at the next request.'''
+        self.sources = {}
+
+    def _preprocess(self, path, files, stack):
+        '''
+        :param files list: the files included in the source, every file is included once.
+        :param stack list: the including files, to detect the circular #include.
+        '''
+        lines = path.read_text(encoding='utf-8').splitlines()
+        self.reads += 1
+        index = files.index(path)
+
+        output = []
+        for i, line in enumerate(lines):
+            match = INCLUDE_PATTERN.match(line)
+            if match is None:
+                output.append(line)
+                continue
+
+            included = self.resolve(match.group(1), path.parent)
+            if included in stack:
+                raise RuntimeError(
+                    f'Circular #include of {included.name} in {path}:{i + 1}')
+            if included in files:
+                output.append(f'// {line.strip()} (included already)')
+                continue
+
+            files.append(included)
+            # The source string number tells the included file in the compile errors
+            output.append(f'#line 1 {files.index(included)}')
+            output.append(self._preprocess(included, files, stack + [included]))
+            output.append(f'#line {i + 2} {index}')
+
+        return '\n'.join(output) + '\n'
+
+
+# The sources of the process
+shader_library = ShaderLibrary()
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    for name in ['circle/b.frag', 'circle/c.frag', 'circle/bake.frag', 'font/shadow.vert']:
+        source = shader_library.source(name)
+        logger.info(f'{name}: {len(source.splitlines())} lines')
+    shader_library.source('circle/c.frag')
+    logger.info(f'{len(shader_library.sources)} sources, {shader_library.reads} files read')
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,246 @@
+"""
+File: shader_manager.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Shader programs with the specialized variants and the on-disk binary cache.
+    The variants are compiled by injecting the #define lines,
+    and the linked programs are cached by glGetProgramBinary / glProgramBinary.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import os
+import ctypes
+import struct
+import hashlib
+import OpenGL.GL
+from OpenGL.GL import *
+from OpenGL.GL.shaders import compileShader
+from OpenGL.GL.ARB import get_program_binary as arb_program_binary
+
+from .shader_params import ShaderParams
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def inject_defines(source, defines):
+    '''
+    Insert the #define lines right after the #version line.
+
+    :param defines dict: name: value, the value of True is defined as 1.
+    '''
+    if not defines:
+        return source
+
+    lines = ''.join(
+        f'#define {name} {int(value) if isinstance(value, bool) else value}\n'
+        for name, value in sorted(defines.items()))
+
+    head, sep, tail = source.partition('\n')
+    if head.lstrip().startswith('#version'):
+        return head + sep + lines + tail
+    return lines + source
+
+
+class ShaderManager:
+    '''
+    Compile the programs and cache them.
+
+    The program of the (sources, defines) is compiled once and kept in the memory.
+    The linked binary is saved into <cache_dir>/<key>.bin, the key is the hash of
+    the driver string and the sources with the defines,
+    so the next launch loads it instead of compiling from the sources.
+    When the binary is refused, e.g. the driver is updated, it is compiled again.
+
+    Usage::
+
+        program = shader_manager.program(vert, frag, dict(BLINK_TOGGLE=True))
+        params = shader_manager.params(program)
+
+        # Compile the variants before the frame loop, so switching them is only glUseProgram()
+        shader_manager.preload(vert, frag, [dict(BLINK_TOGGLE=b) for b in (False, True)])
+    '''
+
+    def __init__(self, cache_dir='cache/shader'):
+        '''
+        :param cache_dir str: the folder of the program binaries, the relative path is in the package root, None to disable it.
+        '''
+        self.cache_dir = None if cache_dir is None else ROOT.joinpath(cache_dir)
+        self.programs = {}
+        self.params_of = {}
+        self.driver = None
+        self.stats = dict(compiled=0, loaded=0, refused=0,
+                          compile_ms=0.0, load_ms=0.0)
+
+    def _driver(self):
+        if self.driver is None:
+            self.driver = '|'.join(glGetString(e).decode() for e in (
+                GL_VENDOR, GL_RENDERER, GL_VERSION))
+            # The functions are in OpenGL 4.1, or in GL_ARB_get_program_binary of the older context
+            module = arb_program_binary if not bool(
+                glProgramBinary) else OpenGL.GL
+            self.get_program_binary = module.glGetProgramBinary
+            self.program_binary = module.glProgramBinary
+            self.program_parameter = module.glProgramParameteri
+
+            # The driver may support no binary format at all
+            if not bool(self.program_binary) or glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS) == 0:
+                logger.warning('The driver supports no program binary format')
+                self.cache_dir = None
+        return self.driver
+
+    def program(self, vertex_source, fragment_source, defines=None):
+        '''
+        Get the program of the sources with the defines, it requires the OpenGL context.
+
+        :param defines dict: name: value of the #define lines.
+
+        :return int: the linked program.
+        '''
+        defines = defines or {}
+        mkey = (vertex_source, fragment_source, tuple(sorted(defines.items())))
+        program = self.programs.get(mkey)
+        if program is not None:
+            return program
+
+        vertex_source = inject_defines(vertex_source, defines)
+        fragment_source = inject_defines(fragment_source, defines)
+        key = hashlib.sha1('\0'.join(
+            [self._driver(), vertex_source, fragment_source]).encode()).hexdigest()[:16]
+
+        tic = time.perf_counter()
+        program = self._load_binary(key)
+        if program is not None:
+            self.stats['loaded'] += 1
+            self.stats['load_ms'] += (time.perf_counter() - tic) * 1000
+        else:
+            program = self._compile(vertex_source, fragment_source)
+            self._save_binary(key, program)
+            self.stats['compiled'] += 1
+            self.stats['compile_ms'] += (time.perf_counter() - tic) * 1000
+
+        self.programs[mkey] = program
+        return program
+
+    def preload(self, vertex_source, fragment_source, variants):
+        '''
+        Compile or load the variants in advance.
+
+        :param variants list: the defines of every variant.
+        '''
+        return [self.program(vertex_source, fragment_source, defines) for defines in variants]
+
+    def params(self, program):
+        '''The ShaderParams of the program, it is created once.'''
+        params = self.params_of.get(program)
+        if params is None:
+            params = ShaderParams(program)
+            self.params_of[program] = params
+        return params
+
+    def _path(self, key):
+        return Path(self.cache_dir, f'{key}.bin')
+
+    def _compile(self, vertex_source, fragment_source):
+        shaders = [compileShader(vertex_source, GL_VERTEX_SHADER),
+                   compileShader(fragment_source, GL_FRAGMENT_SHADER)]
+        program = glCreateProgram()
+        for shader in shaders:
+            glAttachShader(program, shader)
+        if self.cache_dir is not None:
+            # It must be set before the link
+            self.program_parameter(
+                program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+        glLinkProgram(program)
+        for shader in shaders:
+            glDetachShader(program, shader)
+            glDeleteShader(shader)
+
+        if glGetProgramiv(program, GL_LINK_STATUS) != GL_TRUE:
+            log = glGetProgramInfoLog(program)
+            glDeleteProgram(program)
+            raise RuntimeError(f'Link failure: {log}')
+        return program
+
+    def _load_binary(self, key):
+        if self.cache_dir is None or not self._path(key).is_file():
+            return None
+
+        data = self._path(key).read_bytes()
+        if len(data) <= 4:
+            return None
+        binary_format, = struct.unpack('<I', data[:4])
+        binary = np.frombuffer(data, dtype=np.uint8, offset=4)
+
+        program = glCreateProgram()
+        self.program_binary(program, binary_format,
+                            binary.ctypes.data_as(ctypes.c_void_p), len(binary))
+        if glGetProgramiv(program, GL_LINK_STATUS) != GL_TRUE:
+            glDeleteProgram(program)
+            self.stats['refused'] += 1
+            return None
+        return program
+
+    def _save_binary(self, key, program):
+        if self.cache_dir is None:
+            return
+
+        n = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+        if n == 0:
+            return
+        binary = np.zeros(n, dtype=np.uint8)
+        length = GLsizei(0)
+        binary_format = GLenum(0)
+        self.get_program_binary(program, n, ctypes.byref(length), ctypes.byref(binary_format),
+                                binary.ctypes.data_as(ctypes.c_void_p))
+
+        # Write into the temporary file and replace, so the broken binary is never left
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(struct.pack('<I', binary_format.value))
+            f.write(binary[:length.value].tobytes())
+        os.replace(tmp, path)
+
+    def report(self):
+        '''
+        The compiled (cold) and loaded (warm) programs and their time.
+        '''
+        return dict(self.stats, cache_dir=None if self.cache_dir is None else str(self.cache_dir))
+
+    def release(self):
+        for program in self.programs.values():
+            glDeleteProgram(program)
+        self.programs = {}
+        self.params_of = {}
+
+
+# The programs of the process
+shader_manager = ShaderManager(CONF.shader.cache_dir)
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -0,0 +1,170 @@
+"""
+File: shader_params.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Shader parameter binding.
+    The uniform locations are resolved once after the program is linked,
+    and the unchanged values are not sent again.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+from OpenGL.GL import *
+
+
+def _upload_matrix(upload):
+    '''
+    The matrix is uploaded as it is, like the projection of the renders,
+    so the (4, 4) array with the translation in the last row is the GLSL mat4.
+    '''
+    return lambda location, count, value: upload(location, count, GL_FALSE, value)
+
+
+# GL type: (dtype, components, upload function)
+UNIFORM_TYPES = {
+    GL_FLOAT: (np.float32, 1, glUniform1fv),
+    GL_FLOAT_VEC2: (np.float32, 2, glUniform2fv),
+    GL_FLOAT_VEC3: (np.float32, 3, glUniform3fv),
+    GL_FLOAT_VEC4: (np.float32, 4, glUniform4fv),
+    GL_INT: (np.int32, 1, glUniform1iv),
+    GL_INT_VEC2: (np.int32, 2, glUniform2iv),
+    GL_INT_VEC3: (np.int32, 3, glUniform3iv),
+    GL_INT_VEC4: (np.int32, 4, glUniform4iv),
+    GL_UNSIGNED_INT: (np.uint32, 1, glUniform1uiv),
+    GL_UNSIGNED_INT_VEC2: (np.uint32, 2, glUniform2uiv),
+    GL_UNSIGNED_INT_VEC3: (np.uint32, 3, glUniform3uiv),
+    GL_UNSIGNED_INT_VEC4: (np.uint32, 4, glUniform4uiv),
+    GL_BOOL: (np.int32, 1, glUniform1iv),
+    GL_BOOL_VEC2: (np.int32, 2, glUniform2iv),
+    GL_BOOL_VEC3: (np.int32, 3, glUniform3iv),
+    GL_BOOL_VEC4: (np.int32, 4, glUniform4iv),
+    GL_FLOAT_MAT2: (np.float32, 4, _upload_matrix(glUniformMatrix2fv)),
+    GL_FLOAT_MAT3: (np.float32, 9, _upload_matrix(glUniformMatrix3fv)),
+    GL_FLOAT_MAT4: (np.float32, 16, _upload_matrix(glUniformMatrix4fv)),
+}
+
+# The samplers are the texture units
+for _gl_type in [
+        GL_SAMPLER_1D, GL_SAMPLER_2D, GL_SAMPLER_3D, GL_SAMPLER_CUBE,
+        GL_SAMPLER_2D_SHADOW, GL_SAMPLER_2D_ARRAY, GL_SAMPLER_2D_RECT,
+        GL_SAMPLER_BUFFER, GL_SAMPLER_2D_MULTISAMPLE,
+        GL_INT_SAMPLER_1D, GL_INT_SAMPLER_2D, GL_INT_SAMPLER_3D, GL_INT_SAMPLER_CUBE,
+        GL_INT_SAMPLER_2D_ARRAY, GL_INT_SAMPLER_2D_RECT, GL_INT_SAMPLER_BUFFER,
+        GL_UNSIGNED_INT_SAMPLER_1D, GL_UNSIGNED_INT_SAMPLER_2D, GL_UNSIGNED_INT_SAMPLER_3D,
+        GL_UNSIGNED_INT_SAMPLER_CUBE, GL_UNSIGNED_INT_SAMPLER_2D_ARRAY,
+        GL_UNSIGNED_INT_SAMPLER_2D_RECT, GL_UNSIGNED_INT_SAMPLER_BUFFER]:
+    UNIFORM_TYPES[_gl_type] = (np.int32, 1, glUniform1iv)
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class Uniform:
+    def __init__(self, name, location, size, gl_type):
+        self.name = name
+        self.location = location
+        # The length of the array, 1 for the non-array uniform
+        self.size = size
+        self.gl_type = gl_type
+        self.value = None
+
+
+class ShaderParams:
+    '''
+    The uniforms of the shader program.
+    The uniform of the type not in UNIFORM_TYPES raises TypeError when it is built.
+
+    Usage::
+
+        params = ShaderParams(program)
+
+        glUseProgram(program)
+        params.set('uTime', t)
+        params.set('uSelectedPatches', [(0, 1, 10), (1, 2, 20)])
+    '''
+
+    def __init__(self, program):
+        self.program = program
+        self.uniforms = {}
+
+        n = glGetProgramiv(program, GL_ACTIVE_UNIFORMS)
+        for i in range(n):
+            name, size, gl_type = glGetActiveUniform(program, i)
+            name = name.decode() if isinstance(name, bytes) else name
+            # The array is named as uArray[0]
+            name = name.split('[')[0]
+            if int(gl_type) not in UNIFORM_TYPES:
+                raise TypeError(
+                    f'Unsupported type {hex(int(gl_type))} of the uniform {name} in program {program}')
+            location = glGetUniformLocation(program, name)
+            self.uniforms[name] = Uniform(
+                name, location, int(size), int(gl_type))
+
+        logger.debug(
+            f'Resolved uniforms of program {program}: {list(self.uniforms)}')
+
+    def set(self, name, value):
+        '''
+        Set the uniform, the program must be in use.
+        The array uniform is uploaded in one call.
+
+        :param name str: the uniform name.
+        :param value: the scalar, the tuple, or the array of them.
+
+        :return bool: whether the value is sent.
+        '''
+        uniform = self.uniforms.get(name)
+
+        # The uniform is not used by the shader, it is optimized out
+        if uniform is None:
+            return False
+
+        # Fast path for the scalar
+        if isinstance(value, (int, float, bool)):
+            if not isinstance(uniform.value, np.ndarray) and value == uniform.value:
+                return False
+            dtype, _, upload = UNIFORM_TYPES[uniform.gl_type]
+            upload(uniform.location, 1, np.array([value], dtype=dtype))
+            uniform.value = value
+            return True
+
+        dtype, components, upload = UNIFORM_TYPES[uniform.gl_type]
+        array = np.asarray(value, dtype=dtype).reshape(-1, components)
+        if isinstance(uniform.value, np.ndarray) and np.array_equal(array, uniform.value):
+            return False
+
+        count = min(len(array), uniform.size)
+        if count > 0:
+            upload(uniform.location, count, np.ascontiguousarray(array[:count]))
+        uniform.value = array.copy()
+        return True
+
+    def invalidate(self):
+        '''Forget the sent values, so they are sent again.'''
+        for uniform in self.uniforms.values():
+            uniform.value = None
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -22,17 +22,19 @@ from .easy_imports import *
 
 import freetype
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
-from OpenGL.GL.shaders import ShaderCompilationError
 from collections import OrderedDict
 
+from .glyph_atlas import GlyphAtlas
+from .glyph_disk_cache import GlyphDiskCache
+from .shader_library import shader_library
+
 # %%
-# 顶点着色器
-vertex_shader_source = open(
-    './shader/font/shadow.vert', encoding='utf-8').read()
-# 片段着色器
-fragment_shader_source = open(
-    './shader/font/shadow.frag', encoding='utf-8').read()
+# 着色器, they are read at the first init_shader()
+VERTEX_SHADER = 'font/shadow.vert'
+FRAGMENT_SHADER = 'font/shadow.frag'
+
+# (x, y, u, v, u0, v0, u1, v1, r, g, b, a) for every vertex
+FLOATS_PER_VERTEX = 12
 
 # %% ---- 2025-10-09 ------------------------
 # Function and class
@@ -54,16 +56,9 @@ class TextShader:
             [-1.0, -1.0, 0.0, 1.0]
         ], dtype=np.float32)
 
-        # Compile shaders
-        try:
-            vertex_shader = compileShader(
-                vertex_shader_source, GL_VERTEX_SHADER)
-            fragment_shader = compileShader(
-                fragment_shader_source, GL_FRAGMENT_SHADER)
-            self.shader_program = compileProgram(
-                vertex_shader, fragment_shader)
-        except ShaderCompilationError as err:
-            raise err
+        # Compile shaders, or load them from the program binary cache
+        self.shader_program = shader_library.program(
+            VERTEX_SHADER, FRAGMENT_SHADER)
 
         # 生成 VAO、VBO
         self.vao = glGenVertexArrays(1)
@@ -72,19 +67,29 @@ class TextShader:
         glBindVertexArray(self.vao)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
 
-        # 预分配缓冲区大小（6个顶点 * 4个float * 500个字符）
-        glBufferData(GL_ARRAY_BUFFER, 6 * 4 * 500 *
+        # 预分配缓冲区大小（6个顶点 * 12个float * 500个字符）
+        self.gpu_capacity = 6 * 500
+        glBufferData(GL_ARRAY_BUFFER, self.gpu_capacity * FLOATS_PER_VERTEX *
                      sizeof(GLfloat), None, GL_DYNAMIC_DRAW)
 
         # 设置顶点属性指针
+        stride = FLOATS_PER_VERTEX * sizeof(GLfloat)
         # 位置属性
         glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE,
-                              4 * sizeof(GLfloat), ctypes.c_void_p(0))
+                              stride, ctypes.c_void_p(0))
         glEnableVertexAttribArray(0)
         # 纹理坐标属性
-        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, 4 *
-                              sizeof(GLfloat), ctypes.c_void_p(2 * sizeof(GLfloat)))
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE,
+                              stride, ctypes.c_void_p(2 * sizeof(GLfloat)))
         glEnableVertexAttribArray(1)
+        # 字符在图集中的范围
+        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE,
+                              stride, ctypes.c_void_p(4 * sizeof(GLfloat)))
+        glEnableVertexAttribArray(2)
+        # 颜色属性
+        glVertexAttribPointer(3, 4, GL_FLOAT, GL_FALSE,
+                              stride, ctypes.c_void_p(8 * sizeof(GLfloat)))
+        glEnableVertexAttribArray(3)
 
         glBindBuffer(GL_ARRAY_BUFFER, 0)
         glBindVertexArray(0)
@@ -95,16 +100,128 @@ class TextShader:
 
 
 class TextRenderer(TextShader):
+    '''
+    Render the text with the glyph atlas.
+
+    The glyphs of the frame are batched by render_text(),
+    and they are drawn in the flush() with a single bind and a single draw call for each atlas page.
+    '''
     # I believe windows should have it.
     # And I believe it has every char I want.
     default_font_path = 'c:\\windows\\fonts\\msyh.ttc'
     default_font_size = 24
 
-    def __init__(self, max_cache_size=1024):
+    def __init__(self, max_cache_size=1024, max_cache_bytes=4 << 20, atlas_page_size=1024, atlas_max_pages=4, max_layout_cache_size=256, glyph_cache_dir='cache/glyph'):
+        '''
+        :param max_cache_size int: the max number of the cached chars.
+        :param max_cache_bytes int: the max bytes of the cached glyph bitmaps in the atlas.
+        :param atlas_page_size int: the width and height of the atlas page.
+        :param atlas_max_pages int: the max number of the atlas pages.
+        :param max_layout_cache_size int: the max number of the cached text layouts.
+        :param glyph_cache_dir str: the folder of the on-disk glyph cache, the relative path is in the package root, None to disable it.
+        '''
         super().__init__()
         self.face = None
         self.characters = OrderedDict()  # 使用有序字典实现LRU缓存
         self.max_cache_size = max_cache_size  # 最大缓存字符数
+        self.max_cache_bytes = max_cache_bytes  # 最大缓存字节数
+        self.cache_bytes = 0
+        self.atlas_page_size = atlas_page_size
+        self.atlas_max_pages = atlas_max_pages
+        self.font_key = None
+
+        # The rasterized glyphs on the disk
+        self.disk_cache = None if glyph_cache_dir is None else GlyphDiskCache(
+            glyph_cache_dir)
+
+        # The cache counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # The regions of the evicted chars, they are freed after the frame is drawn
+        self.pending_free = []
+
+        # The text layout cache of (text, scale, font)
+        self.use_layout_cache = True
+        self.layouts = OrderedDict()
+        self.max_layout_cache_size = max_layout_cache_size
+        # The keys of the cached layouts using the char, they are outdated when the char is evicted
+        self.layout_keys = {}
+        self.page_evictions = 0
+
+        # The batched vertices of the frame, and the atlas page of every char (6 vertices)
+        self.vertices = np.zeros((6 * 500, FLOATS_PER_VERTEX), dtype=np.float32)
+        self.quad_pages = np.zeros(500, dtype=np.int32)
+        self.count = 0
+
+    def init_shader(self, width, height):
+        super().init_shader(width, height)
+        self.atlas = GlyphAtlas(self.atlas_page_size, self.atlas_max_pages,
+                                on_evict=self.on_atlas_evict)
+
+    def on_atlas_evict(self, page_index):
+        '''
+        The atlas page is going to be reused.
+        Draw the pending text on it, and forget the chars in it.
+        '''
+        self.flush()
+        for char in [c for c, ch in self.characters.items() if ch['page'] == page_index]:
+            self.cache_bytes -= self.characters.pop(char)['bytes']
+            self.evictions += 1
+            self.forget_layouts(char)
+        self.page_evictions += 1
+
+    def evict_chars(self):
+        '''
+        Evict the least recently used chars until the cache is in the budgets.
+        The atlas regions are freed after the pending text is drawn.
+        '''
+        while len(self.characters) > self.max_cache_size or self.cache_bytes > self.max_cache_bytes:
+            # Never evict the latest char, it is being used
+            if len(self.characters) < 2:
+                break
+            char, ch = self.characters.popitem(last=False)
+            self.cache_bytes -= ch['bytes']
+            self.evictions += 1
+            self.forget_layouts(char)
+            if ch['region'] is not None:
+                self.pending_free.append(ch['region'])
+
+    def forget_layouts(self, char):
+        '''Drop the cached layouts using the evicted char.'''
+        for key in self.layout_keys.pop(char, ()):
+            self._drop_layout(key)
+
+    def _drop_layout(self, key):
+        entry = self.layouts.pop(key, None)
+        if entry is None:
+            return
+        for char in entry['chars']:
+            keys = self.layout_keys.get(char)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.layout_keys[char]
+
+    def cache_stats(self):
+        '''
+        The statistics of the glyph cache.
+
+        :return dict: the counters and the usage of the cache.
+        '''
+        total = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_rate=self.hits / total if total else 0.0,
+            entries=len(self.characters),
+            bytes=self.cache_bytes,
+            atlas_pages=sum(p is not None for p in self.atlas.pages),
+            atlas_bytes=self.atlas.nbytes,
+            layouts=len(self.layouts),
+        )
 
     def load_font(self, font_path, size=None):
         """初始化字体"""
@@ -117,12 +234,59 @@ class TextRenderer(TextShader):
         self.default_face = freetype.Face(self.default_font_path)
         self.default_face.set_char_size(size << 6)
 
+        self.font_key = (font_path, size)
+
+        if self.disk_cache is not None:
+            self.disk_cache.open([font_path, self.default_font_path], size)
+
         logger.info(f'Using font: {font_path} ({size})')
         logger.info(f'Using font(default): {self.default_font_path} ({size})')
 
     def load_char(self, char):
         if char in self.characters:
-            return self.characters[char]
+            self.hits += 1
+            self.characters.move_to_end(char)
+            ch = self.characters[char]
+            if ch['page'] is not None:
+                self.atlas.touch(ch['page'])
+            return ch
+
+        self.misses += 1
+
+        data, width, rows, left, top, advance = self.rasterize(char)
+
+        # 放入图集（空白字符不占用图集）
+        page, uv, region, nbytes = None, (0.0, 0.0, 0.0, 0.0), None, 0
+        if width > 0 and rows > 0:
+            page, uv, region = self.atlas.add(data, width, rows)
+            w, h = self.atlas.padded_size(width, rows)
+            nbytes = w * h
+
+        self.characters[char] = {
+            'page': page,
+            'uv': uv,
+            'region': region,
+            'bytes': nbytes,
+            'size': (width, rows),
+            'bearing': (left, top),
+            'advance': advance
+        }
+        self.cache_bytes += nbytes
+        ch = self.characters[char]
+        self.evict_chars()
+
+        return ch
+
+    def rasterize(self, char):
+        '''
+        Rasterize the char, the on-disk glyph cache is used if it has the char.
+
+        :return tuple: (data, width, rows, left, top, advance).
+        '''
+        if self.disk_cache is not None:
+            glyph = self.disk_cache.get(char)
+            if glyph is not None:
+                return glyph
 
         face = self.face if self.face.get_char_index(
             char) > 0 else self.default_face
@@ -130,44 +294,32 @@ class TextRenderer(TextShader):
         bitmap = face.glyph.bitmap
         glyph = face.glyph
 
-        texture = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture)
-
-        # 重要：单字节对齐，针对宽度不是4的情况
-        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
-
         if bitmap.pixel_mode == freetype.FT_PIXEL_MODE_MONO:
             data = self.mono_to_grayscale(bitmap)
         else:
             # 直接构造 numpy array, 注意 shape/类型
             data = np.array(bitmap.buffer, dtype=np.ubyte)
 
-        # 纹理参数
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glyph = (data, bitmap.width, bitmap.rows,
+                 glyph.bitmap_left, glyph.bitmap_top, glyph.advance.x >> 6)
 
-        # 上传纹理（单通道）
-        if bitmap.width > 0 and bitmap.rows > 0:
-            glTexImage2D(GL_TEXTURE_2D, 0, GL_RED, bitmap.width,
-                         bitmap.rows, 0, GL_RED, GL_UNSIGNED_BYTE, data)
-        else:
-            empty_data = np.array([0], dtype=np.ubyte)
-            glTexImage2D(GL_TEXTURE_2D, 0, GL_RED, 1, 1, 0,
-                         GL_RED, GL_UNSIGNED_BYTE, empty_data)
+        if self.disk_cache is not None:
+            self.disk_cache.put(char, *glyph)
 
-        # 解绑纹理
-        glBindTexture(GL_TEXTURE_2D, 0)
+        return glyph
 
-        self.characters[char] = {
-            'texture': texture,
-            'size': (bitmap.width, bitmap.rows),
-            'bearing': (glyph.bitmap_left, glyph.bitmap_top),
-            'advance': glyph.advance.x >> 6
-        }
+    def prewarm(self, chars):
+        '''
+        Rasterize the chars into the on-disk glyph cache.
+        It does not require the OpenGL context.
+        '''
+        for char in set(chars):
+            self.rasterize(char)
+        self.save_glyph_cache()
 
-        return self.characters[char]
+    def save_glyph_cache(self):
+        if self.disk_cache is not None:
+            self.disk_cache.save()
 
     def bounding_box(self, text, scale=1.0):
         """
@@ -183,57 +335,96 @@ class TextRenderer(TextShader):
         :return height int: the height of the input text, it shows the bottom line of the string.
         :return height2 int: the real height of the input text, it contains the descender of each char.
         """
-        width = 0
-        height = 0
-        height2 = 0
-        for char in text:
-            ch = self.load_char(char)
-            width += ch['advance'] * scale
-            height = max(height, ch['size'][1] * scale)
-            # height2 = max(
-            #     height2, (ch['bbox_height'] + ch['descender']) * scale)
-        height2 = height
+        return self.layout(text, scale)['bbox']
 
-        return width, height, height2
-
-    def render_text(self, text, x, y, scale=1.0, color=(1.0, 1.0, 1.0)):
-        """
-        Render the text on position x, y.
-        """
-        if not text:
+    def _reserve(self, n):
+        '''Make sure the CPU-side arrays have room for n more chars.'''
+        required = self.count // 6 + n
+        if required <= len(self.quad_pages):
             return
+        capacity = len(self.quad_pages)
+        while capacity < required:
+            capacity *= 2
+        vertices = np.zeros((capacity * 6, FLOATS_PER_VERTEX), dtype=np.float32)
+        vertices[:self.count] = self.vertices[:self.count]
+        quad_pages = np.zeros(capacity, dtype=np.int32)
+        quad_pages[:self.count // 6] = self.quad_pages[:self.count // 6]
+        self.vertices = vertices
+        self.quad_pages = quad_pages
+
+    def layout(self, text, scale=1.0):
+        """
+        Get the layout of the text.
+        The layout is cached by (text, scale, font), so the unchanged text is not walked again.
 
-        glUseProgram(self.shader_program)
-        glUniform3f(glGetUniformLocation(self.shader_program, "textColor"),
-                    color[0], color[1], color[2])
-
-        glActiveTexture(GL_TEXTURE0)
-        glBindVertexArray(self.vao)
-
-        # 为整个文本准备顶点数据
-        vertices = []
-        textures_used = []  # 记录使用的纹理和对应的顶点范围
-
-        start_index = 0
+        :param text str: the input text.
+        :param scale float: the scale factor.
 
+        :return dict: the bounding box and the vertices of the text at the (0, 0) origin.
+        """
+        key = (text, scale, self.font_key)
+        entry = self.layouts.get(key)
+
+        # The layout is dropped when any of its chars is evicted, see forget_layouts()
+        if entry is not None:
+            self.layouts.move_to_end(key)
+            # The chars in use are the recently used ones, like load_char()
+            for char in entry['chars']:
+                self.characters.move_to_end(char)
+            for page in entry['page_set']:
+                self.atlas.touch(page)
+            return entry
+
+        # The chars loaded before the atlas page is evicted are lost, build it again
+        for _ in range(3):
+            page_evictions = self.page_evictions
+            entry = self._build_layout(text, scale)
+            if page_evictions == self.page_evictions:
+                break
+
+        # The text has more chars than the cache, some of them are evicted while it is built,
+        # it is drawn in this frame, but it is not cached
+        loaded = entry.pop('loaded')
+        if any(self.characters.get(c) is not ch for c, ch in loaded.items()):
+            return entry
+
+        if self.use_layout_cache:
+            entry['chars'] = tuple(loaded)
+            self.layouts[key] = entry
+            for char in entry['chars']:
+                self.layout_keys.setdefault(char, set()).add(key)
+            while len(self.layouts) > self.max_layout_cache_size:
+                self._drop_layout(next(iter(self.layouts)))
+
+        return entry
+
+    def _build_layout(self, text, scale):
+        vertices = np.zeros((len(text) * 6, 8), dtype=np.float32)
+        pages = np.zeros(len(text), dtype=np.int32)
+
+        x = 0
+        n = 0
+        height = 0
+        # The char entries the layout is built with
+        loaded = {}
         for char in text:
-            self.load_char(char)
-            if char not in self.characters:
-                continue  # 跳过未加载的字符
-
-            ch = self.characters[char]
+            ch = self.load_char(char)
+            loaded[char] = ch
 
             # 计算位置
             xpos = x + ch['bearing'][0] * scale
-            ypos = y - (ch['size'][1] - ch['bearing'][1]) * scale
+            ypos = - (ch['size'][1] - ch['bearing'][1]) * scale
             w = ch['size'][0] * scale
             h = ch['size'][1] * scale
             x += ch['advance'] * scale
+            height = max(height, h)
 
             # 跳过完全透明的字符（如空格）
             if not all([w > 0, h > 0]):
                 continue
 
+            u0, v0, u1, v1 = ch['uv']
+
             # 每个字符的6个顶点（2个三角形）
             # a----b
             # |1 / |
@@ -244,58 +435,155 @@ class TextRenderer(TextShader):
             # |2 / |
             # | / 1|
             # a----b
-            _vertices = [
+            block = vertices[n*6:n*6+6]
+            block[:, :4] = (
                 # Triangle 1
-                [xpos,     ypos + h, 0.0, 0.0],  # c
-                [xpos + w, ypos,     1.0, 1.0],  # b
-                [xpos,     ypos,     0.0, 1.0],  # a
+                (xpos,     ypos + h, u0, v0),  # c
+                (xpos + w, ypos,     u1, v1),  # b
+                (xpos,     ypos,     u0, v1),  # a
                 # Triangle 2
-                [xpos,     ypos + h, 0.0, 0.0],  # c
-                [xpos + w, ypos + h, 1.0, 0.0],  # d
-                [xpos + w, ypos,     1.0, 1.0],  # b
-            ]
-
-            [vertices.extend(e) for e in _vertices]
-
-            # 记录这个字符使用的纹理和顶点范围
-            end_index = len(vertices) // 4  # 每个顶点4个float
-            textures_used.append({
-                'texture': ch['texture'],
-                'start': start_index,
-                'count': end_index - start_index
-            })
-            start_index = end_index
-
-        if vertices:
-            # 上传顶点数据
-            vertices_array = np.array(vertices, dtype=np.float32)
-            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-            glBufferSubData(GL_ARRAY_BUFFER, 0,
-                            vertices_array.nbytes, vertices_array)
-
-            # 按纹理分组绘制
-            for texture_info in textures_used:
-                glBindTexture(GL_TEXTURE_2D, texture_info['texture'])
-                glDrawArrays(
-                    GL_TRIANGLES, texture_info['start'], texture_info['count'])
+                (xpos,     ypos + h, u0, v0),  # c
+                (xpos + w, ypos + h, u1, v0),  # d
+                (xpos + w, ypos,     u1, v1),  # b
+            )
+            block[:, 4:] = ch['uv']
+
+            # 记录这个字符使用的图集页
+            pages[n] = ch['page']
+            n += 1
+
+        return {
+            'bbox': (x, height, height),
+            'vertices': vertices[:n*6],
+            'pages': pages[:n],
+            'page_set': tuple(set(pages[:n].tolist())),
+            'loaded': loaded,
+        }
+
+    def render_text(self, text, x, y, scale=1.0, color=(1.0, 1.0, 1.0)):
+        """
+        Render the text on position x, y.
+        The text is batched, and it is drawn in the flush() at the end of the frame.
+        """
+        if not text:
+            return
+
+        self.render_layout(self.layout(text, scale), x, y, color)
+        return
+
+    def render_layout(self, layout, x, y, color=(1.0, 1.0, 1.0)):
+        """
+        Render the text layout on position x, y.
+        The cached vertices are copied into the frame batch with the offset.
+        """
+        if len(color) == 3:
+            color = (color[0], color[1], color[2], 1.0)
+
+        vertices = layout['vertices']
+        pages = layout['pages']
+        n = len(pages)
+        if n == 0:
+            return
+
+        self._reserve(n)
+
+        block = self.vertices[self.count:self.count+n*6]
+        block[:, :8] = vertices
+        block[:, 0] += x
+        block[:, 1] += y
+        block[:, 8:] = color
+
+        self.quad_pages[self.count//6:self.count//6+n] = pages
+        self.count += n*6
+        return
+
+    def flush(self):
+        """
+        Draw the batched text.
+        The chars in the same atlas page are drawn by one bind and one draw call.
+        """
+        if self.count == 0:
+            self.free_evicted()
+            return
+
+        n = self.count // 6
+        vertices = self.vertices[:self.count]
+        pages = self.quad_pages[:n]
+
+        # 按图集页分组
+        if n > 1 and np.any(pages != pages[0]):
+            order = np.argsort(pages, kind='stable')
+            vertices = vertices.reshape(n, 6, -1)[order].reshape(-1, FLOATS_PER_VERTEX)
+            pages = pages[order]
+
+        glUseProgram(self.shader_program)
+        glActiveTexture(GL_TEXTURE0)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+
+        # Grow the GPU buffer if it is not large enough
+        if self.count > self.gpu_capacity:
+            self.gpu_capacity = len(self.vertices)
+            glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes,
+                         None, GL_DYNAMIC_DRAW)
+
+        # 上传顶点数据
+        vertices = np.ascontiguousarray(vertices)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, vertices.nbytes, vertices)
+
+        # 按图集页绘制
+        starts = np.flatnonzero(np.diff(pages, prepend=-1))
+        ends = np.append(starts[1:], n)
+        for start, end in zip(starts, ends):
+            glBindTexture(GL_TEXTURE_2D, self.atlas.texture(pages[start]))
+            glDrawArrays(GL_TRIANGLES, int(start) * 6, int(end - start) * 6)
 
         glBindVertexArray(0)
         glBindTexture(GL_TEXTURE_2D, 0)
+        self.count = 0
+        self.free_evicted()
         return
 
+    def free_evicted(self):
+        '''Give the regions of the evicted chars back to the atlas.'''
+        for region in self.pending_free:
+            self.atlas.free(region)
+        self.pending_free = []
+
     def mono_to_grayscale(self, bitmap):
         """将单色位图转换为灰度"""
         width = bitmap.width
         rows = bitmap.rows
+        # Every row takes pitch bytes, the tail bits of the row are padding
+        pitch = abs(bitmap.pitch)
+
+        # 缺少的字节当作 0
+        buffer = np.zeros(rows * pitch, dtype=np.ubyte)
+        data = np.asarray(bitmap.buffer, dtype=np.ubyte)[:rows * pitch]
+        buffer[:len(data)] = data
+
+        # FT 位图是 MSB 优先, 与 unpackbits 的默认顺序一致
+        bits = np.unpackbits(buffer.reshape(rows, pitch), axis=1)[:, :width]
+
+        return (bits * 255).reshape(-1)
+
+# %% ---- 2025-10-09 ------------------------
+# Play ground
+if __name__ == '__main__':
+    import sys
+
+    def mono_to_grayscale_reference(bitmap):
+        """The per-pixel conversion, it is the reference of the correctness"""
+        width = bitmap.width
+        rows = bitmap.rows
         pitch = bitmap.pitch
 
-        # 创建灰度数据数组
         data = np.zeros((rows, width), dtype=np.ubyte)
 
         for y in range(rows):
             for x in range(width):
                 byte_index = y * pitch + x // 8
-                bit_index = 7 - (x % 8)  # FT 位图是 MSB 优先
+                bit_index = 7 - (x % 8)
 
                 if byte_index < len(bitmap.buffer):
                     byte_val = bitmap.buffer[byte_index]
@@ -304,9 +592,35 @@ class TextRenderer(TextShader):
 
         return data.flatten()
 
-# %% ---- 2025-10-09 ------------------------
-# Play ground
-
+    # Check and benchmark the mono glyphs in several sizes
+    font_path = sys.argv[1] if len(sys.argv) > 1 else 'resource/font/MSYH.TTC'
+    chars = 'AgW@ 窗口获得焦点'
+    renderer = TextRenderer()
+    face = freetype.Face(font_path)
+
+    for size in [8, 12, 16, 24, 48]:
+        face.set_char_size(size << 6)
+        cost_reference = 0
+        cost_vectorized = 0
+        for char in chars:
+            face.load_char(char, freetype.FT_LOAD_RENDER |
+                           freetype.FT_LOAD_TARGET_MONO)
+            bitmap = face.glyph.bitmap
+            assert bitmap.pixel_mode == freetype.FT_PIXEL_MODE_MONO
+
+            tic = time.perf_counter()
+            expect = mono_to_grayscale_reference(bitmap)
+            cost_reference += time.perf_counter() - tic
+
+            tic = time.perf_counter()
+            got = renderer.mono_to_grayscale(bitmap)
+            cost_vectorized += time.perf_counter() - tic
+
+            assert got.dtype == expect.dtype and np.array_equal(got, expect), \
+                f'Mismatch: {char=}, {size=}'
+
+        logger.info(
+            f'{size=}, reference: {cost_reference*1000:.3f} ms, vectorized: {cost_vectorized*1000:.3f} ms ({len(chars)} chars)')
 
 # %% ---- 2025-10-09 ------------------------
 # Pending
@@ -0,0 +1,134 @@
+"""
+File: timeline.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Design timeline engine.
+    The design events are parsed and evaluated once,
+    and the due events are found by binary search at frame time.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+import ast
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+def coerce(value, kind):
+    '''
+    Convert the value into the annotated type of the variable.
+    The value is kept if it can not be converted.
+    '''
+    if kind is None or isinstance(value, kind):
+        return value
+    if kind in (int, float, bool) and isinstance(value, (int, float, bool)):
+        return kind(value)
+    if kind in (list, tuple) and isinstance(value, (list, tuple)):
+        return kind(value)
+    return value
+
+
+class Timeline:
+    '''
+    The events of (time, variable, value) sorted by time.
+
+    The cursor points to the first event not dispatched yet,
+    so due(t) costs a binary search and the events it returns.
+    '''
+
+    def __init__(self, events=()):
+        # Stable sort keeps the order of the events at the same time
+        events = sorted(events, key=lambda e: e[0])
+        self.events = events
+        self.times = np.array([e[0] for e in events], dtype=np.int64)
+        self.cursor = 0
+
+    @classmethod
+    def parse(cls, lines, types=None):
+        '''
+        Parse the design lines of "time(ms) variable value".
+
+        :param lines list: the lines, the empty lines and the lines startswith # are ignored.
+        :param types dict: the variable types, like Options.__annotations__.
+
+        :return Timeline: the timeline of the typed events.
+        '''
+        types = types or {}
+        events = []
+        for i, line in enumerate(lines):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            try:
+                a, b = line.split(None, 1)
+                c, d = b.strip().split(None, 1)
+                value = coerce(ast.literal_eval(d.strip()), types.get(c))
+                events.append((int(a), c.strip(), value))
+            except (ValueError, SyntaxError) as err:
+                raise ValueError(
+                    f'Can not parse design line {i+1}: {line!r} ({err})')
+
+        return cls(events)
+
+    def __len__(self):
+        '''How many events are not dispatched.'''
+        return len(self.events) - self.cursor
+
+    def reset(self):
+        self.cursor = 0
+
+    def due(self, t):
+        '''
+        Dispatch the events whose time <= t.
+
+        :param t int: the time in ms.
+
+        :return list: the due events in the time order.
+        '''
+        if self.cursor >= len(self.events) or self.times[self.cursor] > t:
+            return []
+
+        end = int(np.searchsorted(self.times, t, side='right'))
+        events = self.events[self.cursor:end]
+        self.cursor = end
+        return events
+
+    def peek(self):
+        '''
+        The time of the next event, or None if all the events are dispatched.
+        '''
+        if self.cursor >= len(self.events):
+            return None
+        return int(self.times[self.cursor])
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    timeline = Timeline.parse(open('./design.conf', encoding='utf-8').readlines(),
+                              types={'focus_r1': float, 'focus_color': tuple})
+    for t in [-100, 0, 1000, 1500, 5000]:
+        print(t, timeline.due(t))
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
@@ -21,16 +21,16 @@ Functions:
 from .easy_imports import *
 
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
-from OpenGL.GL.shaders import ShaderCompilationError
+
+from .shader_library import shader_library
 
 # %%
-# 顶点着色器
-vertex_shader_source = open(
-    './shader/triangle/projection.vert', encoding='utf-8').read()
-# 片段着色器
-fragment_shader_source = open(
-    './shader/triangle/projection.frag', encoding='utf-8').read()
+# 着色器, they are read at the first init_shader()
+VERTEX_SHADER = 'triangle/projection.vert'
+FRAGMENT_SHADER = 'triangle/projection.frag'
+
+# (x, y, nx, ny, r, g, b, a) for every vertex
+FLOATS_PER_VERTEX = 8
 
 # %% ---- 2025-10-16 ------------------------
 # Function and class
@@ -52,16 +52,9 @@ class TriangleShader:
             [-1.0, -1.0, 0.0, 1.0]
         ], dtype=np.float32)
 
-        # Compile shaders
-        try:
-            vertex_shader = compileShader(
-                vertex_shader_source, GL_VERTEX_SHADER)
-            fragment_shader = compileShader(
-                fragment_shader_source, GL_FRAGMENT_SHADER)
-            self.shader_program = compileProgram(
-                vertex_shader, fragment_shader)
-        except ShaderCompilationError as err:
-            raise err
+        # Compile shaders, or load them from the program binary cache
+        self.shader_program = shader_library.program(
+            VERTEX_SHADER, FRAGMENT_SHADER)
 
         # 生成 VAO、VBO
         self.vao = glGenVertexArrays(1)
@@ -70,20 +63,27 @@ class TriangleShader:
         glBindVertexArray(self.vao)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
 
-        # 预分配缓冲区大小（6个顶点 * 4个float * 100个纹理）
-        glBufferData(GL_ARRAY_BUFFER, 6 * 4 * 100 *
+        # 预分配缓冲区大小（3个顶点 * 8个float * 100个三角形）
+        self.gpu_capacity = 100 * 3
+        glBufferData(GL_ARRAY_BUFFER, self.gpu_capacity * FLOATS_PER_VERTEX *
                      sizeof(GLfloat), None, GL_DYNAMIC_DRAW)
 
         # 设置顶点属性指针
+        stride = FLOATS_PER_VERTEX * sizeof(GLfloat)
         # 位置属性
         glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE,
-                              4 * sizeof(GLfloat), ctypes.c_void_p(0))
+                              stride, ctypes.c_void_p(0))
         glEnableVertexAttribArray(0)
 
         glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE,
-                              4 * sizeof(GLfloat), ctypes.c_void_p(2 * sizeof(GLfloat)))
+                              stride, ctypes.c_void_p(2 * sizeof(GLfloat)))
         glEnableVertexAttribArray(1)
 
+        # 颜色属性
+        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE,
+                              stride, ctypes.c_void_p(4 * sizeof(GLfloat)))
+        glEnableVertexAttribArray(2)
+
         glBindBuffer(GL_ARRAY_BUFFER, 0)
         glBindVertexArray(0)
 
@@ -93,27 +93,81 @@ class TriangleShader:
 
 
 class TriangleRender(TriangleShader):
-    def __init__(self):
+    '''
+    Retained triangle renderer.
+
+    The triangles are appended into the CPU-side vertex array,
+    and they are drawn by one upload and one draw call in the flush().
+    '''
+
+    def __init__(self, capacity=1024):
         super().__init__()
+        # Every row is a vertex of (x, y, nx, ny, r, g, b, a)
+        self.vertices = np.zeros(
+            (capacity * 3, FLOATS_PER_VERTEX), dtype=np.float32)
+        self.count = 0
+
+    def _reserve(self, n):
+        '''Make sure the CPU-side array has room for n more vertices.'''
+        required = self.count + n
+        if required <= len(self.vertices):
+            return
+        capacity = len(self.vertices)
+        while capacity < required:
+            capacity *= 2
+        vertices = np.zeros((capacity, FLOATS_PER_VERTEX), dtype=np.float32)
+        vertices[:self.count] = self.vertices[:self.count]
+        self.vertices = vertices
+
+    def append_triangle(self, x1, y1, x2, y2, x3, y3, color=(1.0, 1.0, 1.0, 1.0), nPos=(0, 0, 1, 0, 0, 1)):
+        '''
+        Append the triangle into the batch, it is drawn in the flush().
+
+        :param x1, y1, x2, y2, x3, y3: pixel position.
+        :param color: RGBA color of the triangle.
+        :param nPos: the normalized position of the vertices.
+        '''
+        self._reserve(3)
+        block = self.vertices[self.count:self.count+3]
+        block[:, 0] = (x1, x2, x3)
+        block[:, 1] = (y1, y2, y3)
+        block[:, 2] = nPos[0::2]
+        block[:, 3] = nPos[1::2]
+        block[:, 4:] = color
+        self.count += 3
+
+    def flush(self):
+        '''
+        Draw the batched triangles with one upload and one draw call.
+        '''
+        if self.count == 0:
+            return
 
-    def render_triangle(self, x1, y1, x2, y2, x3, y3, color=(1.0, 1.0, 1.0, 1.0), nPos=(0, 0, 1, 0, 0, 1)):
         glUseProgram(self.shader_program)
-        glUniform4f(glGetUniformLocation(self.shader_program,
-                    'uColor'), color[0], color[1], color[2], color[3])
-
-        glActiveTexture(GL_TEXTURE0)
         glBindVertexArray(self.vao)
-
-        vertices_array = np.array(
-            [x1, y1, nPos[0], nPos[1], x2, y2, nPos[2], nPos[3], x3, y3, nPos[4], nPos[5]], dtype=np.float32)
         glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
-        glBufferSubData(GL_ARRAY_BUFFER, 0,
-                        vertices_array.nbytes, vertices_array)
 
-        glDrawArrays(GL_TRIANGLES, 0, 3)
+        data = self.vertices[:self.count]
+
+        # Grow the GPU buffer if it is not large enough
+        if self.count > self.gpu_capacity:
+            self.gpu_capacity = len(self.vertices)
+            glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes,
+                         None, GL_DYNAMIC_DRAW)
+
+        glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+        glDrawArrays(GL_TRIANGLES, 0, self.count)
 
         glBindVertexArray(0)
-        pass
+        self.count = 0
+
+    def render_triangle(self, x1, y1, x2, y2, x3, y3, color=(1.0, 1.0, 1.0, 1.0), nPos=(0, 0, 1, 0, 0, 1)):
+        '''
+        Draw the triangle immediately.
+        The pending triangles are drawn before it to keep the order.
+        '''
+        self.append_triangle(x1, y1, x2, y2, x3, y3, color, nPos)
+        self.flush()
 
 # %% ---- 2025-10-16 ------------------------
 # Play ground
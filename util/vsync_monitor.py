@@ -0,0 +1,176 @@
+"""
+File: vsync_monitor.py
+Author: Chuncheng Zhang
+Date: 2026-10-18
+Copyright & Email: chuncheng.zhang@ia.ac.cn
+
+Purpose:
+    Dropped-frame and jitter detector.
+    Check whether every frame lands on the vsync interval of the monitor.
+
+Functions:
+    1. Requirements and constants
+    2. Function and class
+    3. Play ground
+    4. Pending
+    5. Pending
+"""
+
+
+# %% ---- 2026-10-18 ------------------------
+# Requirements and constants
+from .easy_imports import *
+
+# %% ---- 2026-10-18 ------------------------
+# Function and class
+
+
+class VsyncMonitor:
+    '''
+    Compare the consecutive swap timestamps with the refresh period.
+
+    The interval of d periods is classified as:
+    - duplicated: d < 0.5, two swaps in one refresh, one of the frames is never shown.
+    - on time: 0.5 <= d <= 1 + late_tolerance.
+    - late: 1 + late_tolerance < d < 1.5, the flip is late but no frame is lost.
+    - missed: d >= 1.5, round(d) - 1 flips are missed, the previous frame is shown again.
+
+    Every abnormal frame is logged as a structured event with the session time.
+    '''
+
+    # The EventLog of the abnormal frames, they are logged by its writer thread,
+    # or by the logger on the render thread if it is None
+    events = None
+
+    def __init__(self, max_samples=1200, late_tolerance=0.2):
+        '''
+        :param max_samples int: the size of the jitter ring buffer.
+        :param late_tolerance float: the tolerance of the on time interval, in periods.
+        '''
+        self.max_samples = max_samples
+        self.late_tolerance = late_tolerance
+        self.enabled = True
+
+        # Returns the session time in seconds, like Options.get_time
+        self.time_source = None
+
+        self.jitter_ns = np.zeros(max_samples, dtype=np.int64)
+        self.start(60)
+
+    def start(self, refresh_rate):
+        '''
+        Start the monitor with the refresh rate of the monitor.
+        '''
+        self.refresh_rate = refresh_rate
+        self.period_ns = int(1e9 / refresh_rate)
+        self.last_ns = None
+        self.frames = 0
+        self.samples = 0
+        self.duplicated = 0
+        self.late = 0
+        self.missed = 0
+        self.missed_flips = 0
+        self.tic_ns = time.perf_counter_ns()
+
+    def session_time(self):
+        if self.time_source is not None:
+            return self.time_source()
+        return (time.perf_counter_ns() - self.tic_ns) / 1e9
+
+    def update(self, t_ns=None):
+        '''
+        Update with the timestamp right after the buffers are swapped.
+
+        :param t_ns int: the perf_counter_ns() timestamp, None for now.
+        '''
+        if t_ns is None:
+            t_ns = time.perf_counter_ns()
+
+        last_ns = self.last_ns
+        self.last_ns = t_ns
+        self.frames += 1
+
+        if last_ns is None or not self.enabled:
+            return
+
+        delta = t_ns - last_ns
+        self.jitter_ns[self.samples % self.max_samples] = delta - self.period_ns
+        self.samples += 1
+
+        d = delta / self.period_ns
+        if d < 0.5:
+            self.duplicated += 1
+            self._emit('frame_duplicated', delta, d)
+        elif d >= 1.5:
+            flips = int(round(d)) - 1
+            self.missed += 1
+            self.missed_flips += flips
+            self._emit('frame_missed', delta, d, missed_flips=flips)
+        elif d > 1 + self.late_tolerance:
+            self.late += 1
+            self._emit('frame_late', delta, d)
+
+    def _emit(self, event, delta, d, **kwargs):
+        fields = dict(
+            event=event,
+            frame=self.frames,
+            session_time=self.session_time(),
+            interval_ms=delta / 1e6,
+            periods=d,
+            **kwargs
+        )
+        if self.events is not None and self.events.enabled:
+            self.events.write(**fields, level='WARNING')
+        else:
+            logger.bind(**fields).warning(f'Vsync: {fields}')
+
+    def jitter(self):
+        '''The latest jitters (interval - period) in nanoseconds.'''
+        return self.jitter_ns[:min(self.samples, self.max_samples)]
+
+    def report(self):
+        '''
+        The counters and the jitter percentiles.
+
+        :return dict: the report, the jitter is the absolute (interval - period) in ms.
+        '''
+        jitter = np.abs(self.jitter()) / 1e6
+        res = dict(
+            refresh_rate=self.refresh_rate,
+            frames=self.frames,
+            duplicated=self.duplicated,
+            late=self.late,
+            missed=self.missed,
+            missed_flips=self.missed_flips,
+        )
+        for p in [50, 95, 99]:
+            res[f'jitter_p{p}_ms'] = float(
+                np.percentile(jitter, p)) if len(jitter) else float('nan')
+        res['jitter_max_ms'] = float(jitter.max()) if len(jitter) else float('nan')
+        return res
+
+
+# %% ---- 2026-10-18 ------------------------
+# Play ground
+if __name__ == '__main__':
+    # Simulate 60 Hz swaps with a late and a missed frame
+    monitor = VsyncMonitor()
+    monitor.start(60)
+    t = 0
+    period = int(1e9 / 60)
+    for i in range(100):
+        t += period + np.random.randint(-200000, 200000)
+        if i == 30:
+            t += int(period * 0.3)
+        if i == 60:
+            t += period * 2
+        monitor.update(t)
+    logger.info(monitor.report())
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending
+
+
+# %% ---- 2026-10-18 ------------------------
+# Pending